@@ -0,0 +1,20 @@
+"""
+Metrics endpoint.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.services.metrics import get_metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """
+    Search, instance and download client metrics in the Prometheus text format.
+    """
+    return PlainTextResponse(
+        get_metrics().render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
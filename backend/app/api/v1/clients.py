@@ -2,12 +2,14 @@
 API endpoints for managing download clients.
 """
 
+import asyncio
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.config import settings
 from app.core.database import get_db
 from app.models import DownloadClient
 from app.schemas import (
@@ -17,38 +19,20 @@ from app.schemas import (
     DownloadClientWithStatus,
     TestConnectionResponse,
 )
-from app.services import QBittorrentService, decrypt_credential, encrypt_credential
+from app.services import (
+    QBittorrentService,
+    decrypt_credential,
+    encrypt_credential,
+    get_health_monitor,
+)
+from app.services.health_monitor import HealthStatus, probe_client
+from app.services.invalidation import invalidate
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/clients", tags=["clients"])
 
 
-# =============================================================================
-# Helper Functions
-# =============================================================================
-
-
-async def get_client_status(client: DownloadClient) -> str:
-    """
-    Get the online/offline status for a download client.
-
-    Returns:
-        "online" or "offline"
-    """
-    try:
-        username = decrypt_credential(client.username)
-        password = decrypt_credential(client.password)
-
-        # Currently only qBittorrent is supported
-        service = QBittorrentService(client.url, username, password)
-        success, _ = await service.test_connection()
-        return "online" if success else "offline"
-    except Exception as e:
-        logger.warning(f"Error checking status for client {client.name}: {e}")
-        return "offline"
-
-
 # =============================================================================
 # Download Client Endpoints
 # =============================================================================
@@ -96,6 +80,7 @@ async def create_client(
     db.add(client)
     await db.commit()
     await db.refresh(client)
+    await invalidate("client", client.id)
 
     return DownloadClientResponse(
         id=client.id,
@@ -157,6 +142,9 @@ async def update_client(
     await db.commit()
     await db.refresh(client)
 
+    # Serve the new configuration, and re-probe instead of serving the old status
+    await invalidate("client", client_id)
+
     return DownloadClientResponse(
         id=client.id,
         name=client.name,
@@ -182,6 +170,8 @@ async def delete_client(
     await db.delete(client)
     await db.commit()
 
+    await invalidate("client", client_id)
+
 
 @router.post("/{client_id}/test", response_model=TestConnectionResponse)
 async def test_client(
@@ -227,10 +217,24 @@ async def get_all_clients_status(
     result = await db.execute(select(DownloadClient))
     clients = result.scalars().all()
 
+    # Serve the background monitor's snapshot; clients it has not probed yet
+    # (or every client, if it is not running) are checked live, concurrently
+    monitor = get_health_monitor()
+    semaphore = asyncio.Semaphore(settings.STATUS_CHECK_CONCURRENCY)
+
+    async def check(client: DownloadClient) -> HealthStatus:
+        health = monitor.get("client", client.id)
+        if health is None:
+            async with semaphore:
+                health = await probe_client(client)
+            monitor.record("client", client.id, health)
+        return health
+
+    statuses = await asyncio.gather(*(check(client) for client in clients))
+
     clients_with_status: list[DownloadClientWithStatus] = []
 
-    for client in clients:
-        status = await get_client_status(client)
+    for client, health in zip(clients, statuses, strict=True):
         clients_with_status.append(
             DownloadClientWithStatus(
                 id=client.id,
@@ -239,7 +243,9 @@ async def get_all_clients_status(
                 url=client.url,
                 created_at=client.created_at,
                 updated_at=client.updated_at,
-                status=status,
+                status=health.status,
+                check_duration_ms=round(health.latency_ms, 1),
+                last_checked=health.checked_at,
             )
         )
 
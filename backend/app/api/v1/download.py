@@ -4,14 +4,11 @@ API endpoints for download operations.
 
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
+from fastapi import APIRouter, HTTPException
 
-from app.core.database import get_db
-from app.models import DownloadClient
 from app.schemas import DownloadRequest, DownloadResponse
-from app.services import QBittorrentService, decrypt_credential
+from app.services import QBittorrentService, decrypt_credential, get_config_registry
+from app.services.metrics import get_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +18,6 @@ router = APIRouter(prefix="/download", tags=["download"])
 @router.post("", response_model=DownloadResponse)
 async def send_to_client(
     data: DownloadRequest,
-    db: AsyncSession = Depends(get_db),
 ) -> DownloadResponse:
     """
     Send a torrent to a download client.
@@ -37,8 +33,8 @@ async def send_to_client(
     Returns success status and message.
     """
     # Get the download client
-    result = await db.execute(select(DownloadClient).where(DownloadClient.id == data.client_id))
-    client = result.scalar_one_or_none()
+    config = await get_config_registry().snapshot()
+    client = config.get_client(data.client_id)
 
     if not client:
         raise HTTPException(status_code=404, detail="Download client not found")
@@ -50,16 +46,21 @@ async def send_to_client(
         # Currently only qBittorrent is supported
         service = QBittorrentService(client.url, username, password)
 
+        metrics = get_metrics()
         if data.magnet_link:
             # Add via magnet link
-            success, message = await service.add_torrent_magnet(
-                data.magnet_link, category=client.category
-            )
+            with metrics.client_request_seconds.time(client.name, "add_magnet"):
+                success, message = await service.add_torrent_magnet(
+                    data.magnet_link, category=client.category
+                )
+            operation = "add_magnet"
         elif data.torrent_url:
             # Add via torrent URL
-            success, message = await service.add_torrent_url(
-                data.torrent_url, category=client.category
-            )
+            with metrics.client_request_seconds.time(client.name, "add_url"):
+                success, message = await service.add_torrent_url(
+                    data.torrent_url, category=client.category
+                )
+            operation = "add_url"
         else:
             # This shouldn't happen due to schema validation, but handle it anyway
             raise HTTPException(
@@ -68,6 +69,7 @@ async def send_to_client(
             )
 
         if not success:
+            metrics.client_errors.inc(client.name, operation)
             raise HTTPException(status_code=400, detail=message)
 
         return DownloadResponse(
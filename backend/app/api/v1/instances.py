@@ -2,12 +2,14 @@
 API endpoints for managing Jackett and Prowlarr instances.
 """
 
+import asyncio
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.config import settings
 from app.core.database import get_db
 from app.models import JackettInstance, ProwlarrInstance
 from app.schemas import (
@@ -22,7 +24,18 @@ from app.schemas import (
     ProwlarrInstanceWithStatus,
     TestConnectionResponse,
 )
-from app.services import JackettService, ProwlarrService, decrypt_credential, encrypt_credential
+from app.services import (
+    JackettService,
+    ProwlarrService,
+    decrypt_credential,
+    encrypt_credential,
+    get_health_monitor,
+    get_http_client_registry,
+)
+from app.services.health_monitor import HealthStatus, probe_instance
+from app.services.invalidation import invalidate
+from app.services.jackett import JACKETT_TIMEOUT
+from app.services.prowlarr import PROWLARR_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
@@ -41,32 +54,6 @@ def mask_api_key(api_key: str) -> str:
     return api_key[:4] + "..." + api_key[-4:]
 
 
-async def get_instance_status(
-    instance: JackettInstance | ProwlarrInstance,
-    instance_type: str,
-) -> tuple[str, int | None]:
-    """
-    Get the online/offline status and indexer count for an instance.
-
-    Returns:
-        Tuple of (status, indexer_count)
-    """
-    try:
-        api_key = decrypt_credential(instance.api_key)
-
-        if instance_type == "jackett":
-            jackett_service = JackettService(instance.url, api_key)
-            success, _, indexer_count = await jackett_service.test_connection()
-        else:
-            prowlarr_service = ProwlarrService(instance.url, api_key)
-            success, _, indexer_count = await prowlarr_service.test_connection()
-
-        return "online" if success else "offline", indexer_count
-    except Exception as e:
-        logger.warning(f"Error checking status for {instance.name}: {e}")
-        return "offline", None
-
-
 # =============================================================================
 # Jackett Instance Endpoints
 # =============================================================================
@@ -113,6 +100,7 @@ async def create_jackett_instance(
     db.add(instance)
     await db.commit()
     await db.refresh(instance)
+    await invalidate("jackett", instance.id)
 
     return JackettInstanceResponse(
         id=instance.id,
@@ -170,6 +158,8 @@ async def update_jackett_instance(
     await db.commit()
     await db.refresh(instance)
 
+    await invalidate("jackett", instance_id)
+
     return JackettInstanceResponse(
         id=instance.id,
         name=instance.name,
@@ -195,6 +185,8 @@ async def delete_jackett_instance(
     await db.delete(instance)
     await db.commit()
 
+    await invalidate("jackett", instance_id)
+
 
 @router.post("/jackett/{instance_id}/test", response_model=TestConnectionResponse)
 async def test_jackett_instance(
@@ -210,7 +202,10 @@ async def test_jackett_instance(
 
     try:
         api_key = decrypt_credential(instance.api_key)
-        service = JackettService(instance.url, api_key)
+        client = get_http_client_registry().get(
+            "jackett", instance.id, instance.url, JACKETT_TIMEOUT
+        )
+        service = JackettService(instance.url, api_key, client=client)
         success, message, indexer_count = await service.test_connection()
 
         return TestConnectionResponse(
@@ -273,6 +268,7 @@ async def create_prowlarr_instance(
     db.add(instance)
     await db.commit()
     await db.refresh(instance)
+    await invalidate("prowlarr", instance.id)
 
     return ProwlarrInstanceResponse(
         id=instance.id,
@@ -330,6 +326,8 @@ async def update_prowlarr_instance(
     await db.commit()
     await db.refresh(instance)
 
+    await invalidate("prowlarr", instance_id)
+
     return ProwlarrInstanceResponse(
         id=instance.id,
         name=instance.name,
@@ -355,6 +353,8 @@ async def delete_prowlarr_instance(
     await db.delete(instance)
     await db.commit()
 
+    await invalidate("prowlarr", instance_id)
+
 
 @router.post("/prowlarr/{instance_id}/test", response_model=TestConnectionResponse)
 async def test_prowlarr_instance(
@@ -370,7 +370,10 @@ async def test_prowlarr_instance(
 
     try:
         api_key = decrypt_credential(instance.api_key)
-        service = ProwlarrService(instance.url, api_key)
+        client = get_http_client_registry().get(
+            "prowlarr", instance.id, instance.url, PROWLARR_TIMEOUT
+        )
+        service = ProwlarrService(instance.url, api_key, client=client)
         success, message, indexer_count = await service.test_connection()
 
         return TestConnectionResponse(
@@ -400,7 +403,7 @@ async def get_all_instances_status(
     Get status of all configured instances.
 
     Returns all Jackett and Prowlarr instances with their online/offline status
-    and indexer counts.
+    and indexer counts, as last observed by the background health monitor.
     """
     # Get all instances
     jackett_result = await db.execute(select(JackettInstance))
@@ -409,14 +412,32 @@ async def get_all_instances_status(
     prowlarr_result = await db.execute(select(ProwlarrInstance))
     prowlarr_instances = prowlarr_result.scalars().all()
 
-    # Get status for each instance
+    # Serve the background monitor's snapshot; only instances it has not probed
+    # yet (or every instance, if it is not running) are checked live, concurrently
+    monitor = get_health_monitor()
+    semaphore = asyncio.Semaphore(settings.STATUS_CHECK_CONCURRENCY)
+
+    async def check(
+        instance: JackettInstance | ProwlarrInstance, instance_type: str
+    ) -> HealthStatus:
+        health = monitor.get(instance_type, instance.id)
+        if health is None:
+            async with semaphore:
+                health = await probe_instance(instance, instance_type)
+            monitor.record(instance_type, instance.id, health)
+        return health
+
+    jackett_statuses, prowlarr_statuses = await asyncio.gather(
+        asyncio.gather(*(check(instance, "jackett") for instance in jackett_instances)),
+        asyncio.gather(*(check(instance, "prowlarr") for instance in prowlarr_instances)),
+    )
+
     jackett_with_status: list[JackettInstanceWithStatus] = []
     prowlarr_with_status: list[ProwlarrInstanceWithStatus] = []
     total_online = 0
 
-    for instance in jackett_instances:
-        status, indexer_count = await get_instance_status(instance, "jackett")
-        if status == "online":
+    for instance, health in zip(jackett_instances, jackett_statuses, strict=True):
+        if health.status == "online":
             total_online += 1
 
         jackett_with_status.append(
@@ -427,14 +448,15 @@ async def get_all_instances_status(
                 api_key=mask_api_key(decrypt_credential(instance.api_key)),
                 created_at=instance.created_at,
                 updated_at=instance.updated_at,
-                status=status,
-                indexer_count=indexer_count,
+                status=health.status,
+                indexer_count=health.indexer_count,
+                check_duration_ms=round(health.latency_ms, 1),
+                last_checked=health.checked_at,
             )
         )
 
-    for instance in prowlarr_instances:
-        status, indexer_count = await get_instance_status(instance, "prowlarr")
-        if status == "online":
+    for instance, health in zip(prowlarr_instances, prowlarr_statuses, strict=True):
+        if health.status == "online":
             total_online += 1
 
         prowlarr_with_status.append(
@@ -445,8 +467,10 @@ async def get_all_instances_status(
                 api_key=mask_api_key(decrypt_credential(instance.api_key)),
                 created_at=instance.created_at,
                 updated_at=instance.updated_at,
-                status=status,
-                indexer_count=indexer_count,
+                status=health.status,
+                indexer_count=health.indexer_count,
+                check_duration_ms=round(health.latency_ms, 1),
+                last_checked=health.checked_at,
             )
         )
 
@@ -3,19 +3,34 @@ API endpoints for search operations.
 """
 
 import logging
+from collections.abc import AsyncIterator
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Query
+from fastapi.responses import Response, StreamingResponse
+from pydantic_core import to_json
 
-from app.core.database import get_db
+from app.config import settings
 from app.schemas import CategoriesResponse, SearchCategory, SearchResponse, SortBy, SortOrder
 from app.services import SearchAggregator
+from app.services.metrics import get_metrics
+from app.services.search_aggregator import StreamResults
+from app.services.server_timing import collect_timings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/search", tags=["search"])
 
+# Largest page a client may request
+MAX_PAGE_SIZE = 1000
+
+
+def get_search_timeout(timeout_ms: int | None) -> float | None:
+    """Resolve the search deadline in seconds, falling back to the server default."""
+    if timeout_ms is None:
+        timeout_ms = settings.SEARCH_DEFAULT_TIMEOUT_MS
+    return timeout_ms / 1000 if timeout_ms > 0 else None
+
 
 @router.get("", response_model=SearchResponse)
 async def search(
@@ -43,8 +58,31 @@ async def search(
     ] = None,
     sort_by: Annotated[SortBy, Query(description="Sort results by")] = SortBy.SEEDERS,
     sort_order: Annotated[SortOrder, Query(description="Sort order")] = SortOrder.DESC,
-    db: AsyncSession = Depends(get_db),
-) -> SearchResponse:
+    timeout_ms: Annotated[
+        int | None,
+        Query(
+            ge=100,
+            le=120_000,
+            description="Return partial results after this many milliseconds (default: server setting)",
+        ),
+    ] = None,
+    dedupe: Annotated[
+        bool,
+        Query(description="Merge copies of the same release from different sources"),
+    ] = False,
+    limit: Annotated[
+        int | None,
+        Query(ge=1, le=MAX_PAGE_SIZE, description="Page size (omit to return every result)"),
+    ] = None,
+    offset: Annotated[
+        int,
+        Query(ge=0, description="Number of results to skip"),
+    ] = 0,
+    debug: Annotated[
+        bool,
+        Query(description="Include a per-stage timing breakdown (`timings`) in the response"),
+    ] = False,
+) -> Response:
     """
     Execute a unified search across all configured indexer instances.
 
@@ -60,30 +98,149 @@ async def search(
     - **max_size**: Maximum file size filter (e.g., "10GB")
     - **sort_by**: Field to sort by (default: seeders)
     - **sort_order**: Sort order (default: desc)
+    - **timeout_ms**: Deadline in milliseconds; instances that have not answered by
+      then are cancelled and reported as timed out in `errors` (default: server setting)
+    - **dedupe**: Merge copies of the same release (same info hash, or same title and
+      size) into one result with the highest seeder count and a list of `sources`
+    - **limit** / **offset**: Return one page of the sorted results. Later pages of the
+      same search are served from the server-side cache without querying instances again
+    - **debug**: Add `timings` to the response: milliseconds spent per stage
+
+    `total_results` is always the size of the full (filtered) result set. `partial` is
+    true when some instances failed, were skipped or timed out (see `errors`).
+
+    The `Server-Timing` header breaks the request down into the instance lookup
+    (`config`), each instance's network and parse time (`jackett-<id>`,
+    `jackett-<id>-parse`, ...), filtering, sorting, paging and serialization.
 
     Returns aggregated search results from all queried instances.
     """
-    aggregator = SearchAggregator(db)
-
-    results, errors, sources_queried = await aggregator.search(
-        query=q,
-        category=category,
-        jackett_ids=jackett_ids,
-        prowlarr_ids=prowlarr_ids,
-        exclusive_filter=exclusive_filter,
-        min_seeders=min_seeders,
-        max_size=max_size,
-        sort_by=sort_by,
-        sort_order=sort_order,
+    aggregator = SearchAggregator()
+
+    with collect_timings() as timing:
+        outcome = await aggregator.search(
+            query=q,
+            category=category,
+            jackett_ids=jackett_ids,
+            prowlarr_ids=prowlarr_ids,
+            exclusive_filter=exclusive_filter,
+            min_seeders=min_seeders,
+            max_size=max_size,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            timeout=get_search_timeout(timeout_ms),
+            dedupe=dedupe,
+            limit=limit,
+            offset=offset,
+        )
+
+        # Serialize straight from the internal records: building and re-validating a
+        # SearchResponse first dominates the cost of large responses. The body has the
+        # same shape as SearchResponse (response_model still documents it). Body
+        # timings cannot include serialization itself; the header does.
+        with get_metrics().stage("serialize"):
+            body = to_json(
+                {
+                    "query": q.strip(),
+                    "category": category,
+                    "total_results": outcome.total_results,
+                    "results": [result.to_dict() for result in outcome.results],
+                    "sources_queried": outcome.sources_queried,
+                    "errors": outcome.errors,
+                    "partial": outcome.partial,
+                    "offset": offset,
+                    "limit": limit,
+                    "timings": timing.as_dict() if debug else None,
+                }
+            )
+
+    return Response(
+        body,
+        media_type="application/json",
+        headers={"Server-Timing": timing.header_value()},
+    )
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def search_stream(
+    q: Annotated[str, Query(min_length=1, max_length=500, description="Search query")],
+    category: Annotated[SearchCategory, Query(description="Category filter")] = SearchCategory.ALL,
+    jackett_ids: Annotated[
+        list[int] | None,
+        Query(description="List of Jackett instance IDs to search (omit for all)"),
+    ] = None,
+    prowlarr_ids: Annotated[
+        list[int] | None,
+        Query(description="List of Prowlarr instance IDs to search (omit for all)"),
+    ] = None,
+    exclusive_filter: Annotated[
+        bool,
+        Query(description="If true, only search specified instances (empty means none, not all)"),
+    ] = False,
+    min_seeders: Annotated[
+        int,
+        Query(ge=0, description="Minimum number of seeders"),
+    ] = 0,
+    max_size: Annotated[
+        str | None,
+        Query(description="Maximum file size (e.g., '10GB', '500MB')"),
+    ] = None,
+    sort_by: Annotated[SortBy, Query(description="Sort results by")] = SortBy.SEEDERS,
+    sort_order: Annotated[SortOrder, Query(description="Sort order")] = SortOrder.DESC,
+    timeout_ms: Annotated[
+        int | None,
+        Query(
+            ge=100,
+            le=120_000,
+            description="Return partial results after this many milliseconds (default: server setting)",
+        ),
+    ] = None,
+) -> StreamingResponse:
+    """
+    Execute a unified search, streaming results as each instance answers.
+
+    Accepts the same query parameters as `GET /search`. The response is
+    newline-delimited JSON (`application/x-ndjson`), one event per line:
+
+    - **results**: filtered, sorted results from one instance
+    - **source_status**: an instance finished (`ok`, `error` or `timeout`, with result count)
+    - **summary**: sent last; totals, errors and `result_ids` in the final sort
+      order, matching what `GET /search` returns
+    """
+    aggregator = SearchAggregator()
+
+    # Resolve instances before streaming starts, so the set is fixed for the whole stream
+    jackett_instances, prowlarr_instances = await aggregator.resolve_instances(
+        jackett_ids, prowlarr_ids, exclusive_filter
     )
 
-    return SearchResponse(
-        query=q,
-        category=category,
-        total_results=len(results),
-        results=results,
-        sources_queried=sources_queried,
-        errors=errors,
+    async def event_stream() -> AsyncIterator[bytes]:
+        async for event in aggregator.search_stream(
+            jackett_instances,
+            prowlarr_instances,
+            query=q,
+            category=category,
+            min_seeders=min_seeders,
+            max_size=max_size,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            timeout=get_search_timeout(timeout_ms),
+        ):
+            if isinstance(event, StreamResults):
+                # Serialized straight from the records, as in GET /search
+                yield to_json(event.to_dict()) + b"\n"
+            else:
+                yield event.model_dump_json().encode() + b"\n"
+
+    # Ask nginx not to buffer the stream, so events reach the client as they are sent
+    return StreamingResponse(
+        event_stream(),
+        media_type="application/x-ndjson",
+        headers={"X-Accel-Buffering": "no"},
     )
 
 
@@ -33,6 +33,106 @@ class Settings(BaseSettings):
         default="./searcharr.db", description="SQLite database file path"
     )
 
+    # Outbound HTTP connection pooling (per Jackett/Prowlarr instance)
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = Field(
+        default=10, description="Maximum concurrent connections per indexer instance"
+    )
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        default=5, description="Maximum idle keep-alive connections per indexer instance"
+    )
+    HTTP_KEEPALIVE_EXPIRY: float = Field(
+        default=60.0, description="Seconds an idle keep-alive connection is kept open"
+    )
+
+    # Capture mode: record raw Jackett/Prowlarr responses for offline benchmarks
+    CASSETTE_RECORD_DIR: str = Field(
+        default="", description="Record raw instance responses to this directory (empty disables)"
+    )
+
+    # Multiple workers
+    WORKERS: int = Field(default=1, description="Number of server worker processes")
+    SHARED_STATE_PATH: str = Field(
+        default="",
+        description="SQLite file for state shared between workers (empty keeps it per process)",
+    )
+    SHARED_STATE_MAX_ENTRIES: int = Field(
+        default=2048, description="Maximum number of instance result sets in the shared state"
+    )
+    SHARED_STATE_POLL_SECONDS: float = Field(
+        default=0.5, description="Seconds between checks for configuration changes by other workers"
+    )
+
+    # Multiple replicas (PostgreSQL only)
+    CHANGE_EVENTS_ENABLED: bool = Field(
+        default=True,
+        description="Apply instance and client changes made through other replicas (LISTEN/NOTIFY)",
+    )
+
+    # Status checks (Instances and Clients pages)
+    STATUS_CHECK_CONCURRENCY: int = Field(
+        default=8, description="Maximum number of status checks run at the same time"
+    )
+    STATUS_CHECK_TIMEOUT_SECONDS: float = Field(
+        default=5.0, description="Deadline for a single instance or client status check"
+    )
+
+    # Background health monitor
+    HEALTH_MONITOR_ENABLED: bool = Field(
+        default=True, description="Probe instances and clients in the background"
+    )
+    HEALTH_CHECK_INTERVAL_SECONDS: float = Field(
+        default=60.0, description="Seconds between background probes of an online target"
+    )
+    HEALTH_CHECK_OFFLINE_INTERVAL_SECONDS: float = Field(
+        default=15.0, description="Seconds between background probes of an offline target"
+    )
+
+    # Search deadline
+    SEARCH_DEFAULT_TIMEOUT_MS: int = Field(
+        default=0,
+        description="Milliseconds a search waits before returning partial results (0 = no limit)",
+    )
+
+    # Search circuit breaker
+    SEARCH_BREAKER_FAILURE_THRESHOLD: int = Field(
+        default=3, description="Consecutive search failures before an instance is skipped"
+    )
+    SEARCH_BREAKER_RETRY_SECONDS: float = Field(
+        default=30.0, description="Seconds between probes of a skipped instance"
+    )
+
+    # Search result cache
+    SEARCH_CACHE_TTL_SECONDS: float = Field(
+        default=300.0, description="Seconds raw search results are cached (0 disables)"
+    )
+    SEARCH_CACHE_PARTIAL_TTL_SECONDS: float = Field(
+        default=30.0,
+        description="Seconds a search some instances failed, skipped or timed out is cached",
+    )
+    SEARCH_CACHE_MAX_ENTRIES: int = Field(
+        default=256, description="Maximum number of cached searches"
+    )
+    SEARCH_CACHE_MAX_RESULTS: int = Field(
+        default=200_000,
+        description="Maximum number of results held across all cached searches and their views",
+    )
+
+    # Response compression
+    COMPRESSION_ENABLED: bool = Field(
+        default=True, description="Compress responses the client accepts (gzip, br, zstd)"
+    )
+    COMPRESSION_MIN_SIZE_BYTES: int = Field(
+        default=1024, description="Complete responses smaller than this are sent uncompressed"
+    )
+
+    # Metrics
+    METRICS_ENABLED: bool = Field(
+        default=True, description="Expose Prometheus metrics at /api/metrics"
+    )
+    EVENT_LOOP_LAG_INTERVAL_SECONDS: float = Field(
+        default=0.5, description="Seconds between event loop lag samples (0 disables)"
+    )
+
     # Logging
     LOG_LEVEL: str = Field(default="INFO", description="Logging level")
 
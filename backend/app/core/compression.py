@@ -0,0 +1,235 @@
+"""
+Response compression middleware.
+
+Compresses responses with the best encoding the client accepts: brotli or
+zstd when the optional `brotli` / `zstandard` packages are installed, gzip
+otherwise. Complete bodies smaller than a threshold are sent as-is. Streamed
+bodies (e.g. NDJSON search results) are flushed chunk by chunk, so every
+event still reaches the client as soon as it is sent.
+"""
+
+import importlib
+import zlib
+from collections.abc import Callable
+from typing import Any, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def _optional_module(name: str) -> Any:
+    """Import an optional dependency, or return None if it is not installed."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+brotli = _optional_module("brotli")
+zstandard = _optional_module("zstandard")
+
+
+class Compressor(Protocol):
+    """Incremental compressor for one response body."""
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk, making everything so far decodable by the client."""
+        ...
+
+    def finish(self) -> bytes:
+        """End the compressed stream."""
+        ...
+
+
+class GzipCompressor:
+    """gzip via zlib; sync flushes keep streamed chunks decodable."""
+
+    def __init__(self, level: int = 6) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor:
+    """Brotli (requires the `brotli` package)."""
+
+    def __init__(self, quality: int = 4) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return bytes(self._compressor.process(data) + self._compressor.flush())
+
+    def finish(self) -> bytes:
+        return bytes(self._compressor.finish())
+
+
+class ZstdCompressor:
+    """Zstandard (requires the `zstandard` package)."""
+
+    def __init__(self, level: int = 3) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return bytes(
+            self._compressor.compress(data)
+            + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        )
+
+    def finish(self) -> bytes:
+        return bytes(self._compressor.flush())
+
+
+def available_encodings() -> dict[str, Callable[[], Compressor]]:
+    """Supported encodings, in order of preference."""
+    encodings: dict[str, Callable[[], Compressor]] = {}
+    if brotli is not None:
+        encodings["br"] = BrotliCompressor
+    if zstandard is not None:
+        encodings["zstd"] = ZstdCompressor
+    encodings["gzip"] = GzipCompressor
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: str, supported: list[str]) -> str | None:
+    """
+    Pick an encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: The header value (e.g. "gzip, br;q=0.9, *;q=0")
+        supported: Encodings the server can produce, in order of preference
+
+    Returns:
+        The encoding with the highest q-value (server preference on ties),
+        or None if the client accepts none of them
+    """
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+
+    best: str | None = None
+    best_weight = 0.0
+    for encoding in supported:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing HTTP responses per the request's Accept-Encoding."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The wrapped application
+            minimum_size: Complete bodies smaller than this many bytes are not compressed
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), list(self.encodings)
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressedResponder(
+            send, encoding, self.encodings[encoding], self.minimum_size
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressedResponder:
+    """Rewrites one response's messages into a compressed response."""
+
+    def __init__(
+        self,
+        send: Send,
+        encoding: str,
+        compressor_factory: Callable[[], Compressor],
+        minimum_size: int,
+    ) -> None:
+        self._send = send
+        self._encoding = encoding
+        self._compressor_factory = compressor_factory
+        self._minimum_size = minimum_size
+        self._start: Message | None = None
+        self._compressor: Compressor | None = None
+        # Set once the response is known to pass through unchanged
+        self._passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if self._passthrough:
+            await self._send(message)
+            return
+
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self._start = message
+            # Already encoded, or a range/partial response: leave it alone
+            if "content-encoding" in headers or message["status"] in (204, 206, 304):
+                self._passthrough = True
+                await self._send(message)
+            return
+
+        if message["type"] != "http.response.body" or self._start is None:
+            await self._send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self._compressor is None:
+            if not more_body and len(body) < self._minimum_size:
+                # Small, complete body: not worth compressing
+                self._passthrough = True
+                await self._send(self._start)
+                await self._send(message)
+                return
+
+            self._compressor = self._compressor_factory()
+            headers = MutableHeaders(raw=self._start["headers"])
+            headers["Content-Encoding"] = self._encoding
+            headers.add_vary_header("Accept-Encoding")
+
+            if not more_body:
+                compressed = self._compressor.compress(body) + self._compressor.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await self._send(self._start)
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+
+            # Streamed body: length unknown up front
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            await self._send(self._start)
+
+        chunk = self._compressor.compress(body) if body else b""
+        if not more_body:
+            chunk += self._compressor.finish()
+        if chunk or not more_body:
+            await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
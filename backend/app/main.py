@@ -11,12 +11,21 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.api.health import router as health_router
+from app.api.metrics import router as metrics_router
 from app.api.v1.router import api_router as v1_router
 from app.config import settings
+from app.core.compression import CompressionMiddleware
 from app.core.database import Base, get_engine
 
 # Import models so they are registered with SQLAlchemy Base
 from app.models import DownloadClient, JackettInstance, ProwlarrInstance  # noqa: F401
+from app.services.change_events import get_change_events
+from app.services.config_registry import get_config_registry
+from app.services.health_monitor import get_health_monitor
+from app.services.http_clients import get_http_client_registry
+from app.services.invalidation import apply_replica_change, invalidate_all_local, invalidate_local
+from app.services.loop_lag import get_loop_lag_monitor
+from app.services.shared_state import get_shared_state
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -37,12 +46,46 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+    # With several workers, apply configuration changes made through the others
+    # (from before the configuration is loaded, so none is missed)
+    shared_state = get_shared_state()
+    if shared_state is not None:
+        shared_state.start(invalidate_local)
+
+    # With several replicas on PostgreSQL, apply configuration changes made through the others
+    change_events = get_change_events()
+    if change_events is not None:
+        change_events.start(apply_replica_change, invalidate_all_local)
+
+    # Instance and client configuration, kept in memory for searches and downloads
+    await get_config_registry().load()
+
+    # Pooled HTTP clients for indexer instances, reused across requests
+    http_clients = get_http_client_registry()
+
+    # Background probes keep instance/client status warm for the status endpoints
+    health_monitor = get_health_monitor()
+    if settings.HEALTH_MONITOR_ENABLED:
+        health_monitor.start()
+
+    # Event loop lag shows when CPU-bound work holds up other requests
+    loop_lag_monitor = get_loop_lag_monitor()
+    if settings.METRICS_ENABLED and settings.EVENT_LOOP_LAG_INTERVAL_SECONDS > 0:
+        loop_lag_monitor.start()
+
     logger.info("Application started successfully")
 
     yield
 
     # Shutdown
     logger.info("Shutting down application...")
+    await health_monitor.stop()
+    await loop_lag_monitor.stop()
+    if shared_state is not None:
+        await shared_state.stop()
+    if change_events is not None:
+        await change_events.stop()
+    await http_clients.aclose()
     await engine.dispose()
 
 
@@ -66,9 +109,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses (e.g. search results); streamed responses are flushed per chunk
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE_BYTES)
+
 # Include routers
 app.include_router(health_router, tags=["health"])
 app.include_router(v1_router, prefix="/api/v1")
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router, prefix="/api", tags=["metrics"])
 
 
 @app.exception_handler(404)
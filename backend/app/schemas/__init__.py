@@ -34,6 +34,11 @@ from app.schemas.search import (
     SearchCategory,
     SearchResponse,
     SearchResult,
+    SearchResultSource,
+    SearchStreamEvent,
+    SearchStreamResults,
+    SearchStreamSourceStatus,
+    SearchStreamSummary,
     SortBy,
     SortOrder,
 )
@@ -65,7 +70,12 @@ __all__ = [
     "SortOrder",
     "CATEGORY_MAPPINGS",
     "SearchResult",
+    "SearchResultSource",
     "SearchResponse",
+    "SearchStreamEvent",
+    "SearchStreamResults",
+    "SearchStreamSourceStatus",
+    "SearchStreamSummary",
     "CategoriesResponse",
     # Download
     "DownloadRequest",
@@ -2,6 +2,8 @@
 Pydantic schemas for download client management.
 """
 
+from datetime import datetime
+
 from pydantic import Field
 
 from app.models.client import ClientType
@@ -61,3 +63,7 @@ class DownloadClientWithStatus(DownloadClientResponse):
     """Download client response with runtime status information."""
 
     status: str = Field(..., description="online or offline")
+    check_duration_ms: float | None = Field(
+        None, description="How long the status check took, in milliseconds"
+    )
+    last_checked: datetime | None = Field(None, description="When the status was last checked")
@@ -2,6 +2,8 @@
 Pydantic schemas for Jackett and Prowlarr instance management.
 """
 
+from datetime import datetime
+
 from pydantic import Field
 
 from app.schemas.base import BaseSchema, TimestampSchema
@@ -56,6 +58,10 @@ class JackettInstanceWithStatus(JackettInstanceResponse):
 
     status: str = Field(..., description="online or offline")
     indexer_count: int | None = Field(None, description="Number of configured indexers")
+    check_duration_ms: float | None = Field(
+        None, description="How long the status check took, in milliseconds"
+    )
+    last_checked: datetime | None = Field(None, description="When the status was last checked")
 
 
 # =============================================================================
@@ -101,6 +107,10 @@ class ProwlarrInstanceWithStatus(ProwlarrInstanceResponse):
 
     status: str = Field(..., description="online or offline")
     indexer_count: int | None = Field(None, description="Number of configured indexers")
+    check_duration_ms: float | None = Field(
+        None, description="How long the status check took, in milliseconds"
+    )
+    last_checked: datetime | None = Field(None, description="When the status was last checked")
 
 
 # =============================================================================
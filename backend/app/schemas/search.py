@@ -4,6 +4,7 @@ Pydantic schemas for search operations.
 
 from datetime import datetime
 from enum import Enum
+from typing import Literal
 
 from pydantic import Field
 
@@ -54,6 +55,16 @@ CATEGORY_MAPPINGS: dict[SearchCategory, list[int] | None] = {
 }
 
 
+class SearchResultSource(BaseSchema):
+    """One copy of a release that was merged into a deduplicated result."""
+
+    source: str = Field(..., description="Instance name that found this copy")
+    source_type: str = Field(..., description="jackett or prowlarr")
+    indexer: str = Field(..., description="Specific indexer within the instance")
+    seeders: int = Field(..., ge=0, description="Number of seeders reported by this copy")
+    leechers: int = Field(..., ge=0, description="Number of leechers reported by this copy")
+
+
 class SearchResult(BaseSchema):
     """Individual search result from an indexer."""
 
@@ -71,17 +82,72 @@ class SearchResult(BaseSchema):
     magnet_link: str | None = Field(None, description="Magnet URI if available")
     torrent_url: str | None = Field(None, description="Direct .torrent download URL if available")
     info_url: str | None = Field(None, description="Link to torrent info page")
+    infohash: str | None = Field(default=None, description="BitTorrent v1 info hash (hex) if known")
+    sources: list[SearchResultSource] | None = Field(
+        default=None, description="Every copy merged into this result (only when deduplicating)"
+    )
 
 
 class SearchResponse(BaseSchema):
     """Response containing search results."""
 
+    query: str = Field(..., description="The search query that was executed")
+    category: SearchCategory = Field(..., description="Category filter applied")
+    total_results: int = Field(..., description="Total number of results across all pages")
+    results: list[SearchResult] = Field(..., description="List of search results (this page)")
+    sources_queried: int = Field(..., description="Number of instances queried")
+    errors: list[str] = Field(default_factory=list, description="Errors encountered during search")
+    partial: bool = Field(
+        default=False,
+        description="Some instances failed, were skipped or timed out; results come from the others",
+    )
+    offset: int = Field(default=0, description="Index of the first result in this page")
+    limit: int | None = Field(default=None, description="Page size (None when not paginated)")
+    timings: dict[str, float] | None = Field(
+        default=None,
+        description="Milliseconds spent in each stage of the search (only with debug=true)",
+    )
+
+
+class SearchStreamResults(BaseSchema):
+    """Streaming search event: filtered, sorted results from one instance."""
+
+    event: Literal["results"] = "results"
+    source: str = Field(..., description="Instance name that returned these results")
+    source_type: str = Field(..., description="jackett or prowlarr")
+    results: list[SearchResult] = Field(..., description="Results from this instance")
+
+
+class SearchStreamSourceStatus(BaseSchema):
+    """Streaming search event: an instance has finished answering."""
+
+    event: Literal["source_status"] = "source_status"
+    source: str = Field(..., description="Instance name")
+    source_type: str = Field(..., description="jackett or prowlarr")
+    status: str = Field(..., description="ok, error or timeout")
+    result_count: int = Field(..., description="Number of results after filtering")
+    error: str | None = Field(None, description="Error message if the instance failed")
+
+
+class SearchStreamSummary(BaseSchema):
+    """Streaming search event: final summary, sent once every instance has answered."""
+
+    event: Literal["summary"] = "summary"
     query: str = Field(..., description="The search query that was executed")
     category: SearchCategory = Field(..., description="Category filter applied")
     total_results: int = Field(..., description="Total number of results")
-    results: list[SearchResult] = Field(..., description="List of search results")
     sources_queried: int = Field(..., description="Number of instances queried")
     errors: list[str] = Field(default_factory=list, description="Errors encountered during search")
+    partial: bool = Field(
+        default=False,
+        description="Some instances failed, were skipped or timed out; results come from the others",
+    )
+    result_ids: list[str] = Field(
+        ..., description="IDs of all results in final sort order, as /search would return them"
+    )
+
+
+SearchStreamEvent = SearchStreamResults | SearchStreamSourceStatus | SearchStreamSummary
 
 
 class CategoriesResponse(BaseSchema):
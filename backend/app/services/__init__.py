@@ -4,17 +4,47 @@ Services package.
 This module exports all service classes for business logic.
 """
 
+from app.services.change_events import ChangeEvents, get_change_events
+from app.services.circuit_breaker import CircuitBreaker, get_circuit_breaker
+from app.services.config_registry import ConfigRegistry, get_config_registry
 from app.services.encryption import decrypt_credential, encrypt_credential
+from app.services.health_monitor import HealthMonitor, HealthStatus, get_health_monitor
+from app.services.http_clients import HttpClientRegistry, get_http_client_registry
 from app.services.jackett import JackettService
+from app.services.metrics import SearchMetrics, get_metrics
 from app.services.prowlarr import ProwlarrService
 from app.services.qbittorrent import QBittorrentService
 from app.services.search_aggregator import SearchAggregator
+from app.services.search_cache import SearchResultCache, get_search_cache
+from app.services.search_record import SearchRecord
+from app.services.shared_state import SharedState, get_shared_state
+from app.services.single_flight import SingleFlight, get_search_flights
 
 __all__ = [
+    "ChangeEvents",
+    "get_change_events",
+    "CircuitBreaker",
+    "get_circuit_breaker",
+    "ConfigRegistry",
+    "get_config_registry",
     "encrypt_credential",
     "decrypt_credential",
+    "HealthMonitor",
+    "HealthStatus",
+    "get_health_monitor",
+    "HttpClientRegistry",
+    "get_http_client_registry",
     "JackettService",
+    "SearchMetrics",
+    "get_metrics",
     "ProwlarrService",
     "QBittorrentService",
     "SearchAggregator",
+    "SearchResultCache",
+    "get_search_cache",
+    "SearchRecord",
+    "SharedState",
+    "get_shared_state",
+    "SingleFlight",
+    "get_search_flights",
 ]
@@ -0,0 +1,206 @@
+"""
+Record and replay raw Jackett/Prowlarr responses ("cassettes").
+
+In capture mode (CASSETTE_RECORD_DIR), the pooled instance clients send
+requests through CassetteRecorder, which passes every response through
+unchanged while writing its status, headers, raw body and timing to the
+cassette directory. replay_transport() serves recorded responses back
+through an httpx.MockTransport, so parsers and aggregation can be
+benchmarked against production-shaped payloads offline and repeatably.
+
+Cassettes are matched on method, URL and query string, with API keys left
+out of both the match and the stored metadata. Response bodies are stored
+as received and can still contain tracker passkeys in download links, so
+treat a cassette directory as private.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import httpx
+
+# Query parameters and headers that carry credentials
+SECRET_PARAMS = frozenset({"apikey", "api_key"})
+
+# Response headers kept in a cassette (the ones needed to decode the body)
+RECORDED_HEADERS = ("content-type", "content-encoding")
+
+# Replayed bodies are streamed in chunks of this size, like a network read
+REPLAY_CHUNK_SIZE = 64 * 1024
+
+
+class CassetteNotFoundError(LookupError):
+    """No cassette was recorded for a replayed request."""
+
+
+class Cassette(NamedTuple):
+    """One recorded response."""
+
+    method: str
+    url: str
+    status_code: int
+    headers: dict[str, str]
+    # Time to the response headers, and to the end of the body, in seconds
+    headers_seconds: float
+    duration_seconds: float
+    body: bytes
+
+
+def redacted_url(url: httpx.URL) -> str:
+    """The URL with credential query parameters removed and the rest sorted."""
+    params = sorted((k, v) for k, v in url.params.multi_items() if k.lower() not in SECRET_PARAMS)
+    return str(url.copy_with(params=params, fragment=None))
+
+
+def cassette_key(method: str, url: httpx.URL | str) -> str:
+    """File name stem of the cassette for a request."""
+    normalized = f"{method.upper()} {redacted_url(httpx.URL(url))}"
+    return hashlib.sha256(normalized.encode()).hexdigest()[:24]
+
+
+def save_cassette(directory: Path, cassette: Cassette) -> None:
+    """Write a cassette as `<key>.json` (metadata) and `<key>.body` (raw body)."""
+    directory.mkdir(parents=True, exist_ok=True)
+    key = cassette_key(cassette.method, cassette.url)
+    metadata = cassette._asdict()
+    del metadata["body"]
+    metadata["recorded_at"] = datetime.now(UTC).isoformat()
+    (directory / f"{key}.body").write_bytes(cassette.body)
+    (directory / f"{key}.json").write_text(json.dumps(metadata, indent=2) + "\n")
+
+
+def load_cassettes(directory: str | Path) -> dict[str, Cassette]:
+    """
+    Load every cassette in a directory.
+
+    Returns:
+        Cassettes by key (see cassette_key())
+    """
+    cassettes = {}
+    for path in sorted(Path(directory).glob("*.json")):
+        metadata: dict[str, Any] = json.loads(path.read_text())
+        metadata.pop("recorded_at", None)
+        cassettes[path.stem] = Cassette(**metadata, body=path.with_suffix(".body").read_bytes())
+    return cassettes
+
+
+class _RecordingStream(httpx.AsyncByteStream):
+    """Passes a response body through, saving it as a cassette once fully read."""
+
+    def __init__(
+        self,
+        stream: httpx.AsyncByteStream,
+        directory: Path,
+        request: httpx.Request,
+        response: httpx.Response,
+        started: float,
+    ) -> None:
+        self._stream = stream
+        self._directory = directory
+        self._request = request
+        self._response = response
+        self._started = started
+        self._headers_seconds = time.perf_counter() - started
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        chunks = []
+        async for chunk in self._stream:
+            chunks.append(chunk)
+            yield chunk
+
+        headers = {
+            name: self._response.headers[name]
+            for name in RECORDED_HEADERS
+            if name in self._response.headers
+        }
+        cassette = Cassette(
+            method=self._request.method,
+            url=redacted_url(self._request.url),
+            status_code=self._response.status_code,
+            headers=headers,
+            headers_seconds=round(self._headers_seconds, 6),
+            duration_seconds=round(time.perf_counter() - self._started, 6),
+            body=b"".join(chunks),
+        )
+        await asyncio.to_thread(save_cassette, self._directory, cassette)
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+
+class CassetteRecorder(httpx.AsyncBaseTransport):
+    """Transport that records every fully read response to a cassette directory."""
+
+    def __init__(
+        self, directory: str | Path, transport: httpx.AsyncBaseTransport | None = None
+    ) -> None:
+        """
+        Initialize the recorder.
+
+        Args:
+            directory: Cassette directory (created on first write)
+            transport: Transport that sends the requests (a default one when omitted)
+        """
+        self.directory = Path(directory)
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self._transport.handle_async_request(request)
+        assert isinstance(response.stream, httpx.AsyncByteStream)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_RecordingStream(response.stream, self.directory, request, response, started),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def replay_transport(
+    cassettes: str | Path | dict[str, Cassette], latency_scale: float = 0.0
+) -> httpx.MockTransport:
+    """
+    Build a transport that answers requests from recorded cassettes.
+
+    Args:
+        cassettes: A cassette directory, or cassettes loaded with load_cassettes()
+        latency_scale: Multiplier for the recorded timing (0 answers immediately,
+            1 replays the recorded latency and body transfer time)
+
+    Returns:
+        A MockTransport; requests without a cassette raise CassetteNotFoundError
+    """
+    if not isinstance(cassettes, dict):
+        cassettes = load_cassettes(cassettes)
+    recorded = cassettes
+
+    async def body(cassette: Cassette) -> AsyncIterator[bytes]:
+        chunk_count = max(1, -(-len(cassette.body) // REPLAY_CHUNK_SIZE))
+        transfer = max(0.0, cassette.duration_seconds - cassette.headers_seconds)
+        for start in range(0, len(cassette.body), REPLAY_CHUNK_SIZE):
+            if latency_scale > 0:
+                await asyncio.sleep(transfer * latency_scale / chunk_count)
+            yield cassette.body[start : start + REPLAY_CHUNK_SIZE]
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        cassette = recorded.get(cassette_key(request.method, request.url))
+        if cassette is None:
+            raise CassetteNotFoundError(
+                f"No cassette for {request.method} {redacted_url(request.url)}"
+            )
+        if latency_scale > 0:
+            await asyncio.sleep(cassette.headers_seconds * latency_scale)
+        return httpx.Response(
+            cassette.status_code, headers=cassette.headers, content=body(cassette)
+        )
+
+    return httpx.MockTransport(handle)
@@ -0,0 +1,162 @@
+"""
+Instance and client change events between replicas, over PostgreSQL NOTIFY.
+
+Several replicas behind a load balancer share one database but keep their own
+in-memory caches. When an instance or client changes, the replica that made
+the change publishes an event with NOTIFY; every replica LISTENs on one
+connection and evicts what it cached from the old configuration.
+
+Events published while a replica's connection was down are lost, so each time
+it (re)connects a replica drops all of its configuration-derived caches.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import uuid
+from collections.abc import Callable, Coroutine
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+from app.core.database import get_engine
+
+logger = logging.getLogger(__name__)
+
+# Channel the events are published on
+CHANNEL = "searcharr_changes"
+
+# Seconds between checks that the listening connection is still alive
+LISTEN_CHECK_SECONDS = 30.0
+
+# Seconds before reconnecting after the listening connection failed
+RECONNECT_SECONDS = 5.0
+
+# Applies another replica's change to this worker's caches
+ChangeHandler = Callable[[str, int], Coroutine[Any, Any, None]]
+
+# Drops every configuration-derived cache (after events may have been missed)
+ResyncHandler = Callable[[], None]
+
+
+class ChangeEvents:
+    """Publishes and listens for instance and client changes over PostgreSQL NOTIFY."""
+
+    def __init__(self, engine: AsyncEngine | None = None, channel: str = CHANNEL) -> None:
+        """
+        Initialize the change events.
+
+        Args:
+            engine: PostgreSQL engine (defaults to the app's)
+            channel: Channel to publish and listen on
+        """
+        self._engine = engine
+        self.channel = channel
+        # Identifies this worker's own events, which it has already applied
+        self.origin = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._listener: asyncio.Task[None] | None = None
+        self._applying: set[asyncio.Task[None]] = set()
+
+    @property
+    def engine(self) -> AsyncEngine:
+        """The engine events are published and received through."""
+        return self._engine or get_engine()
+
+    async def publish(self, target_type: str, target_id: int) -> None:
+        """
+        Tell every replica an instance or client changed.
+
+        Args:
+            target_type: "jackett", "prowlarr" or "client"
+            target_id: ID of the instance or client
+        """
+        payload = json.dumps({"origin": self.origin, "type": target_type, "id": target_id})
+        async with self.engine.begin() as conn:
+            await conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self.channel, "payload": payload},
+            )
+
+    def start(self, handler: ChangeHandler, resync: ResyncHandler) -> None:
+        """
+        Start applying other replicas' changes.
+
+        Args:
+            handler: Applies one change to this worker's caches
+            resync: Drops every configuration-derived cache; called whenever
+                the listening connection is (re-)established
+        """
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(
+                self._listen(handler, resync), name="change-events"
+            )
+
+    async def stop(self) -> None:
+        """Stop listening for changes."""
+        if self._listener is None:
+            return
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        self._listener = None
+
+    def receive(self, payload: str, handler: ChangeHandler) -> None:
+        """Apply one event, unless this worker published it."""
+        try:
+            event = json.loads(payload)
+            origin, target_type, target_id = event["origin"], event["type"], int(event["id"])
+        except (ValueError, TypeError, KeyError):
+            logger.warning(f"Ignoring malformed change event: {payload!r}")
+            return
+        if origin == self.origin:
+            return
+
+        task = asyncio.get_running_loop().create_task(handler(target_type, target_id))
+        self._applying.add(task)
+        task.add_done_callback(self._applying.discard)
+
+    async def _listen(self, handler: ChangeHandler, resync: ResyncHandler) -> None:
+        """Listen loop: hold a LISTEN connection, re-establishing it when it fails."""
+
+        def on_notification(connection: Any, pid: int, channel: str, payload: str) -> None:
+            self.receive(payload, handler)
+
+        while True:
+            try:
+                async with self.engine.connect() as conn:
+                    try:
+                        raw = await conn.get_raw_connection()
+                        # asyncpg connection
+                        listener: Any = raw.driver_connection
+                        await listener.add_listener(self.channel, on_notification)
+                        # Changes made before LISTEN took effect (at startup, or
+                        # while reconnecting) were missed
+                        resync()
+
+                        while True:
+                            await asyncio.sleep(LISTEN_CHECK_SECONDS)
+                            # Fails if the connection dropped, so it is re-established
+                            await listener.execute("SELECT 1")
+                    finally:
+                        # Never hand the listening connection back to the pool
+                        await conn.invalidate()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Change event listener failed; reconnecting")
+            await asyncio.sleep(RECONNECT_SECONDS)
+
+
+@lru_cache
+def get_change_events() -> ChangeEvents | None:
+    """Get the change events between replicas (None unless enabled on PostgreSQL)."""
+    if settings.DATABASE_TYPE != "postgresql" or not settings.CHANGE_EVENTS_ENABLED:
+        return None
+    return ChangeEvents()
@@ -0,0 +1,131 @@
+"""
+Per-instance circuit breakers for upstream searches.
+
+When an indexer instance keeps failing, searches stop waiting on it: after
+enough consecutive failures its circuit opens and the instance is skipped
+until a background probe sees it answering again.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Circuits are identified by ("jackett" | "prowlarr", instance id)
+CircuitKey = tuple[str, int]
+
+
+class CircuitBreaker:
+    """
+    Tracks consecutive failures per instance and opens a circuit past a threshold.
+
+    An open circuit stays open until a probe succeeds. Probes are started by
+    the caller (see probe()) at most once every `retry_seconds` per instance.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = settings.SEARCH_BREAKER_FAILURE_THRESHOLD,
+        retry_seconds: float = settings.SEARCH_BREAKER_RETRY_SECONDS,
+    ) -> None:
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open a circuit (0 disables)
+            retry_seconds: Minimum seconds between probes of an open circuit
+        """
+        self.failure_threshold = failure_threshold
+        self.retry_seconds = retry_seconds
+        self._failures: dict[CircuitKey, int] = {}
+        # Open circuits, mapped to when they were opened or last probed
+        self._opened_at: dict[CircuitKey, float] = {}
+        self._probes: dict[CircuitKey, asyncio.Task[None]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether circuits can open at all."""
+        return self.failure_threshold > 0
+
+    def is_open(self, key: CircuitKey) -> bool:
+        """Whether an instance is currently being skipped."""
+        return key in self._opened_at
+
+    def record_success(self, key: CircuitKey) -> None:
+        """Reset the failure count and close the circuit."""
+        self._failures.pop(key, None)
+        if self._opened_at.pop(key, None) is not None:
+            logger.info(f"Circuit for {key[0]} instance {key[1]} closed")
+
+    def record_failure(self, key: CircuitKey) -> None:
+        """Count a failure, opening the circuit once the threshold is reached."""
+        if not self.enabled:
+            return
+
+        failures = self._failures.get(key, 0) + 1
+        self._failures[key] = failures
+        if failures >= self.failure_threshold and key not in self._opened_at:
+            self._opened_at[key] = time.monotonic()
+            logger.warning(
+                f"Circuit for {key[0]} instance {key[1]} opened after {failures} failures"
+            )
+
+    def probe(self, key: CircuitKey, check: Callable[[], Awaitable[bool]]) -> None:
+        """
+        Probe an open circuit in the background if it is due for a retry.
+
+        Args:
+            key: Circuit to probe
+            check: Coroutine factory returning True if the instance is healthy
+        """
+        opened_at = self._opened_at.get(key)
+        if opened_at is None or key in self._probes:
+            return
+        if time.monotonic() - opened_at < self.retry_seconds:
+            return
+
+        task = asyncio.create_task(self._run_probe(key, check), name=f"circuit-probe-{key}")
+        self._probes[key] = task
+        task.add_done_callback(lambda _: self._probes.pop(key, None))
+
+    def reset(self, key: CircuitKey) -> None:
+        """Forget everything about an instance (e.g. after its configuration changed)."""
+        self._failures.pop(key, None)
+        self._opened_at.pop(key, None)
+        task = self._probes.pop(key, None)
+        if task is not None:
+            task.cancel()
+
+    def clear(self) -> None:
+        """Close every circuit and cancel outstanding probes."""
+        for task in self._probes.values():
+            task.cancel()
+        self._probes.clear()
+        self._failures.clear()
+        self._opened_at.clear()
+
+    async def _run_probe(self, key: CircuitKey, check: Callable[[], Awaitable[bool]]) -> None:
+        """Run one probe and close the circuit on success, otherwise restart the wait."""
+        try:
+            healthy = await check()
+        except Exception as e:
+            logger.debug(f"Circuit probe for {key[0]} instance {key[1]} failed: {e}")
+            healthy = False
+
+        if key not in self._opened_at:
+            return
+        if healthy:
+            self.record_success(key)
+        else:
+            self._opened_at[key] = time.monotonic()
+
+
+@lru_cache
+def get_circuit_breaker() -> CircuitBreaker:
+    """Get or create the shared search circuit breaker (lazily initialized)."""
+    return CircuitBreaker()
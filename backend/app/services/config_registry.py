@@ -0,0 +1,144 @@
+"""
+In-process registry of instance and client configuration.
+
+Instance and client settings change rarely, but searches and downloads need
+them on every request. The registry keeps an immutable snapshot of every
+Jackett instance, Prowlarr instance and download client in memory, so those
+hot paths need no database session. Create, update and delete handlers
+invalidate it, and the next reader loads a fresh snapshot.
+"""
+
+import asyncio
+from functools import lru_cache
+from typing import NamedTuple
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.future import select
+
+from app.core.database import get_session_factory
+from app.models import ClientType, DownloadClient, JackettInstance, ProwlarrInstance
+
+
+class IndexerConfig(NamedTuple):
+    """Connection settings of a Jackett or Prowlarr instance."""
+
+    id: int
+    name: str
+    url: str
+    api_key: str  # Encrypted, as stored
+
+
+class ClientConfig(NamedTuple):
+    """Connection settings of a download client."""
+
+    id: int
+    name: str
+    client_type: ClientType
+    url: str
+    username: str  # Encrypted, as stored
+    password: str  # Encrypted, as stored
+    category: str | None
+
+
+class ConfigSnapshot(NamedTuple):
+    """Every configured instance and client, ordered by ID."""
+
+    version: int
+    jackett: tuple[IndexerConfig, ...]
+    prowlarr: tuple[IndexerConfig, ...]
+    clients: tuple[ClientConfig, ...]
+
+    def get_client(self, client_id: int) -> ClientConfig | None:
+        """Get a download client by ID."""
+        return next((client for client in self.clients if client.id == client_id), None)
+
+
+class ConfigRegistry:
+    """
+    Versioned, lazily reloaded snapshot of instance and client configuration.
+
+    Every invalidate() bumps the version. A snapshot is current while its
+    version matches; otherwise the next snapshot() call reloads it (once, even
+    with many concurrent callers).
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession] | None = None) -> None:
+        """
+        Initialize the registry.
+
+        Args:
+            session_factory: Session factory used to load configuration (defaults to the app's)
+        """
+        self.session_factory = session_factory
+        self._version = 0
+        self._snapshot: ConfigSnapshot | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def version(self) -> int:
+        """Current configuration version."""
+        return self._version
+
+    async def snapshot(self) -> ConfigSnapshot:
+        """Get the current configuration, loading it if it changed since the last load."""
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self._version:
+            return snapshot
+
+        async with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.version == self._version:
+                return snapshot
+            return await self._load()
+
+    async def load(self) -> ConfigSnapshot:
+        """Load the configuration now (e.g. at startup)."""
+        self.invalidate()
+        return await self.snapshot()
+
+    def invalidate(self) -> None:
+        """Mark the configuration as changed; the next reader reloads it."""
+        self._version += 1
+
+    def clear(self) -> None:
+        """Drop the snapshot."""
+        self._snapshot = None
+        self._lock = asyncio.Lock()
+        self.invalidate()
+
+    async def _load(self) -> ConfigSnapshot:
+        """Read every instance and client from the database."""
+        # Changes committed while loading bump the version again, so a snapshot
+        # that might have missed them is replaced on the next read
+        version = self._version
+        session_factory = self.session_factory or get_session_factory()
+
+        async with session_factory() as session:
+            jackett = await session.execute(select(JackettInstance).order_by(JackettInstance.id))
+            prowlarr = await session.execute(select(ProwlarrInstance).order_by(ProwlarrInstance.id))
+            clients = await session.execute(select(DownloadClient).order_by(DownloadClient.id))
+
+            snapshot = ConfigSnapshot(
+                version=version,
+                jackett=tuple(
+                    IndexerConfig(i.id, i.name, i.url, i.api_key) for i in jackett.scalars()
+                ),
+                prowlarr=tuple(
+                    IndexerConfig(i.id, i.name, i.url, i.api_key) for i in prowlarr.scalars()
+                ),
+                clients=tuple(
+                    ClientConfig(
+                        c.id, c.name, c.client_type, c.url, c.username, c.password, c.category
+                    )
+                    for c in clients.scalars()
+                ),
+            )
+
+        self._snapshot = snapshot
+        return snapshot
+
+
+@lru_cache
+def get_config_registry() -> ConfigRegistry:
+    """Get or create the shared configuration registry (lazily initialized)."""
+    return ConfigRegistry()
@@ -0,0 +1,110 @@
+"""
+Cross-source deduplication of search results.
+
+The same release is often returned by several indexers and instances. These
+helpers identify copies of one release (by info hash, falling back to
+normalized title plus size) and merge them into a single result.
+"""
+
+import base64
+import binascii
+import hashlib
+import re
+from urllib.parse import parse_qsl
+
+from app.services.search_record import SearchRecord, SearchRecordSource
+
+# Runs of anything but letters and digits, so "Some.Release-GRP" == "some release grp"
+_TITLE_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def normalize_infohash(value: str | None) -> str | None:
+    """
+    Normalize a v1 info hash to 40 lowercase hex characters.
+
+    Accepts hex (40 chars) or base32 (32 chars) encodings.
+
+    Returns:
+        The normalized hash, or None if the value is not a valid info hash
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if len(value) == 40:
+        try:
+            int(value, 16)
+        except ValueError:
+            return None
+        return value.lower()
+
+    if len(value) == 32:
+        try:
+            return base64.b32decode(value.upper()).hex()
+        except (binascii.Error, ValueError):
+            return None
+
+    return None
+
+
+def infohash_from_magnet(magnet_link: str | None) -> str | None:
+    """
+    Extract the info hash from a magnet URI's `xt=urn:btih:` parameter.
+
+    Returns:
+        The normalized hash, or None if the link is not a magnet with a btih
+    """
+    if not magnet_link or not magnet_link.startswith("magnet:?"):
+        return None
+
+    for name, value in parse_qsl(magnet_link[len("magnet:?") :]):
+        if name == "xt" and value.lower().startswith("urn:btih:"):
+            return normalize_infohash(value[len("urn:btih:") :])
+    return None
+
+
+def dedupe_key(result: SearchRecord) -> str:
+    """Key identifying copies of the same release."""
+    if result.infohash:
+        return f"btih:{result.infohash}"
+    title = _TITLE_SEPARATORS.sub(" ", result.title).strip().casefold()
+    return f"title:{title}:{result.size}"
+
+
+def merge_duplicates(results: list[SearchRecord]) -> list[SearchRecord]:
+    """
+    Merge copies of the same release into one result per release.
+
+    The merged result is the copy with the most seeders (the first one on ties),
+    carries every copy in `sources`, and gets an ID derived from the release
+    key so it is stable no matter which instance answered first.
+
+    Args:
+        results: Results from every instance, in instance order
+
+    Returns:
+        One result per release, in order of first appearance
+    """
+    groups: dict[str, list[SearchRecord]] = {}
+    for result in results:
+        groups.setdefault(dedupe_key(result), []).append(result)
+
+    merged: list[SearchRecord] = []
+    for key, copies in groups.items():
+        best = max(copies, key=lambda r: r.seeders)
+        merged.append(
+            best._replace(
+                id=hashlib.md5(key.encode()).hexdigest()[:12],
+                sources=tuple(
+                    SearchRecordSource(
+                        source=copy.source,
+                        source_type=copy.source_type,
+                        indexer=copy.indexer,
+                        seeders=copy.seeders,
+                        leechers=copy.leechers,
+                    )
+                    for copy in copies
+                ),
+            )
+        )
+    return merged
@@ -0,0 +1,343 @@
+"""
+Background health monitor for indexer instances and download clients.
+
+Periodically probes every configured Jackett instance, Prowlarr instance and
+download client, and keeps the latest status in memory so status endpoints
+can answer instantly instead of probing on every page view. With several
+workers, one of them probes and the others serve the statuses it shares.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import UTC, datetime
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.future import select
+
+from app.config import settings
+from app.core.database import get_session_factory
+from app.models import DownloadClient, JackettInstance, ProwlarrInstance
+from app.services.config_registry import ClientConfig, IndexerConfig
+from app.services.encryption import decrypt_credential
+from app.services.http_clients import get_http_client_registry
+from app.services.jackett import JACKETT_TIMEOUT, JackettService
+from app.services.prowlarr import PROWLARR_TIMEOUT, ProwlarrService
+from app.services.qbittorrent import QBittorrentService
+from app.services.shared_state import SharedState, get_shared_state
+
+logger = logging.getLogger(__name__)
+
+# Probed targets are identified by ("jackett" | "prowlarr" | "client", id)
+TargetKey = tuple[str, int]
+
+# Shared-state lease held by the worker that runs the probes
+PROBE_LEASE = "health-monitor"
+
+# Seconds between reads of the shared statuses by workers that do not probe
+SHARED_SYNC_SECONDS = 5.0
+
+
+class HealthStatus(NamedTuple):
+    """Result of probing one instance or client."""
+
+    status: str  # "online" or "offline"
+    indexer_count: int | None
+    latency_ms: float
+    checked_at: datetime
+
+    def to_dict(self) -> dict[str, Any]:
+        """Fields as JSON-serializable values (for the shared state)."""
+        return {**self._asdict(), "checked_at": self.checked_at.isoformat()}
+
+    @classmethod
+    def from_dict(cls, fields: dict[str, Any]) -> "HealthStatus":
+        """Rebuild a status from to_dict() output."""
+        return cls(**{**fields, "checked_at": datetime.fromisoformat(fields["checked_at"])})
+
+
+async def probe_instance(
+    instance: JackettInstance | ProwlarrInstance | IndexerConfig,
+    instance_type: str,
+) -> HealthStatus:
+    """
+    Probe a Jackett or Prowlarr instance for status and indexer count.
+
+    The probe is abandoned (and the instance reported offline) after
+    STATUS_CHECK_TIMEOUT_SECONDS.
+
+    Args:
+        instance: The instance to probe
+        instance_type: "jackett" or "prowlarr"
+
+    Returns:
+        The probe result
+    """
+    start = time.perf_counter()
+    try:
+        api_key = decrypt_credential(instance.api_key)
+        registry = get_http_client_registry()
+
+        if instance_type == "jackett":
+            client = registry.get("jackett", instance.id, instance.url, JACKETT_TIMEOUT)
+            jackett_service = JackettService(instance.url, api_key, client=client)
+            check = jackett_service.test_connection()
+        else:
+            client = registry.get("prowlarr", instance.id, instance.url, PROWLARR_TIMEOUT)
+            prowlarr_service = ProwlarrService(instance.url, api_key, client=client)
+            check = prowlarr_service.test_connection()
+
+        success, _, indexer_count = await asyncio.wait_for(
+            check, timeout=settings.STATUS_CHECK_TIMEOUT_SECONDS
+        )
+        status = "online" if success else "offline"
+    except TimeoutError:
+        logger.warning(f"Status check for {instance.name} timed out")
+        status, indexer_count = "offline", None
+    except Exception as e:
+        logger.warning(f"Error checking status for {instance.name}: {e}")
+        status, indexer_count = "offline", None
+
+    return HealthStatus(
+        status=status,
+        indexer_count=indexer_count,
+        latency_ms=(time.perf_counter() - start) * 1000,
+        checked_at=datetime.now(UTC),
+    )
+
+
+async def probe_client(client: DownloadClient | ClientConfig) -> HealthStatus:
+    """
+    Probe a download client for status.
+
+    The probe is abandoned (and the client reported offline) after
+    STATUS_CHECK_TIMEOUT_SECONDS.
+
+    Args:
+        client: The download client to probe
+
+    Returns:
+        The probe result (indexer_count is always None)
+    """
+    start = time.perf_counter()
+    try:
+        username = decrypt_credential(client.username)
+        password = decrypt_credential(client.password)
+
+        # Currently only qBittorrent is supported
+        service = QBittorrentService(client.url, username, password)
+        success, _ = await asyncio.wait_for(
+            service.test_connection(), timeout=settings.STATUS_CHECK_TIMEOUT_SECONDS
+        )
+        status = "online" if success else "offline"
+    except TimeoutError:
+        logger.warning(f"Status check for client {client.name} timed out")
+        status = "offline"
+    except Exception as e:
+        logger.warning(f"Error checking status for client {client.name}: {e}")
+        status = "offline"
+
+    return HealthStatus(
+        status=status,
+        indexer_count=None,
+        latency_ms=(time.perf_counter() - start) * 1000,
+        checked_at=datetime.now(UTC),
+    )
+
+
+class HealthMonitor:
+    """
+    Periodically probes every instance and client in the background.
+
+    Online targets are re-probed every `interval` seconds; offline targets are
+    re-probed every `offline_interval` seconds so recoveries show up sooner.
+
+    With shared state, only the worker holding the probe lease probes; every
+    status recorded is shared, and the other workers read the shared statuses.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        interval: float = settings.HEALTH_CHECK_INTERVAL_SECONDS,
+        offline_interval: float = settings.HEALTH_CHECK_OFFLINE_INTERVAL_SECONDS,
+        shared: SharedState | None = None,
+    ) -> None:
+        """
+        Initialize the health monitor.
+
+        Args:
+            session_factory: Session factory used to load targets (defaults to the app's)
+            interval: Seconds between probes of an online target
+            offline_interval: Seconds between probes of an offline target
+            shared: State shared with other worker processes (defaults to the
+                configured one, if any)
+        """
+        self._session_factory = session_factory
+        self.interval = interval
+        self.offline_interval = offline_interval
+        self.shared = shared if shared is not None else get_shared_state()
+        self._statuses: dict[TargetKey, HealthStatus] = {}
+        self._next_due: dict[TargetKey, float] = {}
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        # Whether this worker runs the probes (always, without shared state)
+        self._probing = True
+        self._publishing: set[asyncio.Task[None]] = set()
+
+    @property
+    def running(self) -> bool:
+        """Whether the background task is running."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the background probe loop."""
+        if not self.running:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="health-monitor")
+
+    async def stop(self) -> None:
+        """Stop the background probe loop."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self.shared is not None and self._probing:
+            # Let another worker take over the probes right away
+            await self.shared.release_lease(PROBE_LEASE)
+
+    def get(self, target_type: str, target_id: int) -> HealthStatus | None:
+        """
+        Get the latest known status of a target.
+
+        Returns:
+            The cached status, or None if the monitor is not running or the
+            target has not been probed yet
+        """
+        if not self.running:
+            return None
+        return self._statuses.get((target_type, target_id))
+
+    def record(self, target_type: str, target_id: int, health: HealthStatus) -> None:
+        """Store a probe result and schedule the target's next probe."""
+        key = (target_type, target_id)
+        self._statuses[key] = health
+        delay = self.interval if health.status == "online" else self.offline_interval
+        self._next_due[key] = time.monotonic() + delay
+
+        if self.shared is not None:
+            task = asyncio.get_running_loop().create_task(
+                self.shared.put_health(key, health.to_dict())
+            )
+            self._publishing.add(task)
+            task.add_done_callback(self._publishing.discard)
+
+    def forget(self, target_type: str, target_id: int) -> None:
+        """Drop a target's status so it is probed again right away (e.g. after an edit)."""
+        key = (target_type, target_id)
+        self._statuses.pop(key, None)
+        self._next_due.pop(key, None)
+        self._wake.set()
+
+    def clear(self) -> None:
+        """Drop every cached status."""
+        self._statuses.clear()
+        self._next_due.clear()
+
+    async def check_due(self) -> None:
+        """Probe every target that has never been probed or whose next probe is due."""
+        targets = await self._load_targets()
+        now = time.monotonic()
+
+        # Forget targets that were deleted
+        for key in set(self._statuses) - set(targets):
+            self._statuses.pop(key, None)
+            self._next_due.pop(key, None)
+
+        due = {key: target for key, target in targets.items() if self._next_due.get(key, 0) <= now}
+        if not due:
+            return
+
+        semaphore = asyncio.Semaphore(settings.STATUS_CHECK_CONCURRENCY)
+
+        async def check(
+            key: TargetKey, target: JackettInstance | ProwlarrInstance | DownloadClient
+        ) -> None:
+            async with semaphore:
+                if isinstance(target, DownloadClient):
+                    health = await probe_client(target)
+                else:
+                    health = await probe_instance(target, key[0])
+            self.record(key[0], key[1], health)
+
+        await asyncio.gather(*(check(key, target) for key, target in due.items()))
+
+    async def _run(self) -> None:
+        """Probe loop: check due targets, then sleep until the next one is due."""
+        while True:
+            try:
+                self._probing = await self._acquire_probe_lease()
+                if self._probing:
+                    await self.check_due()
+                else:
+                    await self.sync_shared()
+            except Exception:
+                logger.exception("Health monitor round failed")
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self._seconds_until_next_due())
+            except TimeoutError:
+                pass
+
+    async def sync_shared(self) -> None:
+        """Replace the statuses with the ones shared by the probing worker."""
+        if self.shared is not None:
+            shared = await self.shared.get_health()
+            self._statuses = {key: HealthStatus.from_dict(status) for key, status in shared.items()}
+
+    async def _acquire_probe_lease(self) -> bool:
+        """Take or renew the probe lease; True if this worker should probe."""
+        if self.shared is None:
+            return True
+        # Renewed every round, which comes at least every interval
+        ttl = 2 * self.interval + settings.STATUS_CHECK_TIMEOUT_SECONDS
+        return await self.shared.acquire_lease(PROBE_LEASE, ttl)
+
+    def _seconds_until_next_due(self) -> float:
+        """Seconds until the earliest scheduled probe, bounded to [1, interval]."""
+        if not self._probing:
+            return min(SHARED_SYNC_SECONDS, self.interval)
+        if not self._next_due:
+            return self.interval
+        delay = min(self._next_due.values()) - time.monotonic()
+        return max(1.0, min(delay, self.interval))
+
+    async def _load_targets(
+        self,
+    ) -> dict[TargetKey, JackettInstance | ProwlarrInstance | DownloadClient]:
+        """Load every instance and client from the database."""
+        session_factory = self._session_factory or get_session_factory()
+        targets: dict[TargetKey, JackettInstance | ProwlarrInstance | DownloadClient] = {}
+
+        async with session_factory() as session:
+            for instance in (await session.execute(select(JackettInstance))).scalars():
+                targets[("jackett", instance.id)] = instance
+            for instance in (await session.execute(select(ProwlarrInstance))).scalars():
+                targets[("prowlarr", instance.id)] = instance
+            for client in (await session.execute(select(DownloadClient))).scalars():
+                targets[("client", client.id)] = client
+
+        return targets
+
+
+@lru_cache
+def get_health_monitor() -> HealthMonitor:
+    """Get or create the shared health monitor (lazily initialized)."""
+    return HealthMonitor()
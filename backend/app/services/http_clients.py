@@ -0,0 +1,141 @@
+"""
+Shared HTTP client registry for indexer instances.
+
+Keeps one long-lived httpx.AsyncClient per configured instance so that
+repeated searches and status checks reuse keep-alive connections instead of
+paying a fresh TCP (and TLS) handshake on every call. In capture mode the
+clients also record raw responses to a cassette directory (see cassettes).
+"""
+
+import asyncio
+from functools import lru_cache
+
+import httpx
+
+from app.config import settings
+from app.services.cassettes import CassetteRecorder
+
+
+class HttpClientRegistry:
+    """
+    Registry of pooled HTTP clients keyed by instance type, id and URL.
+
+    Clients are created lazily on first use. When an instance's URL changes
+    or the instance is invalidated, the old client is retired and closed after
+    a grace period so in-flight requests can finish.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+        max_keepalive_connections: int = settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = settings.HTTP_KEEPALIVE_EXPIRY,
+        record_dir: str = settings.CASSETTE_RECORD_DIR,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """
+        Initialize the registry.
+
+        Args:
+            max_connections: Maximum concurrent connections per instance
+            max_keepalive_connections: Maximum idle connections kept per instance
+            keepalive_expiry: Seconds an idle connection is kept alive
+            record_dir: Record raw responses to this cassette directory (empty disables)
+            transport: Transport shared by every client instead of network connections
+                (e.g. a cassette replay transport)
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.record_dir = record_dir
+        self.transport = transport
+        self._clients: dict[tuple[str, int], tuple[str, httpx.AsyncClient]] = {}
+        self._retiring: dict[asyncio.Task[None], httpx.AsyncClient] = {}
+
+    def get(
+        self,
+        instance_type: str,
+        instance_id: int,
+        base_url: str,
+        timeout: float,
+    ) -> httpx.AsyncClient:
+        """
+        Get the pooled client for an instance, creating it if needed.
+
+        Args:
+            instance_type: Instance type (e.g., "jackett" or "prowlarr")
+            instance_id: Database ID of the instance
+            base_url: Base URL of the instance
+            timeout: Request timeout in seconds for a newly created client
+
+        Returns:
+            The shared AsyncClient for this instance
+        """
+        key = (instance_type, instance_id)
+        base_url = base_url.rstrip("/")
+
+        entry = self._clients.get(key)
+        if entry is not None:
+            url, client = entry
+            if url == base_url and not client.is_closed:
+                return client
+            # URL changed since the client was built
+            self._retire(client)
+
+        transport = self.transport
+        if transport is None and self.record_dir:
+            transport = CassetteRecorder(
+                self.record_dir, httpx.AsyncHTTPTransport(limits=self.limits)
+            )
+        client = httpx.AsyncClient(timeout=timeout, limits=self.limits, transport=transport)
+        self._clients[key] = (base_url, client)
+        return client
+
+    def invalidate(self, instance_type: str, instance_id: int) -> None:
+        """
+        Drop the client for an instance so the next call rebuilds it.
+
+        Args:
+            instance_type: Instance type (e.g., "jackett" or "prowlarr")
+            instance_id: Database ID of the instance
+        """
+        entry = self._clients.pop((instance_type, instance_id), None)
+        if entry is not None:
+            self._retire(entry[1])
+
+    async def aclose(self) -> None:
+        """Close every client, including ones waiting to be retired."""
+        for task in self._retiring:
+            task.cancel()
+
+        clients = list(self._retiring.values())
+        clients.extend(client for _, client in self._clients.values())
+        self._retiring.clear()
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+    def _retire(self, client: httpx.AsyncClient) -> None:
+        """Close a replaced client once in-flight requests had time to finish."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        task = loop.create_task(self._close_after_grace(client))
+        self._retiring[task] = client
+        task.add_done_callback(lambda t: self._retiring.pop(t, None))
+
+    @staticmethod
+    async def _close_after_grace(client: httpx.AsyncClient) -> None:
+        """Wait out the client's read timeout, then close it."""
+        await asyncio.sleep(client.timeout.read or 0)
+        await client.aclose()
+
+
+@lru_cache
+def get_http_client_registry() -> HttpClientRegistry:
+    """Get or create the shared HTTP client registry (lazily initialized)."""
+    return HttpClientRegistry()
@@ -0,0 +1,102 @@
+"""
+Invalidation of state derived from instance and client configuration.
+
+When an instance or client is created, edited or deleted, everything cached
+from its old configuration is dropped: the configuration snapshot, its
+pooled HTTP client, cached search results, its health status and its circuit.
+With shared state, the change is also published to the other workers, which
+apply it to their own caches; on PostgreSQL, it is published to the other
+replicas as well, whose workers each receive it and apply it locally.
+"""
+
+import logging
+
+from app.services.change_events import get_change_events
+from app.services.circuit_breaker import get_circuit_breaker
+from app.services.config_registry import get_config_registry
+from app.services.health_monitor import get_health_monitor
+from app.services.http_clients import get_http_client_registry
+from app.services.search_cache import get_search_cache
+from app.services.shared_state import get_shared_state
+
+logger = logging.getLogger(__name__)
+
+
+def invalidate_local(target_type: str, target_id: int) -> None:
+    """
+    Drop this worker's state that depends on an instance's or client's configuration.
+
+    Args:
+        target_type: "jackett", "prowlarr" or "client"
+        target_id: ID of the instance or client
+    """
+    get_config_registry().invalidate()
+    get_health_monitor().forget(target_type, target_id)
+    if target_type == "client":
+        return
+
+    get_http_client_registry().invalidate(target_type, target_id)
+    get_search_cache().clear()
+    get_circuit_breaker().reset((target_type, target_id))
+
+
+def invalidate_all_local() -> None:
+    """
+    Drop this worker's configuration and search results (after missed changes).
+
+    HTTP clients are replaced anyway when an instance's URL changes, and
+    statuses catch up at the next probe.
+    """
+    get_config_registry().invalidate()
+    get_search_cache().clear()
+
+
+async def invalidate(target_type: str, target_id: int) -> None:
+    """
+    Drop state that depends on an instance's or client's configuration, in every worker.
+
+    Called after the change is committed: failing to tell the other workers or
+    replicas is logged rather than raised, so the change is still reported as
+    made (this worker's caches are already up to date).
+
+    Args:
+        target_type: "jackett", "prowlarr" or "client"
+        target_id: ID of the instance or client
+    """
+    invalidate_local(target_type, target_id)
+
+    shared = get_shared_state()
+    if shared is not None:
+        try:
+            await shared.publish_invalidation(target_type, target_id)
+        except Exception:
+            logger.exception(f"Failed to tell other workers {target_type} {target_id} changed")
+
+    change_events = get_change_events()
+    if change_events is not None:
+        try:
+            await change_events.publish(target_type, target_id)
+        except Exception:
+            logger.exception(f"Failed to tell other replicas {target_type} {target_id} changed")
+
+
+async def apply_replica_change(target_type: str, target_id: int) -> None:
+    """
+    Apply a change made through another replica.
+
+    Every worker of every replica receives the change itself, so it is not
+    published to the other workers again; only the target's shared results
+    are dropped, so they are not served after the change.
+
+    Args:
+        target_type: "jackett", "prowlarr" or "client"
+        target_id: ID of the instance or client
+    """
+    invalidate_local(target_type, target_id)
+
+    shared = get_shared_state()
+    if shared is not None:
+        try:
+            await shared.drop_target(target_type, target_id)
+        except Exception:
+            logger.exception(f"Failed to drop shared state of {target_type} {target_id}")
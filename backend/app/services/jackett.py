@@ -5,35 +5,188 @@ Jackett is a proxy server that translates queries from apps into
 tracker-site-specific HTTP queries, fetching results, and parsing them.
 """
 
+import hashlib
 import logging
-from datetime import datetime
-from typing import Any
+import time
+import xml.etree.ElementTree as ET
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, cast
 from urllib.parse import urljoin
 
 import httpx
 
-from app.schemas.search import CATEGORY_MAPPINGS, SearchCategory, SearchResult
+from app.schemas.search import CATEGORY_MAPPINGS, SearchCategory
+from app.services.dedupe import infohash_from_magnet, normalize_infohash
+from app.services.metrics import get_metrics
+from app.services.search_record import SearchRecord
 
 logger = logging.getLogger(__name__)
 
 # Default timeout for Jackett API requests (seconds)
 JACKETT_TIMEOUT = 30
 
+# Fully qualified tag of Torznab extended attributes (<torznab:attr name=... value=...>)
+TORZNAB_ATTR = "{http://torznab.com/schemas/2015/feed}attr"
+
+# Date formats accepted in <pubDate>, tried in order after the RFC 822 fast path
+PUB_DATE_FORMATS = (
+    "%a, %d %b %Y %H:%M:%S %z",
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%d %H:%M:%S",
+)
+
+_MONTHS = {
+    name: number
+    for number, name in enumerate(
+        ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"),
+        start=1,
+    )
+}
+_TIMEZONES: dict[str, timezone] = {}
+
+
+def _parse_rfc822(value: str) -> datetime | None:
+    """
+    Parse the common "Thu, 25 Apr 2024 12:00:00 +0000" form without strptime.
+
+    Returns:
+        The parsed datetime, or None if the value is not in exactly that form
+    """
+    parts = value.split()
+    if len(parts) != 6 or not parts[0].endswith(","):
+        return None
+
+    _, day, month_name, year, clock, offset = parts
+    month = _MONTHS.get(month_name)
+    clock_parts = clock.split(":")
+    if month is None or len(clock_parts) != 3 or len(offset) != 5 or offset[0] not in "+-":
+        return None
+
+    tz = _TIMEZONES.get(offset)
+    if tz is None:
+        minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+        tz = timezone(timedelta(minutes=-minutes if offset[0] == "-" else minutes))
+        _TIMEZONES[offset] = tz
+
+    hour, minute, second = clock_parts
+    return datetime(int(year), month, int(day), int(hour), int(minute), int(second), tzinfo=tz)
+
+
+def parse_pub_date(value: str) -> datetime | None:
+    """
+    Parse a Torznab <pubDate>.
+
+    Args:
+        value: The raw date text
+
+    Returns:
+        The parsed datetime, or None if no supported format matches
+    """
+    value = value.strip()
+    try:
+        parsed = _parse_rfc822(value)
+    except ValueError:
+        parsed = None
+    if parsed is not None:
+        return parsed
+
+    for fmt in PUB_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+class TorznabFeedParser:
+    """
+    Incremental parser for Torznab XML feeds.
+
+    Bytes are fed as they arrive from the network. Each <item> of the channel
+    is converted as soon as its closing tag is seen and then dropped from the
+    tree, so memory stays bounded by one item instead of the whole document.
+    """
+
+    def __init__(self, parse_item: Callable[[ET.Element], SearchRecord | None]) -> None:
+        """
+        Initialize the parser.
+
+        Args:
+            parse_item: Converts one <item> element into a SearchRecord (or None to skip it)
+        """
+        self._parse_item = parse_item
+        self._parser: ET.XMLPullParser[ET.Element] = ET.XMLPullParser(events=("start", "end"))
+        self._stack: list[ET.Element] = []
+        self.results: list[SearchRecord] = []
+
+    def feed(self, data: bytes | str) -> None:
+        """Feed the next chunk of the document, converting every completed item."""
+        self._parser.feed(data)
+        self._drain()
+
+    def close(self) -> None:
+        """Signal the end of the document."""
+        self._parser.close()
+        self._drain()
+
+    def _drain(self) -> None:
+        """Process the parser events produced so far."""
+        # Only start/end events are requested, which always carry an element
+        events = cast(Iterator[tuple[str, ET.Element]], self._parser.read_events())
+        for event, elem in events:
+            if event == "start":
+                self._stack.append(elem)
+                continue
+
+            # <rss><channel><item> - only items directly inside the channel are results
+            if elem.tag == "item" and len(self._stack) == 3 and self._stack[1].tag == "channel":
+                try:
+                    result = self._parse_item(elem)
+                    if result:
+                        self.results.append(result)
+                except Exception as e:
+                    logger.debug(f"Error parsing Jackett result item: {e}")
+                self._stack[1].remove(elem)
+                elem.clear()
+            self._stack.pop()
+
 
 class JackettService:
     """Service for interacting with Jackett API."""
 
-    def __init__(self, base_url: str, api_key: str) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        client: httpx.AsyncClient | None = None,
+    ) -> None:
         """
         Initialize the Jackett service.
 
         Args:
             base_url: The base URL of the Jackett instance (e.g., http://localhost:9117)
             api_key: The API key for authentication
+            client: Optional pooled HTTP client to reuse across calls. When omitted,
+                a short-lived client is created per call.
         """
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
         self.timeout = JACKETT_TIMEOUT
+        self._client = client
+        # Time spent parsing the last search response, in seconds
+        self.parse_seconds = 0.0
+
+    @asynccontextmanager
+    async def _get_client(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the pooled client if one was provided, otherwise a short-lived one."""
+        if self._client is not None:
+            yield self._client
+            return
+
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            yield client
 
     def _get_api_url(self, endpoint: str) -> str:
         """Build the full API URL for an endpoint."""
@@ -47,7 +200,7 @@ class JackettService:
             Tuple of (success, message, indexer_count)
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self._get_client() as client:
                 # Get indexer configuration to verify connection
                 url = self._get_api_url("indexers/all/results/torznab/api")
                 params = {"apikey": self.api_key, "t": "caps"}
@@ -94,7 +247,7 @@ class JackettService:
             Number of configured indexers, or None if unable to determine
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self._get_client() as client:
                 return await self._get_indexer_count(client)
         except Exception:
             return None
@@ -104,7 +257,8 @@ class JackettService:
         query: str,
         category: SearchCategory = SearchCategory.ALL,
         instance_name: str = "Jackett",
-    ) -> list[SearchResult]:
+        raise_on_error: bool = False,
+    ) -> list[SearchRecord]:
         """
         Search for torrents across all configured indexers.
 
@@ -112,14 +266,16 @@ class JackettService:
             query: The search query
             category: Category to filter by
             instance_name: Name of this instance for result attribution
+            raise_on_error: Raise request failures instead of logging them and
+                returning no results
 
         Returns:
-            List of SearchResult objects
+            List of SearchRecord objects
         """
-        results: list[SearchResult] = []
+        results: list[SearchRecord] = []
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self._get_client() as client:
                 url = self._get_api_url("indexers/all/results/torznab/api")
                 params: dict[str, Any] = {
                     "apikey": self.api_key,
@@ -132,149 +288,156 @@ class JackettService:
                 if category_ids:
                     params["cat"] = ",".join(str(c) for c in category_ids)
 
-                response = await client.get(url, params=params)
-
-                if response.status_code != 200:
-                    logger.warning(f"Jackett search failed: HTTP {response.status_code}")
-                    return results
-
-                # Parse XML response (Torznab format)
-                results = self._parse_torznab_response(
-                    response.text,
-                    instance_name=instance_name,
-                )
+                # Stream the body so items are parsed while the rest is still arriving
+                async with client.stream("GET", url, params=params) as response:
+                    if response.status_code != 200:
+                        logger.warning(f"Jackett search failed: HTTP {response.status_code}")
+                        if raise_on_error:
+                            raise httpx.HTTPStatusError(
+                                f"HTTP {response.status_code}",
+                                request=response.request,
+                                response=response,
+                            )
+                        return results
+
+                    # Parse XML response (Torznab format)
+                    results = await self._parse_torznab_stream(
+                        response.aiter_bytes(),
+                        instance_name=instance_name,
+                    )
 
         except httpx.TimeoutException:
             logger.warning(f"Jackett search timed out for query: {query}")
+            if raise_on_error:
+                raise
         except Exception as e:
+            if raise_on_error:
+                raise
             logger.exception(f"Error searching Jackett: {e}")
 
         return results
 
-    def _parse_torznab_response(
+    async def _parse_torznab_stream(
         self,
-        xml_content: str,
+        chunks: AsyncIterator[bytes],
         instance_name: str,
-    ) -> list[SearchResult]:
+    ) -> list[SearchRecord]:
         """
-        Parse Torznab XML response into SearchResult objects.
+        Parse a streamed Torznab XML response into SearchRecord objects.
 
         Args:
-            xml_content: The XML response from Jackett
+            chunks: The raw response body, chunk by chunk
             instance_name: Name of the instance for attribution
 
         Returns:
-            List of SearchResult objects
+            List of SearchRecord objects (the items parsed so far if the XML is malformed)
         """
-        import xml.etree.ElementTree as ET
-
-        results: list[SearchResult] = []
+        parser = TorznabFeedParser(lambda item: self._parse_item(item, instance_name))
+        metrics = get_metrics()
+        received = 0
+        parse_seconds = 0.0
 
         try:
-            root = ET.fromstring(xml_content)
+            async for chunk in chunks:
+                received += len(chunk)
+                started = time.perf_counter()
+                parser.feed(chunk)
+                parse_seconds += time.perf_counter() - started
+            started = time.perf_counter()
+            parser.close()
+            parse_seconds += time.perf_counter() - started
+        except ET.ParseError as e:
+            logger.error(f"Failed to parse Jackett XML response: {e}")
+            metrics.instance_errors.inc("jackett", instance_name, "parse")
+        finally:
+            metrics.instance_bytes.inc("jackett", instance_name, amount=received)
+            metrics.parse_seconds.observe(parse_seconds, "jackett", instance_name)
+            self.parse_seconds = parse_seconds
 
-            # Find the channel containing items
-            channel = root.find("channel")
-            if channel is None:
-                return results
+        return parser.results
 
-            for item in channel.findall("item"):
-                try:
-                    result = self._parse_item(item, instance_name)
-                    if result:
-                        results.append(result)
-                except Exception as e:
-                    logger.debug(f"Error parsing Jackett result item: {e}")
-                    continue
+    def _parse_torznab_response(
+        self,
+        xml_content: str | bytes,
+        instance_name: str,
+    ) -> list[SearchRecord]:
+        """
+        Parse a complete Torznab XML response into SearchRecord objects.
+
+        Args:
+            xml_content: The XML response from Jackett
+            instance_name: Name of the instance for attribution
+
+        Returns:
+            List of SearchRecord objects (the items parsed so far if the XML is malformed)
+        """
+        parser = TorznabFeedParser(lambda item: self._parse_item(item, instance_name))
 
+        try:
+            parser.feed(xml_content)
+            parser.close()
         except ET.ParseError as e:
             logger.error(f"Failed to parse Jackett XML response: {e}")
 
-        return results
+        return parser.results
 
-    def _parse_item(self, item: Any, instance_name: str) -> SearchResult | None:
+    def _parse_item(self, item: ET.Element, instance_name: str) -> SearchRecord | None:
         """Parse a single item from the Torznab response."""
-        import hashlib
-
-        # Torznab namespace for extended attributes
-        torznab_ns = {"torznab": "http://torznab.com/schemas/2015/feed"}
-
-        title = item.findtext("title")
+        # Walk the children once: first text per tag, first value per torznab:attr name
+        texts: dict[str, str] = {}
+        attrs: dict[str, str] = {}
+        for child in item:
+            if child.tag == TORZNAB_ATTR:
+                name = child.get("name")
+                if name is not None and name not in attrs:
+                    attrs[name] = child.get("value", "")
+            elif child.tag not in texts:
+                texts[child.tag] = (child.text or "").strip()
+
+        title = texts.get("title")
         if not title:
             return None
 
-        # Get size
-        size = 0
-        size_elem = item.find("size")
-        if size_elem is not None and size_elem.text:
-            size = int(size_elem.text)
-        else:
-            # Try torznab:attr with name="size"
-            for attr in item.findall("torznab:attr", torznab_ns):
-                if attr.get("name") == "size":
-                    size = int(attr.get("value", 0))
-                    break
+        # Get size (plain <size> element, falling back to torznab:attr)
+        size = int(texts.get("size") or attrs.get("size") or 0)
 
         # Get seeders/leechers
-        seeders = 0
+        seeders = int(attrs.get("seeders") or 0)
+        if seeders < 0:
+            raise ValueError(f"Negative seeders: {seeders}")
         leechers = 0
-        for attr in item.findall("torznab:attr", torznab_ns):
-            name = attr.get("name")
-            value = attr.get("value", "0")
-            if name == "seeders":
-                seeders = int(value)
-            elif name == "peers":
-                leechers = max(0, int(value) - seeders)
+        if "peers" in attrs:
+            leechers = max(0, int(attrs["peers"] or 0) - seeders)
 
         # Get date
         pub_date = None
-        pub_date_str = item.findtext("pubDate")
+        pub_date_str = texts.get("pubDate")
         if pub_date_str:
-            try:
-                # Try common date formats
-                for fmt in [
-                    "%a, %d %b %Y %H:%M:%S %z",
-                    "%Y-%m-%dT%H:%M:%S%z",
-                    "%Y-%m-%d %H:%M:%S",
-                ]:
-                    try:
-                        pub_date = datetime.strptime(pub_date_str.strip(), fmt)
-                        break
-                    except ValueError:
-                        continue
-            except Exception:
-                pass
+            pub_date = parse_pub_date(pub_date_str)
 
         # Get category
-        category = "Other"
-        category_elem = item.find("category")
-        if category_elem is not None and category_elem.text:
-            category = category_elem.text
+        category = texts.get("category") or "Other"
 
         # Get indexer name
-        indexer = item.findtext("jackettindexer") or "Unknown"
+        indexer = texts.get("jackettindexer") or "Unknown"
 
         # Get magnet link
-        magnet_link = None
-        for attr in item.findall("torznab:attr", torznab_ns):
-            if attr.get("name") == "magneturl":
-                magnet_link = attr.get("value")
-                break
+        magnet_link = attrs["magneturl"].strip() if "magneturl" in attrs else None
+
+        # Get info hash (used to recognize the same release across sources)
+        infohash = normalize_infohash(attrs.get("infohash")) or infohash_from_magnet(magnet_link)
 
         # Get torrent URL
-        torrent_url = None
-        link = item.findtext("link")
-        if link:
-            torrent_url = link
+        torrent_url = texts.get("link") or None
 
         # Get info URL
-        info_url = item.findtext("comments") or item.findtext("guid")
+        info_url = texts.get("comments") or texts.get("guid")
 
         # Generate unique ID
         unique_str = f"{instance_name}:{indexer}:{title}:{size}"
         result_id = hashlib.md5(unique_str.encode()).hexdigest()[:12]
 
-        return SearchResult(
+        return SearchRecord(
             id=result_id,
             title=title,
             source=instance_name,
@@ -289,6 +452,7 @@ class JackettService:
             magnet_link=magnet_link,
             torrent_url=torrent_url,
             info_url=info_url,
+            infohash=infohash,
         )
 
     @staticmethod
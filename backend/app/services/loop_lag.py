@@ -0,0 +1,64 @@
+"""
+Event loop lag monitor.
+
+A background task sleeps for a fixed interval and records how much later
+than requested it woke up. Sustained lag means CPU-bound work (parsing,
+sorting, serialization) is holding up every other request in the worker,
+which is the signal to add workers rather than concurrency.
+"""
+
+import asyncio
+from functools import lru_cache
+
+from app.config import settings
+from app.services.metrics import get_metrics
+
+
+class EventLoopLagMonitor:
+    """Samples the event loop's scheduling delay into the metrics."""
+
+    def __init__(self, interval: float = settings.EVENT_LOOP_LAG_INTERVAL_SECONDS) -> None:
+        """
+        Initialize the monitor.
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background task is running."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start sampling."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="event-loop-lag")
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        """Sleep, then record how late the wake-up was."""
+        loop = asyncio.get_running_loop()
+        lag = get_metrics().event_loop_lag_seconds
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag.observe(max(0.0, loop.time() - started - self.interval))
+
+
+@lru_cache
+def get_loop_lag_monitor() -> EventLoopLagMonitor:
+    """Get or create the shared event loop lag monitor (lazily initialized)."""
+    return EventLoopLagMonitor()
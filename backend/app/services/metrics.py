@@ -0,0 +1,250 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+A small registry of labelled counters and histograms, so slow or failing
+instances can be told apart without adding a client library dependency.
+Metrics live in this process's memory and are exposed at /api/metrics;
+each scrape names the worker process that answered it (searcharr_worker_info).
+"""
+
+import os
+import socket
+import time
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+
+from app.services.server_timing import record_timing
+
+# Request latencies, in seconds (upstream searches can take tens of seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# In-process work (parsing, filtering, sorting, serialization), in seconds
+STAGE_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Event loop scheduling delay, in seconds
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    """Render `{name="value",...}` (empty when there are no labels)."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value (integers without a trailing .0)."""
+    if value == int(value) and abs(value) < 2**53:
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    """A monotonically increasing value per label set."""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Increase the counter for one label set."""
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        """Current value for one label set."""
+        return self._values.get(labels, 0.0)
+
+    def clear(self) -> None:
+        """Drop every sample."""
+        self._values.clear()
+
+    def render(self) -> Iterator[str]:
+        """Yield the metric in the text format."""
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Histogram:
+    """Observations counted into cumulative buckets per label set."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # Per label set: per-bucket counts (the last one is +Inf), and the sum
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation for a label set."""
+        counts = self._counts.get(labels)
+        if counts is None:
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+            self._sums[labels] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[labels] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """Observe the duration of the block, in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def count(self, *labels: str) -> int:
+        """Number of observations for one label set."""
+        return sum(self._counts.get(labels, ()))
+
+    def clear(self) -> None:
+        """Drop every sample."""
+        self._counts.clear()
+        self._sums.clear()
+
+    def render(self) -> Iterator[str]:
+        """Yield the metric in the text format."""
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts, strict=True):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                label_text = _format_labels(self.labelnames, labels, f'le="{le}"')
+                yield f"{self.name}_bucket{label_text} {cumulative}"
+            label_text = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {_format_value(self._sums[labels])}"
+            yield f"{self.name}_count{label_text} {cumulative}"
+
+
+class SearchMetrics:
+    """The application's metrics."""
+
+    def __init__(self) -> None:
+        # Scrapes of several workers are told apart by this (see render)
+        self.worker = f"{socket.gethostname()}-{os.getpid()}"
+        self.instance_request_seconds = Histogram(
+            "searcharr_instance_request_duration_seconds",
+            "Time to search one Jackett/Prowlarr instance, including parsing.",
+            ("source_type", "instance"),
+        )
+        self.instance_requests = Counter(
+            "searcharr_instance_requests_total",
+            "Searches sent to each instance, by outcome (ok, error, skipped by the circuit breaker).",
+            ("source_type", "instance", "outcome"),
+        )
+        self.instance_errors = Counter(
+            "searcharr_instance_errors_total",
+            (
+                "Failed instance searches, by reason (timeout, http, connection, parse, error, "
+                "deadline: given up before the instance answered)."
+            ),
+            ("source_type", "instance", "reason"),
+        )
+        self.instance_bytes = Counter(
+            "searcharr_instance_response_bytes_total",
+            "Response bytes received from each instance.",
+            ("source_type", "instance"),
+        )
+        self.indexer_results = Counter(
+            "searcharr_indexer_results_total",
+            "Results returned per indexer behind each instance.",
+            ("source_type", "instance", "indexer"),
+        )
+        self.parse_seconds = Histogram(
+            "searcharr_parse_duration_seconds",
+            "Time spent parsing instance responses.",
+            ("source_type", "instance"),
+            STAGE_BUCKETS,
+        )
+        self.stage_seconds = Histogram(
+            "searcharr_search_stage_duration_seconds",
+            "Time spent in each in-process search stage (filter, sort, dedupe, page, serialize).",
+            ("stage",),
+            STAGE_BUCKETS,
+        )
+        self.searches = Counter(
+            "searcharr_searches_total",
+            "Searches handled, by whether instance results came from the cache.",
+            ("cache",),
+        )
+        self.shared_searches = Counter(
+            "searcharr_shared_searches_total",
+            "Instance searches with shared state between workers, by outcome "
+            "(hit: another worker's results, waited: for another worker's search, searched).",
+            ("source_type", "instance", "outcome"),
+        )
+        self.client_request_seconds = Histogram(
+            "searcharr_client_request_duration_seconds",
+            "Time to hand a torrent to a download client.",
+            ("client", "operation"),
+        )
+        self.client_errors = Counter(
+            "searcharr_client_errors_total",
+            "Failed download client requests.",
+            ("client", "operation"),
+        )
+        self.event_loop_lag_seconds = Histogram(
+            "searcharr_event_loop_lag_seconds",
+            "How late the event loop ran a timer (time it was blocked by other work).",
+            buckets=LAG_BUCKETS,
+        )
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time an in-process search stage, for the metrics and the request's Server-Timing."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stage_seconds.observe(elapsed, name)
+            record_timing(name, elapsed)
+
+    @property
+    def metrics(self) -> list[Counter | Histogram]:
+        """Every metric, in exposition order."""
+        return [value for value in vars(self).values() if isinstance(value, Counter | Histogram)]
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        worker = [
+            "# HELP searcharr_worker_info Worker process these metrics belong to.",
+            "# TYPE searcharr_worker_info gauge",
+            f'searcharr_worker_info{{worker="{_escape(self.worker)}"}} 1',
+        ]
+        lines = [*worker, *(line for metric in self.metrics for line in metric.render())]
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Drop every sample."""
+        for metric in self.metrics:
+            metric.clear()
+
+
+@lru_cache
+def get_metrics() -> SearchMetrics:
+    """Get or create the shared metrics (lazily initialized)."""
+    return SearchMetrics()
@@ -7,13 +7,19 @@ PVR apps and supports management of both torrent and usenet indexers.
 
 import hashlib
 import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Any
 from urllib.parse import urljoin
 
 import httpx
 
-from app.schemas.search import CATEGORY_MAPPINGS, SearchCategory, SearchResult
+from app.schemas.search import CATEGORY_MAPPINGS, SearchCategory
+from app.services.dedupe import infohash_from_magnet, normalize_infohash
+from app.services.metrics import get_metrics
+from app.services.search_record import SearchRecord
 
 logger = logging.getLogger(__name__)
 
@@ -24,17 +30,37 @@ PROWLARR_TIMEOUT = 30
 class ProwlarrService:
     """Service for interacting with Prowlarr API."""
 
-    def __init__(self, base_url: str, api_key: str) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        client: httpx.AsyncClient | None = None,
+    ) -> None:
         """
         Initialize the Prowlarr service.
 
         Args:
             base_url: The base URL of the Prowlarr instance (e.g., http://localhost:9696)
             api_key: The API key for authentication
+            client: Optional pooled HTTP client to reuse across calls. When omitted,
+                a short-lived client is created per call.
         """
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
         self.timeout = PROWLARR_TIMEOUT
+        self._client = client
+        # Time spent parsing the last search response, in seconds
+        self.parse_seconds = 0.0
+
+    @asynccontextmanager
+    async def _get_client(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the pooled client if one was provided, otherwise a short-lived one."""
+        if self._client is not None:
+            yield self._client
+            return
+
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            yield client
 
     def _get_headers(self) -> dict[str, str]:
         """Get headers for API requests."""
@@ -55,7 +81,7 @@ class ProwlarrService:
             Tuple of (success, message, indexer_count)
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self._get_client() as client:
                 # Get system status to verify connection
                 url = self._get_api_url("system/status")
                 response = await client.get(url, headers=self._get_headers())
@@ -99,7 +125,7 @@ class ProwlarrService:
             Number of configured indexers, or None if unable to determine
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self._get_client() as client:
                 return await self._get_indexer_count(client)
         except Exception:
             return None
@@ -109,7 +135,8 @@ class ProwlarrService:
         query: str,
         category: SearchCategory = SearchCategory.ALL,
         instance_name: str = "Prowlarr",
-    ) -> list[SearchResult]:
+        raise_on_error: bool = False,
+    ) -> list[SearchRecord]:
         """
         Search for torrents across all configured indexers.
 
@@ -117,14 +144,16 @@ class ProwlarrService:
             query: The search query
             category: Category to filter by
             instance_name: Name of this instance for result attribution
+            raise_on_error: Raise request failures instead of logging them and
+                returning no results
 
         Returns:
-            List of SearchResult objects
+            List of SearchRecord objects
         """
-        results: list[SearchResult] = []
+        results: list[SearchRecord] = []
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with self._get_client() as client:
                 url = self._get_api_url("search")
                 params: dict[str, Any] = {
                     "query": query,
@@ -144,15 +173,33 @@ class ProwlarrService:
 
                 if response.status_code != 200:
                     logger.warning(f"Prowlarr search failed: HTTP {response.status_code}")
+                    if raise_on_error:
+                        raise httpx.HTTPStatusError(
+                            f"HTTP {response.status_code}",
+                            request=response.request,
+                            response=response,
+                        )
                     return results
 
+                metrics = get_metrics()
+                metrics.instance_bytes.inc("prowlarr", instance_name, amount=len(response.content))
+
                 # Parse JSON response
-                data = response.json()
-                results = self._parse_search_response(data, instance_name)
+                started = time.perf_counter()
+                try:
+                    data = response.json()
+                    results = self._parse_search_response(data, instance_name)
+                finally:
+                    self.parse_seconds = time.perf_counter() - started
+                    metrics.parse_seconds.observe(self.parse_seconds, "prowlarr", instance_name)
 
         except httpx.TimeoutException:
             logger.warning(f"Prowlarr search timed out for query: {query}")
+            if raise_on_error:
+                raise
         except Exception as e:
+            if raise_on_error:
+                raise
             logger.exception(f"Error searching Prowlarr: {e}")
 
         return results
@@ -161,18 +208,18 @@ class ProwlarrService:
         self,
         data: list[dict[str, Any]],
         instance_name: str,
-    ) -> list[SearchResult]:
+    ) -> list[SearchRecord]:
         """
-        Parse Prowlarr search response into SearchResult objects.
+        Parse Prowlarr search response into SearchRecord objects.
 
         Args:
             data: The JSON response from Prowlarr
             instance_name: Name of the instance for attribution
 
         Returns:
-            List of SearchResult objects
+            List of SearchRecord objects
         """
-        results: list[SearchResult] = []
+        results: list[SearchRecord] = []
 
         for item in data:
             try:
@@ -185,18 +232,20 @@ class ProwlarrService:
 
         return results
 
-    def _parse_item(self, item: dict[str, Any], instance_name: str) -> SearchResult | None:
+    def _parse_item(self, item: dict[str, Any], instance_name: str) -> SearchRecord | None:
         """Parse a single item from the Prowlarr response."""
-        title = item.get("title")
+        title = (item.get("title") or "").strip()
         if not title:
             return None
 
         # Get size
-        size = item.get("size", 0) or 0
+        size = int(item.get("size", 0) or 0)
 
         # Get seeders/leechers
-        seeders = item.get("seeders", 0) or 0
-        leechers = item.get("leechers", 0) or 0
+        seeders = int(item.get("seeders", 0) or 0)
+        leechers = int(item.get("leechers", 0) or 0)
+        if seeders < 0 or leechers < 0:
+            raise ValueError(f"Negative peer counts: {seeders} seeders, {leechers} leechers")
 
         # Get date
         pub_date = None
@@ -214,14 +263,19 @@ class ProwlarrService:
         if categories:
             # Use the first category name
             first_cat = categories[0] if categories else {}
-            category = first_cat.get("name", "Other") if isinstance(first_cat, dict) else "Other"
+            category = (
+                (first_cat.get("name") or "Other") if isinstance(first_cat, dict) else "Other"
+            )
 
         # Get indexer name
-        indexer = item.get("indexer", "Unknown")
+        indexer = (item.get("indexer") or "Unknown").strip()
 
         # Get magnet link
         magnet_link = item.get("magnetUrl")
 
+        # Get info hash (used to recognize the same release across sources)
+        infohash = normalize_infohash(item.get("infoHash")) or infohash_from_magnet(magnet_link)
+
         # Get torrent URL
         torrent_url = item.get("downloadUrl")
 
@@ -233,7 +287,7 @@ class ProwlarrService:
         unique_str = f"{instance_name}:{indexer}:{guid}:{title}"
         result_id = hashlib.md5(unique_str.encode()).hexdigest()[:12]
 
-        return SearchResult(
+        return SearchRecord(
             id=result_id,
             title=title,
             source=instance_name,
@@ -248,6 +302,7 @@ class ProwlarrService:
             magnet_link=magnet_link,
             torrent_url=torrent_url,
             info_url=info_url,
+            infohash=infohash,
         )
 
     @staticmethod
@@ -8,16 +8,47 @@ instances, aggregating and normalizing results.
 import asyncio
 import logging
 import re
-from typing import Any
-
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
-
-from app.models import JackettInstance, ProwlarrInstance
-from app.schemas.search import SearchCategory, SearchResult, SortBy, SortOrder
+import time
+from collections import Counter
+from collections.abc import AsyncIterator, Callable
+from datetime import UTC, datetime
+from functools import partial
+from typing import Any, NamedTuple
+
+import httpx
+
+from app.schemas.search import (
+    SearchCategory,
+    SearchStreamSourceStatus,
+    SearchStreamSummary,
+    SortBy,
+    SortOrder,
+)
+from app.services.circuit_breaker import CircuitBreaker, get_circuit_breaker
+from app.services.config_registry import ConfigRegistry, IndexerConfig, get_config_registry
+from app.services.dedupe import merge_duplicates
 from app.services.encryption import decrypt_credential
-from app.services.jackett import JackettService
-from app.services.prowlarr import ProwlarrService
+from app.services.health_monitor import probe_instance
+from app.services.http_clients import get_http_client_registry
+from app.services.jackett import JACKETT_TIMEOUT, JackettService
+from app.services.metrics import get_metrics
+from app.services.prowlarr import PROWLARR_TIMEOUT, ProwlarrService
+from app.services.search_cache import (
+    SearchResultCache,
+    SearchView,
+    SearchViewKey,
+    SourceResults,
+    get_search_cache,
+)
+from app.services.search_record import SearchRecord
+from app.services.server_timing import (
+    ServerTiming,
+    collect_timings,
+    record_timing,
+    record_timings,
+)
+from app.services.shared_state import SharedState, get_shared_state, shared_search_key
+from app.services.single_flight import SingleFlight, get_search_flights
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +56,36 @@ logger = logging.getLogger(__name__)
 SEARCH_CONCURRENT_LIMIT = 10
 
 
+class SearchOutcome(NamedTuple):
+    """Result of SearchAggregator.search."""
+
+    results: list[SearchRecord]  # The requested page (every result when not paginated)
+    errors: list[str]
+    sources_queried: int
+    total_results: int  # Number of results across all pages
+    partial: bool = False  # Some instances failed, were skipped or timed out
+
+
+class StreamResults(NamedTuple):
+    """Streaming search event with one instance's results (see SearchStreamResults)."""
+
+    source: str
+    source_type: str
+    results: list[SearchRecord]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Fields as a dict that serializes to the same JSON as SearchStreamResults."""
+        return {
+            "event": "results",
+            "source": self.source,
+            "source_type": self.source_type,
+            "results": [result.to_dict() for result in self.results],
+        }
+
+
+StreamEvent = StreamResults | SearchStreamSourceStatus | SearchStreamSummary
+
+
 class SearchAggregator:
     """
     Aggregates search results from multiple Jackett and Prowlarr instances.
@@ -32,14 +93,31 @@ class SearchAggregator:
     Handles concurrent searches, result normalization, filtering, and sorting.
     """
 
-    def __init__(self, db: AsyncSession) -> None:
+    def __init__(
+        self,
+        registry: ConfigRegistry | None = None,
+        cache: SearchResultCache | None = None,
+        breaker: CircuitBreaker | None = None,
+        flights: SingleFlight | None = None,
+        shared: SharedState | None = None,
+    ) -> None:
         """
         Initialize the search aggregator.
 
         Args:
-            db: Database session for fetching instance configurations
+            registry: Instance configuration registry (defaults to the shared registry)
+            cache: Cache for raw search results (defaults to the shared cache)
+            breaker: Per-instance circuit breaker (defaults to the shared breaker)
+            flights: Single-flight group that lets concurrent identical searches
+                share one upstream request per instance (defaults to the shared group)
+            shared: State shared with other worker processes, which lets workers share
+                instance results and searches (defaults to the configured one, if any)
         """
-        self.db = db
+        self.registry = registry if registry is not None else get_config_registry()
+        self.cache = cache if cache is not None else get_search_cache()
+        self.breaker = breaker if breaker is not None else get_circuit_breaker()
+        self.flights = flights if flights is not None else get_search_flights()
+        self.shared = shared if shared is not None else get_shared_state()
         self.concurrent_limit = SEARCH_CONCURRENT_LIMIT
 
     async def search(
@@ -53,7 +131,11 @@ class SearchAggregator:
         max_size: str | None = None,
         sort_by: SortBy = SortBy.SEEDERS,
         sort_order: SortOrder = SortOrder.DESC,
-    ) -> tuple[list[SearchResult], list[str], int]:
+        timeout: float | None = None,
+        dedupe: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> SearchOutcome:
         """
         Execute a unified search across all selected instances.
 
@@ -67,151 +149,569 @@ class SearchAggregator:
             max_size: Maximum size filter (e.g., "10GB", "500MB")
             sort_by: Field to sort by
             sort_order: Sort order (asc/desc)
+            timeout: Seconds to wait for instances before returning partial
+                results (None waits for every instance)
+            dedupe: Merge copies of the same release returned by different
+                indexers or instances into one result
+            limit: Page size (None returns every result)
+            offset: Number of sorted results to skip
 
         Returns:
-            Tuple of (results, errors, sources_queried)
+            The requested page of results, errors and counts. The results list
+            may be shared with the cache and must not be modified.
         """
-        # In exclusive mode, treat None as "search none" (empty list)
-        # This is used when user explicitly selects specific instances
-        if exclusive_filter:
-            if jackett_ids is None:
-                jackett_ids = []
-            if prowlarr_ids is None:
-                prowlarr_ids = []
+        metrics = get_metrics()
+        # Captured before reading the configuration: results of instances changed
+        # while searching are not cached (the change cleared the cache)
+        generation = self.cache.generation
+        with metrics.stage("config"):
+            jackett_instances, prowlarr_instances = await self.resolve_instances(
+                jackett_ids, prowlarr_ids, exclusive_filter
+            )
+
+        sources_queried = len(jackett_instances) + len(prowlarr_instances)
+
+        if sources_queried == 0:
+            return SearchOutcome([], ["No instances configured"], 0, 0)
+
+        cache_key = self.cache.make_key(
+            query,
+            category,
+            [instance.id for instance in jackett_instances],
+            [instance.id for instance in prowlarr_instances],
+        )
+
+        view_key = SearchViewKey(min_seeders, max_size, sort_by, sort_order, dedupe)
+
+        # Re-sorts and re-filters of a recent search are served from memory, and
+        # repeating a view (e.g. fetching the next page) skips filtering and sorting too
+        cached = self.cache.get(cache_key)
+        metrics.searches.inc("miss" if cached is None else "hit")
+        if cached is not None:
+            view = self.cache.get_view(cache_key, view_key)
+            if view is not None:
+                with metrics.stage("page"):
+                    page = view.page(offset, limit)
+                errors = [source.error for source in cached if source.error]
+                return SearchOutcome(
+                    page,
+                    errors,
+                    sources_queried,
+                    total_results=len(view),
+                    partial=bool(errors),
+                )
+            source_iter = self._iter_cached(cached)
+        else:
+            source_iter = self._iter_sources(
+                jackett_instances, prowlarr_instances, query, category, timeout
+            )
+
+        key = self._sort_key(sort_by)
+        reverse = sort_order == SortOrder.DESC
+        sources: list[SourceResults | None] = [None] * sources_queried
+        runs: list[list[SearchRecord]] = [[] for _ in range(sources_queried)]
+
+        async for index, source in source_iter:
+            sources[index] = source
+            if not dedupe:
+                # Filter and sort each instance's results while slower ones are still
+                # answering; the sorted runs are merged once every instance is done
+                with metrics.stage("filter"):
+                    filtered = self._apply_filters(
+                        source.results, min_seeders=min_seeders, max_size=max_size
+                    )
+                with metrics.stage("sort"):
+                    runs[index] = sorted(filtered, key=key, reverse=reverse)
+
+        completed = [source for source in sources if source is not None]
+        errors = [source.error for source in completed if source.error]
+
+        # Result sets with failed instances are cached too, but only briefly; later
+        # pages then come from the same results as the first
+        if cached is None:
+            self.cache.set(cache_key, completed, generation)
+
+        if dedupe:
+            # Merge duplicates first so filters see the combined seeder count
+            with metrics.stage("dedupe"):
+                all_results = merge_duplicates(
+                    [result for source in completed for result in source.results]
+                )
+            with metrics.stage("filter"):
+                filtered_results = self._apply_filters(
+                    all_results, min_seeders=min_seeders, max_size=max_size
+                )
+            view = SearchView(filtered_results, key=key, reverse=reverse)
+        else:
+            view = SearchView.from_sorted_runs(runs, key=key, reverse=reverse)
+        self.cache.set_view(cache_key, view_key, view)
+
+        with metrics.stage("page"):
+            page = view.page(offset, limit)
+        return SearchOutcome(
+            page, errors, sources_queried, total_results=len(view), partial=bool(errors)
+        )
+
+    async def search_stream(
+        self,
+        jackett_instances: list[IndexerConfig],
+        prowlarr_instances: list[IndexerConfig],
+        query: str,
+        category: SearchCategory = SearchCategory.ALL,
+        min_seeders: int = 0,
+        max_size: str | None = None,
+        sort_by: SortBy = SortBy.SEEDERS,
+        sort_order: SortOrder = SortOrder.DESC,
+        timeout: float | None = None,
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Execute a unified search, yielding each instance's results as soon as it answers.
 
-        # Get instances to search
-        jackett_instances = await self._get_jackett_instances(jackett_ids)
-        prowlarr_instances = await self._get_prowlarr_instances(prowlarr_ids)
+        Every batch is filtered and sorted with the same rules as search(). After all
+        instances have answered, a summary carries the result IDs in the order search()
+        would have returned them. Results stay records; they are serialized with
+        StreamResults.to_dict().
+
+        Args:
+            jackett_instances: Jackett instances to search (see resolve_instances)
+            prowlarr_instances: Prowlarr instances to search (see resolve_instances)
+            query: The search query
+            category: Category to filter by
+            min_seeders: Minimum number of seeders
+            max_size: Maximum size filter (e.g., "10GB", "500MB")
+            sort_by: Field to sort by
+            sort_order: Sort order (asc/desc)
+            timeout: Seconds to wait for instances before finishing with partial
+                results (None waits for every instance)
 
+        Yields:
+            Results and source status events per instance, then a single summary event
+        """
+        generation = self.cache.generation
         sources_queried = len(jackett_instances) + len(prowlarr_instances)
 
         if sources_queried == 0:
-            return [], ["No instances configured"], 0
+            yield SearchStreamSummary(
+                query=query,
+                category=category,
+                total_results=0,
+                sources_queried=0,
+                errors=["No instances configured"],
+                result_ids=[],
+            )
+            return
 
-        # Create search tasks
-        tasks: list[asyncio.Task[Any]] = []
-        semaphore = asyncio.Semaphore(self.concurrent_limit)
+        cache_key = self.cache.make_key(
+            query,
+            category,
+            [instance.id for instance in jackett_instances],
+            [instance.id for instance in prowlarr_instances],
+        )
 
-        for instance in jackett_instances:
-            task = asyncio.create_task(
-                self._search_jackett_with_semaphore(semaphore, instance, query, category)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            source_iter = self._iter_cached(cached)
+        else:
+            source_iter = self._iter_sources(
+                jackett_instances, prowlarr_instances, query, category, timeout
             )
-            tasks.append(task)
 
-        for instance in prowlarr_instances:
-            task = asyncio.create_task(
-                self._search_prowlarr_with_semaphore(semaphore, instance, query, category)
+        sources: list[SourceResults | None] = [None] * sources_queried
+        filtered: list[list[SearchRecord]] = [[] for _ in range(sources_queried)]
+
+        async for index, source in source_iter:
+            sources[index] = source
+            batch = self._sort_results(
+                self._apply_filters(source.results, min_seeders=min_seeders, max_size=max_size),
+                sort_by,
+                sort_order,
             )
-            tasks.append(task)
-
-        # Execute all searches concurrently
-        task_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Aggregate results and collect errors
-        all_results: list[SearchResult] = []
-        errors: list[str] = []
-
-        for result in task_results:
-            if isinstance(result, Exception):
-                errors.append(str(result))
-            elif isinstance(result, tuple):
-                results, error = result
-                all_results.extend(results)
-                if error:
-                    errors.append(error)
-
-        # Apply filters
-        filtered_results = self._apply_filters(
-            all_results,
-            min_seeders=min_seeders,
-            max_size=max_size,
+            filtered[index] = batch
+
+            if batch:
+                yield StreamResults(source.name, source.source_type, batch)
+            yield SearchStreamSourceStatus(
+                source=source.name,
+                source_type=source.source_type,
+                status="timeout" if source.timed_out else "error" if source.error else "ok",
+                result_count=len(batch),
+                error=source.error,
+            )
+
+        completed = [source for source in sources if source is not None]
+        errors = [source.error for source in completed if source.error]
+        if cached is None:
+            self.cache.set(cache_key, completed, generation)
+
+        # Merge batches in instance order so ties sort exactly as in search()
+        merged = [result for batch in filtered for result in batch]
+        final = self._sort_results(merged, sort_by, sort_order)
+
+        yield SearchStreamSummary(
+            query=query,
+            category=category,
+            total_results=len(final),
+            sources_queried=sources_queried,
+            errors=errors,
+            partial=bool(errors),
+            result_ids=[result.id for result in final],
+        )
+
+    async def resolve_instances(
+        self,
+        jackett_ids: list[int] | None = None,
+        prowlarr_ids: list[int] | None = None,
+        exclusive_filter: bool = False,
+    ) -> tuple[list[IndexerConfig], list[IndexerConfig]]:
+        """
+        Resolve which Jackett and Prowlarr instances a search should query.
+
+        Args:
+            jackett_ids: List of Jackett instance IDs to search (None = all)
+            prowlarr_ids: List of Prowlarr instance IDs to search (None = all)
+            exclusive_filter: If True, None means "search none" instead of "search all"
+
+        Returns:
+            Tuple of (jackett_instances, prowlarr_instances)
+        """
+        # In exclusive mode, treat None as "search none" (empty list)
+        # This is used when user explicitly selects specific instances
+        if exclusive_filter:
+            if jackett_ids is None:
+                jackett_ids = []
+            if prowlarr_ids is None:
+                prowlarr_ids = []
+
+        config = await self.registry.snapshot()
+        return (
+            self._select_instances(config.jackett, jackett_ids),
+            self._select_instances(config.prowlarr, prowlarr_ids),
         )
 
-        # Sort results
-        sorted_results = self._sort_results(filtered_results, sort_by, sort_order)
+    async def _iter_sources(
+        self,
+        jackett_instances: list[IndexerConfig],
+        prowlarr_instances: list[IndexerConfig],
+        query: str,
+        category: SearchCategory,
+        timeout: float | None = None,
+    ) -> AsyncIterator[tuple[int, SourceResults]]:
+        """
+        Query every instance concurrently, yielding each one as it completes.
 
-        return sorted_results, errors, sources_queried
+        Instances whose circuit is open are not queried; they are reported
+        straight away with an error and probed in the background instead.
+        Instances still searching when the timeout expires are cancelled and
+        reported as timed out.
 
-    async def _get_jackett_instances(self, instance_ids: list[int] | None) -> list[JackettInstance]:
-        """Get Jackett instances to search."""
-        query = select(JackettInstance)
-        if instance_ids is not None:
-            query = query.where(JackettInstance.id.in_(instance_ids))
+        Yields:
+            Tuples of (instance index, results), where the index is the instance's
+            position with Jackett instances first, then Prowlarr instances
+        """
+        semaphore = asyncio.Semaphore(self.concurrent_limit)
+        targets: list[tuple[str, IndexerConfig]] = [
+            *(("jackett", instance) for instance in jackett_instances),
+            *(("prowlarr", instance) for instance in prowlarr_instances),
+        ]
+        tasks: dict[asyncio.Task[Any], tuple[int, str, IndexerConfig]] = {}
+        skipped: list[tuple[int, SourceResults]] = []
+
+        for index, (source_type, instance) in enumerate(targets):
+            key = (source_type, instance.id)
+            if self.breaker.is_open(key):
+                get_metrics().instance_requests.inc(source_type, instance.name, "skipped")
+                self.breaker.probe(key, partial(self._probe_instance, source_type, instance))
+                skipped.append(
+                    (
+                        index,
+                        SourceResults(
+                            source_type=source_type,
+                            instance_id=instance.id,
+                            name=instance.name,
+                            results=[],
+                            error=f"Skipped {instance.name}: instance is unavailable",
+                        ),
+                    )
+                )
+                continue
+
+            # Concurrent identical searches share one request per instance
+            flight_key = (self.cache.normalize_query(query), category, source_type, instance.id)
+            coro = self.flights.do(
+                flight_key,
+                partial(self._search_source, semaphore, source_type, instance, query, category),
+            )
+            tasks[asyncio.create_task(coro)] = (index, source_type, instance)
 
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
+        pending = set(tasks)
+        try:
+            for index, source in skipped:
+                yield index, source
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout if timeout is not None else None
+
+            while pending:
+                remaining = deadline - loop.time() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    index, source_type, instance = tasks[task]
+                    if task.exception() is not None:
+                        results: list[SearchRecord] = []
+                        error: str | None = str(task.exception())
+                    else:
+                        results, error, timing = task.result()
+                        # Every request sharing the search reports its timings
+                        record_timings(timing)
+
+                    yield index, SourceResults(
+                        source_type=source_type,
+                        instance_id=instance.id,
+                        name=instance.name,
+                        results=results,
+                        error=error,
+                    )
+
+            # Deadline expired: give up on instances that have not answered yet.
+            # This is not the instance's fault, so it does not count against its circuit
+            # (the cancelled search records its latency and a "deadline" error itself).
+            timeout_ms = (timeout or 0) * 1000
+            for task in sorted(pending, key=lambda t: tasks[t][0]):
+                task.cancel()
+                index, source_type, instance = tasks[task]
+                record_timing(
+                    f"{source_type}-{instance.id}", timeout or 0, f"{instance.name} timed out"
+                )
+                yield index, SourceResults(
+                    source_type=source_type,
+                    instance_id=instance.id,
+                    name=instance.name,
+                    results=[],
+                    error=f"Timed out waiting for {instance.name} after {timeout_ms:.0f} ms",
+                    timed_out=True,
+                )
+            pending = set()
+        finally:
+            # The consumer went away (e.g. client disconnected); stop outstanding searches
+            for task in pending:
+                task.cancel()
+
+    async def _search_source(
+        self,
+        semaphore: asyncio.Semaphore,
+        source_type: str,
+        instance: IndexerConfig,
+        query: str,
+        category: SearchCategory,
+    ) -> tuple[list[SearchRecord], str | None, ServerTiming]:
+        """
+        Search one instance, or share another worker's search of it.
 
-    async def _get_prowlarr_instances(
-        self, instance_ids: list[int] | None
-    ) -> list[ProwlarrInstance]:
-        """Get Prowlarr instances to search."""
-        query = select(ProwlarrInstance)
-        if instance_ids is not None:
-            query = query.where(ProwlarrInstance.id.in_(instance_ids))
+        The search may be shared by several requests (see SingleFlight), so its
+        timings are collected apart and returned for each of them to report.
+        """
+        search = partial(self._search_upstream, semaphore, source_type, instance, query, category)
+        with collect_timings() as timing:
+            if self.shared is None:
+                results, error = await search()
+            else:
+                key = shared_search_key(query, category, source_type, instance.id)
+                results, error = await self.shared.coalesce(
+                    key, source_type, (instance.id, instance.name), search
+                )
+        return results, error, timing
+
+    async def _search_upstream(
+        self,
+        semaphore: asyncio.Semaphore,
+        source_type: str,
+        instance: IndexerConfig,
+        query: str,
+        category: SearchCategory,
+    ) -> tuple[list[SearchRecord], str | None]:
+        """Search one instance and record the outcome with its circuit breaker."""
+        if source_type == "jackett":
+            results, error = await self._search_jackett_with_semaphore(
+                semaphore, instance, query, category
+            )
+        else:
+            results, error = await self._search_prowlarr_with_semaphore(
+                semaphore, instance, query, category
+            )
 
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
+        if error:
+            self.breaker.record_failure((source_type, instance.id))
+        else:
+            self.breaker.record_success((source_type, instance.id))
+        return results, error
+
+    @staticmethod
+    async def _probe_instance(source_type: str, instance: IndexerConfig) -> bool:
+        """Check whether a skipped instance answers again."""
+        health = await probe_instance(instance, source_type)
+        return health.status == "online"
+
+    @staticmethod
+    async def _iter_cached(
+        sources: list[SourceResults],
+    ) -> AsyncIterator[tuple[int, SourceResults]]:
+        """Replay cached per-instance results in the shape of _iter_sources."""
+        for index, source in enumerate(sources):
+            yield index, source
+
+    @staticmethod
+    def _select_instances(
+        instances: tuple[IndexerConfig, ...], instance_ids: list[int] | None
+    ) -> list[IndexerConfig]:
+        """Get the configured instances to search."""
+        if instance_ids is None:
+            return list(instances)
+        wanted = set(instance_ids)
+        return [instance for instance in instances if instance.id in wanted]
 
     async def _search_jackett_with_semaphore(
         self,
         semaphore: asyncio.Semaphore,
-        instance: JackettInstance,
+        instance: IndexerConfig,
         query: str,
         category: SearchCategory,
-    ) -> tuple[list[SearchResult], str | None]:
+    ) -> tuple[list[SearchRecord], str | None]:
         """Search a Jackett instance with concurrency control."""
         async with semaphore:
             return await self._search_jackett(instance, query, category)
 
     async def _search_jackett(
         self,
-        instance: JackettInstance,
+        instance: IndexerConfig,
         query: str,
         category: SearchCategory,
-    ) -> tuple[list[SearchResult], str | None]:
+    ) -> tuple[list[SearchRecord], str | None]:
         """Search a single Jackett instance."""
+        started = time.perf_counter()
+        service: JackettService | None = None
+        results: list[SearchRecord] = []
+        error: BaseException | None = None
         try:
             api_key = decrypt_credential(instance.api_key)
-            service = JackettService(instance.url, api_key)
-            results = await service.search(query, category, instance.name)
-            return results, None
+            client = get_http_client_registry().get(
+                "jackett", instance.id, instance.url, JACKETT_TIMEOUT
+            )
+            service = JackettService(instance.url, api_key, client=client)
+            results = await service.search(query, category, instance.name, raise_on_error=True)
+        except httpx.HTTPError as e:
+            logger.warning(f"Error searching Jackett instance {instance.name}: {e!r}")
+            error = e
+            return [], f"Error searching {instance.name}: {str(e) or type(e).__name__}"
         except Exception as e:
             logger.exception(f"Error searching Jackett instance {instance.name}")
+            error = e
             return [], f"Error searching {instance.name}: {str(e)}"
+        except asyncio.CancelledError as e:
+            # Given up at the deadline: the slowest searches must still be observed
+            error = e
+            raise
+        finally:
+            self._record_search("jackett", instance, started, service, results, error)
+
+        return results, None
 
     async def _search_prowlarr_with_semaphore(
         self,
         semaphore: asyncio.Semaphore,
-        instance: ProwlarrInstance,
+        instance: IndexerConfig,
         query: str,
         category: SearchCategory,
-    ) -> tuple[list[SearchResult], str | None]:
+    ) -> tuple[list[SearchRecord], str | None]:
         """Search a Prowlarr instance with concurrency control."""
         async with semaphore:
             return await self._search_prowlarr(instance, query, category)
 
     async def _search_prowlarr(
         self,
-        instance: ProwlarrInstance,
+        instance: IndexerConfig,
         query: str,
         category: SearchCategory,
-    ) -> tuple[list[SearchResult], str | None]:
+    ) -> tuple[list[SearchRecord], str | None]:
         """Search a single Prowlarr instance."""
+        started = time.perf_counter()
+        service: ProwlarrService | None = None
+        results: list[SearchRecord] = []
+        error: BaseException | None = None
         try:
             api_key = decrypt_credential(instance.api_key)
-            service = ProwlarrService(instance.url, api_key)
-            results = await service.search(query, category, instance.name)
-            return results, None
+            client = get_http_client_registry().get(
+                "prowlarr", instance.id, instance.url, PROWLARR_TIMEOUT
+            )
+            service = ProwlarrService(instance.url, api_key, client=client)
+            results = await service.search(query, category, instance.name, raise_on_error=True)
+        except httpx.HTTPError as e:
+            logger.warning(f"Error searching Prowlarr instance {instance.name}: {e!r}")
+            error = e
+            return [], f"Error searching {instance.name}: {str(e) or type(e).__name__}"
         except Exception as e:
             logger.exception(f"Error searching Prowlarr instance {instance.name}")
+            error = e
             return [], f"Error searching {instance.name}: {str(e)}"
+        except asyncio.CancelledError as e:
+            # Given up at the deadline: the slowest searches must still be observed
+            error = e
+            raise
+        finally:
+            self._record_search("prowlarr", instance, started, service, results, error)
+
+        return results, None
+
+    @staticmethod
+    def _record_search(
+        source_type: str,
+        instance: IndexerConfig,
+        started: float,
+        service: JackettService | ProwlarrService | None,
+        results: list[SearchRecord] | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """Record the latency and outcome of one instance search."""
+        elapsed = time.perf_counter() - started
+        metrics = get_metrics()
+        metrics.instance_request_seconds.observe(elapsed, source_type, instance.name)
+
+        # Parsing overlaps the download for streamed responses; the rest is network time
+        parse_seconds = service.parse_seconds if service is not None else 0.0
+        name = f"{source_type}-{instance.id}"
+        record_timing(name, elapsed - parse_seconds, f"{instance.name} network")
+        record_timing(f"{name}-parse", parse_seconds, f"{instance.name} parse")
+
+        if error is not None:
+            if isinstance(error, httpx.TimeoutException):
+                reason = "timeout"
+            elif isinstance(error, httpx.HTTPStatusError):
+                reason = "http"
+            elif isinstance(error, httpx.HTTPError):
+                reason = "connection"
+            elif isinstance(error, ValueError):
+                reason = "parse"
+            elif isinstance(error, asyncio.CancelledError):
+                reason = "deadline"
+            else:
+                reason = "error"
+            metrics.instance_requests.inc(source_type, instance.name, "error")
+            metrics.instance_errors.inc(source_type, instance.name, reason)
+            return
+
+        metrics.instance_requests.inc(source_type, instance.name, "ok")
+        for indexer, count in Counter(result.indexer for result in results or ()).items():
+            metrics.indexer_results.inc(source_type, instance.name, indexer, amount=count)
 
     def _apply_filters(
         self,
-        results: list[SearchResult],
+        results: list[SearchRecord],
         min_seeders: int = 0,
         max_size: str | None = None,
-    ) -> list[SearchResult]:
+    ) -> list[SearchRecord]:
         """
         Apply filters to search results.
 
@@ -274,10 +774,10 @@ class SearchAggregator:
 
     def _sort_results(
         self,
-        results: list[SearchResult],
+        results: list[SearchRecord],
         sort_by: SortBy,
         sort_order: SortOrder,
-    ) -> list[SearchResult]:
+    ) -> list[SearchRecord]:
         """
         Sort search results.
 
@@ -289,23 +789,28 @@ class SearchAggregator:
         Returns:
             Sorted list of results
         """
-        reverse = sort_order == SortOrder.DESC
+        return sorted(results, key=self._sort_key(sort_by), reverse=sort_order == SortOrder.DESC)
 
+    @staticmethod
+    def _sort_key(sort_by: SortBy) -> Callable[[SearchRecord], Any]:
+        """Get the sort key for a sort field."""
         if sort_by == SortBy.SEEDERS:
-            return sorted(results, key=lambda r: r.seeders, reverse=reverse)
+            return lambda r: r.seeders
         elif sort_by == SortBy.SIZE:
-            return sorted(results, key=lambda r: r.size, reverse=reverse)
+            return lambda r: r.size
         elif sort_by == SortBy.DATE:
-            # Handle None dates by using a very old date for sorting
-            from datetime import datetime
-
-            min_date = datetime.min
-            return sorted(
-                results,
-                key=lambda r: r.date if r.date else min_date,
-                reverse=reverse,
-            )
+            # Handle None dates by using a very old date for sorting. Dates without
+            # a timezone are taken as UTC so they compare with timezone-aware ones.
+            min_date = datetime.min.replace(tzinfo=UTC)
+
+            def date_key(r: SearchRecord) -> datetime:
+                if r.date is None:
+                    return min_date
+                return r.date if r.date.tzinfo is not None else r.date.replace(tzinfo=UTC)
+
+            return date_key
         elif sort_by == SortBy.NAME:
-            return sorted(results, key=lambda r: r.title.lower(), reverse=reverse)
+            return lambda r: r.title.lower()
         else:
-            return results
+            # Stable sort on a constant key keeps the original order
+            return lambda r: 0
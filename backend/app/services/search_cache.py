@@ -0,0 +1,402 @@
+"""
+In-process cache for aggregated search results.
+
+Stores the raw merged results of a fan-out (before filtering and sorting) so
+that re-sorting or re-filtering the same search is served from memory instead
+of querying every indexer again. Each entry also keeps a few filtered and
+sorted views of its results, so paging through one view does not filter or
+sort again.
+"""
+
+import heapq
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import lru_cache
+from itertools import islice
+from typing import Any, NamedTuple
+
+from app.config import settings
+from app.schemas.search import SearchCategory, SortBy, SortOrder
+from app.services.search_record import SearchRecord
+
+# Filtered/sorted views kept per cached search (least recently used are dropped)
+MAX_VIEWS_PER_ENTRY = 8
+
+# A page ending at position k is selected with a heap (O(n log k)) instead of a
+# full sort (O(n log n)) while k * TOP_K_RATIO is below the number of results
+TOP_K_RATIO = 4
+
+
+class SourceResults(NamedTuple):
+    """Raw results returned by a single instance during a fan-out."""
+
+    source_type: str
+    instance_id: int
+    name: str
+    results: list[SearchRecord]
+    error: str | None = None
+    timed_out: bool = False
+
+
+class SearchCacheKey(NamedTuple):
+    """Identifies one upstream fan-out: normalized query, category and instances."""
+
+    query: str
+    category: SearchCategory
+    jackett_ids: tuple[int, ...]
+    prowlarr_ids: tuple[int, ...]
+
+
+class SearchViewKey(NamedTuple):
+    """Identifies one filtered, sorted view of a cached search."""
+
+    min_seeders: int
+    max_size: str | None
+    sort_by: SortBy
+    sort_order: SortOrder
+    dedupe: bool
+
+
+class SearchView:
+    """
+    Filtered results of one search view, sorted lazily as pages are requested.
+
+    Early pages are picked with heap-based top-K selection; the full sort only
+    happens once a page reaches deep enough into the results to need it.
+    Both give exactly the order of a stable sort.
+
+    A view can also be built from per-instance runs that are already sorted
+    (see from_sorted_runs); early pages are then taken from a lazy k-way merge
+    of the runs.
+
+    A view never holds more than `size` references to results: its results
+    (or runs), plus the sorted head, until the full sort replaces both.
+    """
+
+    def __init__(
+        self,
+        results: list[SearchRecord],
+        key: Callable[[SearchRecord], Any],
+        reverse: bool = False,
+    ) -> None:
+        """
+        Initialize the view.
+
+        Args:
+            results: Filtered results, in instance order
+            key: Sort key
+            reverse: Sort in descending order
+        """
+        self._results = results
+        self._length = len(results)
+        self._key = key
+        self._reverse = reverse
+        # Sorted runs to merge instead of sorting _results (see from_sorted_runs)
+        self._runs: list[list[SearchRecord]] | None = None
+        self._sorted: list[SearchRecord] | None = None
+        # Sorted head of the results, from the largest top-K selection so far
+        self._head: list[SearchRecord] = []
+
+    @classmethod
+    def from_sorted_runs(
+        cls,
+        runs: list[list[SearchRecord]],
+        key: Callable[[SearchRecord], Any],
+        reverse: bool = False,
+    ) -> "SearchView":
+        """
+        Build a view from runs that are each already sorted with key and reverse.
+
+        Merging stable-sorted runs in instance order gives exactly the stable sort
+        of their concatenation, so the view matches one built from the flat results.
+
+        Args:
+            runs: Sorted, filtered results per instance, in instance order
+            key: Sort key the runs were sorted with
+            reverse: Whether the runs are in descending order
+        """
+        view = cls([], key=key, reverse=reverse)
+        view._runs = [run for run in runs if run]
+        view._length = sum(len(run) for run in view._runs)
+        return view
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def size(self) -> int:
+        """Most references to results the view holds at once (counted by the cache)."""
+        # The head of a top-K selection is shorter than len(self) / TOP_K_RATIO
+        return self._length + self._length // TOP_K_RATIO
+
+    def page(self, offset: int = 0, limit: int | None = None) -> list[SearchRecord]:
+        """
+        Get one page of the sorted results.
+
+        Args:
+            offset: Number of results to skip
+            limit: Page size (None returns everything after offset)
+
+        Returns:
+            The results in [offset, offset + limit) of the sorted view
+        """
+        if limit is None:
+            return self.all()[offset:]
+
+        end = offset + limit
+        if self._sorted is not None:
+            return self._sorted[offset:end]
+        if end <= len(self._head):
+            return self._head[offset:end]
+
+        if end * TOP_K_RATIO < self._length:
+            # Equivalent to sorted(...)[:end], including the order of ties
+            if self._runs is not None:
+                # Ties come out in run (instance) order
+                merged = heapq.merge(*self._runs, key=self._key, reverse=self._reverse)
+                self._head = list(islice(merged, end))
+            else:
+                select = heapq.nlargest if self._reverse else heapq.nsmallest
+                self._head = select(end, self._results, key=self._key)
+            return self._head[offset:end]
+
+        return self.all()[offset:end]
+
+    def all(self) -> list[SearchRecord]:
+        """Get every result, fully sorted (the list must not be modified)."""
+        if self._sorted is None:
+            results = self._results
+            if self._runs is not None:
+                # A full merge in Python is slower than one C sort of the concatenation
+                results = [result for run in self._runs for result in run]
+            self._sorted = sorted(results, key=self._key, reverse=self._reverse)
+            # Only the sorted list is needed from now on
+            self._results = []
+            self._runs = None
+            self._head = []
+        return self._sorted
+
+
+class _CacheEntry(NamedTuple):
+    """A cached fan-out and the views derived from it."""
+
+    expires_at: float
+    sources: list[SourceResults]
+    views: OrderedDict[SearchViewKey, SearchView]
+
+
+class SearchResultCache:
+    """
+    TTL cache with LRU eviction for raw search results.
+
+    Each entry holds the per-instance results of one fan-out, in instance order.
+    Memory is bounded both by the number of entries and by the total number
+    of results held across all entries, counting their views' copies too.
+
+    Every clear() bumps the generation. A search that started before a clear
+    (e.g. before an instance was edited) passes the generation it saw to set(),
+    so its results from the old configuration are not stored.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = settings.SEARCH_CACHE_TTL_SECONDS,
+        partial_ttl_seconds: float = settings.SEARCH_CACHE_PARTIAL_TTL_SECONDS,
+        max_entries: int = settings.SEARCH_CACHE_MAX_ENTRIES,
+        max_results: int = settings.SEARCH_CACHE_MAX_RESULTS,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_seconds: Seconds an entry stays valid (0 disables caching)
+            partial_ttl_seconds: Seconds an entry with failed instances stays valid
+                (at most ttl_seconds; 0 does not cache them)
+            max_entries: Maximum number of cached searches
+            max_results: Maximum number of results held across all entries
+                (views included, see SearchView.size)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.partial_ttl_seconds = min(partial_ttl_seconds, ttl_seconds)
+        self.max_entries = max_entries
+        self.max_results = max_results
+        self._entries: OrderedDict[SearchCacheKey, _CacheEntry] = OrderedDict()
+        self._total_results = 0
+        self.generation = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether caching is enabled."""
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Case-fold a query and collapse whitespace so equivalent queries compare equal."""
+        return " ".join(query.split()).casefold()
+
+    @staticmethod
+    def make_key(
+        query: str,
+        category: SearchCategory,
+        jackett_ids: list[int],
+        prowlarr_ids: list[int],
+    ) -> SearchCacheKey:
+        """
+        Build a cache key for a search.
+
+        The query is case-folded and whitespace-collapsed, and instance IDs are
+        sorted, so equivalent searches share an entry.
+        """
+        return SearchCacheKey(
+            query=SearchResultCache.normalize_query(query),
+            category=category,
+            jackett_ids=tuple(sorted(jackett_ids)),
+            prowlarr_ids=tuple(sorted(prowlarr_ids)),
+        )
+
+    def get(self, key: SearchCacheKey) -> list[SourceResults] | None:
+        """
+        Get cached per-instance results for a search.
+
+        Returns:
+            The cached results, or None on a miss or expired entry
+        """
+        entry = self._get_entry(key)
+        return entry.sources if entry is not None else None
+
+    def set(
+        self,
+        key: SearchCacheKey,
+        sources: list[SourceResults],
+        generation: int | None = None,
+    ) -> None:
+        """
+        Store per-instance results for a search, evicting least recently used entries.
+
+        A search some instances failed, were skipped or timed out for is kept
+        only briefly (partial_ttl_seconds), with those instances' errors, so
+        paging and re-sorting it does not query every instance again while
+        one is down, and the failed ones are retried soon. Result sets larger
+        than the whole cache budget are not stored.
+
+        Args:
+            key: The search
+            sources: Per-instance results, in instance order
+            generation: The cache generation when the search started; results
+                are not stored if the cache was cleared since
+        """
+        if generation is not None and generation != self.generation:
+            return
+
+        size = self._count(sources)
+        partial = any(source.error for source in sources)
+        ttl = self.partial_ttl_seconds if partial else self.ttl_seconds
+        if not self.enabled or ttl <= 0 or size > self.max_results:
+            return
+
+        self._pop(key)
+        self._entries[key] = _CacheEntry(
+            expires_at=time.monotonic() + ttl,
+            sources=sources,
+            views=OrderedDict(),
+        )
+        self._total_results += size
+        self._evict()
+
+    def get_view(self, key: SearchCacheKey, view_key: SearchViewKey) -> SearchView | None:
+        """
+        Get a filtered, sorted view of a cached search.
+
+        Returns:
+            The cached view, or None if the search or the view is not cached
+        """
+        entry = self._get_entry(key)
+        if entry is None:
+            return None
+
+        view = entry.views.get(view_key)
+        if view is not None:
+            entry.views.move_to_end(view_key)
+        return view
+
+    def set_view(self, key: SearchCacheKey, view_key: SearchViewKey, view: SearchView) -> None:
+        """
+        Store a filtered, sorted view of a cached search.
+
+        Views live and expire with their search; a view of a search that is not
+        cached is not stored. Views count against the result budget: the
+        search's least recently used views make room first, then other searches.
+        """
+        entry = self._get_entry(key)
+        if entry is None:
+            return
+
+        replaced = entry.views.pop(view_key, None)
+        if replaced is not None:
+            self._total_results -= replaced.size
+
+        entry_size = self._entry_size(entry) + view.size
+        while entry.views and (
+            len(entry.views) >= MAX_VIEWS_PER_ENTRY or entry_size > self.max_results
+        ):
+            _, dropped = entry.views.popitem(last=False)
+            self._total_results -= dropped.size
+            entry_size -= dropped.size
+        if entry_size > self.max_results:
+            return
+
+        entry.views[view_key] = view
+        self._total_results += view.size
+        # The entry is the most recently used, so other entries are evicted first
+        self._evict()
+
+    def clear(self) -> None:
+        """Remove every cached entry, and drop the results of searches still running."""
+        self._entries.clear()
+        self._total_results = 0
+        self.generation += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get_entry(self, key: SearchCacheKey) -> _CacheEntry | None:
+        """Get a live entry, dropping it if it expired, and mark it recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            self._pop(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until both limits are met."""
+        while len(self._entries) > self.max_entries or self._total_results > self.max_results:
+            oldest = next(iter(self._entries))
+            self._pop(oldest)
+
+    def _pop(self, key: SearchCacheKey) -> None:
+        """Remove an entry and release its share of the result budget."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_results -= self._entry_size(entry)
+
+    @classmethod
+    def _entry_size(cls, entry: _CacheEntry) -> int:
+        """Count the results held by an entry and its views."""
+        return cls._count(entry.sources) + sum(view.size for view in entry.views.values())
+
+    @staticmethod
+    def _count(sources: list[SourceResults]) -> int:
+        """Count the results held across all sources."""
+        return sum(len(source.results) for source in sources)
+
+
+@lru_cache
+def get_search_cache() -> SearchResultCache:
+    """Get or create the shared search result cache (lazily initialized)."""
+    return SearchResultCache()
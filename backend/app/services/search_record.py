@@ -0,0 +1,64 @@
+"""
+Compact internal representation of search results.
+
+Parsers produce SearchRecord tuples, and the aggregation pipeline (cache,
+filters, sorting, deduplication) works on them. They are converted to the
+SearchResult response schema only for the results actually returned, without
+running validation again: records are built from values the parsers have
+already checked. The search endpoints (including the stream) skip the schema
+objects altogether and serialize to_dict() output straight to JSON.
+"""
+
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from app.schemas.search import SearchResult, SearchResultSource
+
+
+class SearchRecordSource(NamedTuple):
+    """One copy of a release that was merged into a deduplicated record."""
+
+    source: str
+    source_type: str
+    indexer: str
+    seeders: int
+    leechers: int
+
+    def to_schema(self) -> SearchResultSource:
+        """Convert to the response schema (without validation)."""
+        return SearchResultSource.model_construct(**self._asdict())
+
+
+class SearchRecord(NamedTuple):
+    """A single search result, as produced by the Jackett and Prowlarr parsers."""
+
+    id: str
+    title: str
+    source: str
+    source_type: str
+    indexer: str
+    size: int
+    size_formatted: str
+    seeders: int
+    leechers: int
+    date: datetime | None
+    category: str
+    magnet_link: str | None = None
+    torrent_url: str | None = None
+    info_url: str | None = None
+    infohash: str | None = None
+    sources: tuple[SearchRecordSource, ...] | None = None
+
+    def to_schema(self) -> SearchResult:
+        """Convert to the response schema (without validation)."""
+        fields = self._asdict()
+        if self.sources is not None:
+            fields["sources"] = [source.to_schema() for source in self.sources]
+        return SearchResult.model_construct(**fields)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Fields as a dict that serializes to the same JSON as to_schema()."""
+        fields = self._asdict()
+        if self.sources is not None:
+            fields["sources"] = [source._asdict() for source in self.sources]
+        return fields
@@ -0,0 +1,106 @@
+"""
+Per-request timing breakdown for the Server-Timing header.
+
+Code on the search path records how long each stage took, and the search
+endpoint reports the collected durations in a Server-Timing header (and in
+the response body when debug output is requested). Timings are collected
+through a context variable, so they follow the request into the tasks it
+starts; outside a collecting request, recording is a no-op. Work shared by
+several requests (a coalesced instance search) collects its own timings,
+which each of those requests then adds with record_timings().
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import NamedTuple
+from urllib.parse import quote
+
+
+class TimingEntry(NamedTuple):
+    """Total duration of one named stage."""
+
+    duration_ms: float
+    description: str | None
+
+
+class ServerTiming:
+    """Stage durations collected for one request."""
+
+    def __init__(self) -> None:
+        self.entries: dict[str, TimingEntry] = {}
+
+    def add(self, name: str, seconds: float, description: str | None = None) -> None:
+        """
+        Add time to a stage (repeated stages, e.g. one filter per instance, add up).
+
+        Args:
+            name: Metric name (an HTTP token, e.g. "filter" or "jackett-1")
+            seconds: Duration to add
+            description: Human-readable description shown by browser devtools
+        """
+        duration_ms = seconds * 1000
+        entry = self.entries.get(name)
+        if entry is not None:
+            duration_ms += entry.duration_ms
+            description = description or entry.description
+        self.entries[name] = TimingEntry(duration_ms, description)
+
+    def as_dict(self) -> dict[str, float]:
+        """Durations in milliseconds, by stage name."""
+        return {name: round(entry.duration_ms, 3) for name, entry in self.entries.items()}
+
+    def header_value(self) -> str:
+        """Render the entries as a Server-Timing header value."""
+        metrics = []
+        for name, entry in self.entries.items():
+            metric = name
+            if entry.description:
+                metric += f';desc="{_quoted_string(entry.description)}"'
+            metrics.append(f"{metric};dur={entry.duration_ms:.1f}")
+        return ", ".join(metrics)
+
+
+def _quoted_string(text: str) -> str:
+    """
+    Escape text for a quoted header string.
+
+    Header values must be latin-1 encodable (and printable), so anything beyond
+    printable ASCII, e.g. in an instance name, is percent-encoded.
+    """
+    escaped = []
+    for char in text:
+        if char in '\\"':
+            escaped.append(f"\\{char}")
+        elif " " <= char <= "~" and char != "%":
+            escaped.append(char)
+        else:
+            escaped.append(quote(char, safe=""))
+    return "".join(escaped)
+
+
+_current_timing: ContextVar[ServerTiming | None] = ContextVar("server_timing", default=None)
+
+
+@contextmanager
+def collect_timings() -> Iterator[ServerTiming]:
+    """Collect the timings recorded within the block (and tasks started from it)."""
+    timing = ServerTiming()
+    token = _current_timing.set(timing)
+    try:
+        yield timing
+    finally:
+        _current_timing.reset(token)
+
+
+def record_timing(name: str, seconds: float, description: str | None = None) -> None:
+    """Add time to a stage of the current request, if its timings are being collected."""
+    timing = _current_timing.get()
+    if timing is not None:
+        timing.add(name, seconds, description)
+
+
+def record_timings(timing: ServerTiming) -> None:
+    """Add timings collected elsewhere (e.g. by a shared search) to the current request."""
+    for name, entry in timing.entries.items():
+        record_timing(name, entry.duration_ms / 1000, entry.description)
@@ -0,0 +1,469 @@
+"""
+State shared between the worker processes of one server.
+
+With several uvicorn workers, each process has its own memory, so without
+help every worker would search the indexers, probe instances and cache
+results on its own. SharedState keeps the state that must be shared in a
+local SQLite file (SHARED_STATE_PATH):
+
+- instance results: each instance's results for a query, so a search one
+  worker ran is answered from the store by the others
+- leases: a worker about to search an instance takes a lease on the query;
+  workers that want the same results meanwhile wait for them instead of
+  searching too (cross-process single-flight), and one worker at a time
+  leads the background health probes
+- health: the latest status of every instance and client
+- invalidations: configuration changes, which every worker polls for and
+  applies to its own caches
+
+Values are stored as JSON, so a tampered file cannot run code. The file and
+its directory must belong to the server's user and not be writable by anyone
+else (checked on open).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import stat
+import threading
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from app.config import settings
+from app.schemas.search import SearchCategory
+from app.services.metrics import get_metrics
+from app.services.search_record import SearchRecord, SearchRecordSource
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks for the results of a search another worker is running
+FLIGHT_POLL_SECONDS = 0.05
+
+# A lease on a search outlives the slowest search (a crashed owner's lease expires)
+SEARCH_LEASE_SECONDS = 120.0
+
+# Results of a search are kept at least this long, so waiting workers can read them
+MIN_RESULT_SECONDS = 5.0
+
+# Expired results and old invalidations are purged every this many writes
+PURGE_EVERY = 64
+
+# Invalidations are kept this long (workers are never further behind than this)
+INVALIDATION_RETENTION_SECONDS = 3600.0
+
+# Position of the only non-JSON field of a SearchRecord
+_DATE_FIELD = SearchRecord._fields.index("date")
+
+# Targets are identified by ("jackett" | "prowlarr" | "client", id)
+TargetKey = tuple[str, int]
+
+# Applies another worker's configuration change to this worker's caches
+InvalidationHandler = Callable[[str, int], None]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS instance_results (
+    key TEXT PRIMARY KEY,
+    source_type TEXT NOT NULL,
+    instance_id INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    results TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS instance_results_expiry ON instance_results (expires_at);
+CREATE INDEX IF NOT EXISTS instance_results_instance
+    ON instance_results (source_type, instance_id);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS health (
+    target_type TEXT NOT NULL,
+    target_id INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    PRIMARY KEY (target_type, target_id)
+);
+CREATE TABLE IF NOT EXISTS invalidations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    origin TEXT NOT NULL,
+    target_type TEXT NOT NULL,
+    target_id INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+def check_private(path: Path) -> None:
+    """
+    Make sure no other user can write the shared state (or swap it).
+
+    Raises:
+        PermissionError: If the file or its directory belongs to another user,
+            or the directory is writable by group or others
+    """
+    directory = path.parent.stat()
+    if directory.st_uid != os.getuid() or directory.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(
+            f"Shared state directory {path.parent} must belong to this user "
+            "and not be writable by others"
+        )
+    if path.stat().st_uid != os.getuid():
+        raise PermissionError(f"Shared state {path} belongs to another user")
+    path.chmod(0o600)
+
+
+def encode_records(records: list[SearchRecord]) -> str:
+    """Serialize search records as JSON rows (sources become nested rows)."""
+    rows = []
+    for record in records:
+        row: list[Any] = list(record)
+        row[_DATE_FIELD] = record.date.isoformat() if record.date is not None else None
+        rows.append(row)
+    return json.dumps(rows)
+
+
+def decode_records(text: str) -> list[SearchRecord]:
+    """Rebuild search records from encode_records() output."""
+    records = []
+    for row in json.loads(text):
+        record = SearchRecord(*row)
+        records.append(
+            record._replace(
+                date=datetime.fromisoformat(row[_DATE_FIELD]) if row[_DATE_FIELD] else None,
+                sources=(
+                    tuple(SearchRecordSource(*source) for source in record.sources)
+                    if record.sources is not None
+                    else None
+                ),
+            )
+        )
+    return records
+
+
+def shared_search_key(
+    query: str, category: SearchCategory, source_type: str, instance_id: int
+) -> str:
+    """Store key of one instance's results for a query (queries are normalized)."""
+    normalized = " ".join(query.split()).casefold()
+    return f"{source_type}:{instance_id}:{category.value}:{normalized}"
+
+
+class SharedState:
+    """
+    SQLite-backed state shared by the worker processes of one server.
+
+    Each thread uses its own connection; blocking calls run in worker threads
+    so the event loop is never held up by the file.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        result_ttl_seconds: float = settings.SEARCH_CACHE_TTL_SECONDS,
+        max_results_entries: int = settings.SHARED_STATE_MAX_ENTRIES,
+        poll_seconds: float = settings.SHARED_STATE_POLL_SECONDS,
+    ) -> None:
+        """
+        Initialize the shared state.
+
+        Args:
+            path: SQLite file (created if missing)
+            result_ttl_seconds: Seconds instance results are shared (0 only
+                shares them with workers waiting on the same search)
+            max_results_entries: Maximum number of instance result sets kept
+            poll_seconds: Seconds between checks for other workers' configuration changes
+        """
+        self.path = Path(path)
+        self.result_ttl_seconds = result_ttl_seconds
+        self.max_results_entries = max_results_entries
+        self.poll_seconds = poll_seconds
+        # Identifies this worker's leases and invalidations
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._local = threading.local()
+        self._writes = 0
+        self._listener: asyncio.Task[None] | None = None
+
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self.path.touch(mode=0o600, exist_ok=True)
+        # SQLite creates the -wal and -shm files with the database file's permissions
+        check_private(self.path)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+        # Latest invalidation this worker has applied
+        self.generation = self._generation()
+
+    # -- Instance results and cross-process single-flight ---------------------
+
+    async def coalesce(
+        self,
+        key: str,
+        source_type: str,
+        instance: tuple[int, str],
+        search: Callable[[], Awaitable[tuple[list[SearchRecord], str | None]]],
+    ) -> tuple[list[SearchRecord], str | None]:
+        """
+        Get an instance's results for a query, searching it only if no worker has.
+
+        Shared results are returned if present. Otherwise this worker takes the
+        query's lease and searches, or, if another worker holds the lease, waits
+        for that worker's results. Failed searches are not shared; a worker
+        waiting on one searches itself.
+
+        Args:
+            key: Store key (see shared_search_key())
+            source_type: "jackett" or "prowlarr"
+            instance: Instance ID and name
+            search: Searches the instance, returning (results, error)
+
+        Returns:
+            The results and error, as returned by search()
+        """
+        instance_id, name = instance
+        counter = get_metrics().shared_searches
+        # Captured before searching: results of a configuration that changed
+        # meanwhile are not stored (see put_results)
+        generation = self.generation
+        waited = False
+
+        while True:
+            if self.result_ttl_seconds > 0 or waited:
+                results = await asyncio.to_thread(self._get_results, key)
+                if results is not None:
+                    counter.inc(source_type, name, "waited" if waited else "hit")
+                    return results, None
+
+            if await asyncio.to_thread(self._acquire, key, SEARCH_LEASE_SECONDS):
+                break
+            waited = True
+            await asyncio.sleep(FLIGHT_POLL_SECONDS)
+
+        counter.inc(source_type, name, "searched")
+        try:
+            results, error = await search()
+            if error is None:
+                await asyncio.to_thread(
+                    self._put_results, key, source_type, instance_id, results, generation
+                )
+            return results, error
+        finally:
+            await asyncio.to_thread(self._release, key)
+
+    def _get_results(self, key: str) -> list[SearchRecord] | None:
+        """Read live results for a key."""
+        row = (
+            self._connect()
+            .execute(
+                "SELECT results FROM instance_results WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return decode_records(row[0]) if row is not None else None
+
+    def _put_results(
+        self,
+        key: str,
+        source_type: str,
+        instance_id: int,
+        results: list[SearchRecord],
+        generation: int,
+    ) -> None:
+        """Store results, unless the configuration changed since `generation`."""
+        blob = encode_records(results)
+        expires_at = time.time() + max(self.result_ttl_seconds, MIN_RESULT_SECONDS)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO instance_results
+                SELECT ?, ?, ?, ?, ?
+                WHERE (SELECT COALESCE(MAX(id), 0) FROM invalidations) <= ?
+                """,
+                (key, source_type, instance_id, expires_at, blob, generation),
+            )
+            self._writes += 1
+            if self._writes % PURGE_EVERY == 0:
+                self._purge(conn)
+
+    def _purge(self, conn: sqlite3.Connection) -> None:
+        """Drop expired results (and the oldest beyond the limit) and old invalidations."""
+        now = time.time()
+        conn.execute("DELETE FROM instance_results WHERE expires_at <= ?", (now,))
+        conn.execute(
+            """
+            DELETE FROM instance_results WHERE key IN (
+                SELECT key FROM instance_results ORDER BY expires_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_results_entries,),
+        )
+        conn.execute(
+            "DELETE FROM invalidations WHERE created_at < ?",
+            (now - INVALIDATION_RETENTION_SECONDS,),
+        )
+        conn.execute("DELETE FROM leases WHERE expires_at <= ?", (now,))
+
+    # -- Leases ---------------------------------------------------------------
+
+    async def acquire_lease(self, name: str, ttl_seconds: float) -> bool:
+        """
+        Take or renew a named lease.
+
+        Returns:
+            True if this worker holds the lease for the next `ttl_seconds`
+        """
+        return await asyncio.to_thread(self._acquire, name, ttl_seconds)
+
+    async def release_lease(self, name: str) -> None:
+        """Give up a lease this worker holds."""
+        await asyncio.to_thread(self._release, name)
+
+    def _acquire(self, name: str, ttl_seconds: float) -> bool:
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT (name) DO UPDATE
+                SET owner = excluded.owner, expires_at = excluded.expires_at
+                WHERE leases.owner = excluded.owner OR leases.expires_at <= ?
+                """,
+                (name, self.owner, now + ttl_seconds, now),
+            )
+            return cursor.rowcount == 1
+
+    def _release(self, name: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, self.owner))
+
+    # -- Health status --------------------------------------------------------
+
+    async def put_health(self, target: TargetKey, status: dict[str, Any]) -> None:
+        """Store the latest status of an instance or client (JSON-serializable)."""
+        blob = json.dumps(status)
+        await asyncio.to_thread(
+            self._execute, "INSERT OR REPLACE INTO health VALUES (?, ?, ?)", (*target, blob)
+        )
+
+    async def get_health(self) -> dict[TargetKey, dict[str, Any]]:
+        """Get the latest status of every instance and client."""
+        rows = await asyncio.to_thread(
+            self._fetchall, "SELECT target_type, target_id, status FROM health", ()
+        )
+        return {(target_type, target_id): json.loads(blob) for target_type, target_id, blob in rows}
+
+    # -- Invalidations ----------------------------------------------------------
+
+    async def publish_invalidation(self, target_type: str, target_id: int) -> None:
+        """
+        Tell every worker an instance or client changed.
+
+        Shared results and status of the target are dropped right away; other
+        workers apply the change to their own caches within `poll_seconds`.
+        """
+        await asyncio.to_thread(self._publish, target_type, target_id)
+
+    def _publish(self, target_type: str, target_id: int) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO invalidations (origin, target_type, target_id, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (self.owner, target_type, target_id, time.time()),
+            )
+            self._drop(conn, target_type, target_id)
+
+    async def drop_target(self, target_type: str, target_id: int) -> None:
+        """
+        Drop the shared results and status of an instance or client.
+
+        Unlike publish_invalidation(), other workers are not told: for changes
+        every worker learns about by itself (e.g. from another replica).
+        """
+        await asyncio.to_thread(self._drop_target, target_type, target_id)
+
+    def _drop_target(self, target_type: str, target_id: int) -> None:
+        with self._connect() as conn:
+            self._drop(conn, target_type, target_id)
+
+    @staticmethod
+    def _drop(conn: sqlite3.Connection, target_type: str, target_id: int) -> None:
+        conn.execute(
+            "DELETE FROM instance_results WHERE source_type = ? AND instance_id = ?",
+            (target_type, target_id),
+        )
+        conn.execute(
+            "DELETE FROM health WHERE target_type = ? AND target_id = ?",
+            (target_type, target_id),
+        )
+
+    def start(self, handler: InvalidationHandler) -> None:
+        """Start applying other workers' invalidations with `handler`."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen(handler), name="shared-state")
+
+    async def stop(self) -> None:
+        """Stop listening for invalidations."""
+        if self._listener is None:
+            return
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        self._listener = None
+
+    async def apply_invalidations(self, handler: InvalidationHandler) -> None:
+        """Apply the invalidations other workers published since the last call."""
+        rows = await asyncio.to_thread(
+            self._fetchall,
+            "SELECT id, origin, target_type, target_id FROM invalidations WHERE id > ? ORDER BY id",
+            (self.generation,),
+        )
+        for event_id, origin, target_type, target_id in rows:
+            if origin != self.owner:
+                handler(target_type, target_id)
+            self.generation = event_id
+
+    async def _listen(self, handler: InvalidationHandler) -> None:
+        while True:
+            try:
+                await self.apply_invalidations(handler)
+            except Exception:
+                logger.exception("Failed to read invalidations from the shared state")
+            await asyncio.sleep(self.poll_seconds)
+
+    # -- Connections ----------------------------------------------------------
+
+    def _generation(self) -> int:
+        row = self._connect().execute("SELECT COALESCE(MAX(id), 0) FROM invalidations").fetchone()
+        return int(row[0])
+
+    def _execute(self, sql: str, parameters: tuple[Any, ...]) -> None:
+        with self._connect() as conn:
+            conn.execute(sql, parameters)
+
+    def _fetchall(self, sql: str, parameters: tuple[Any, ...]) -> list[Any]:
+        return self._connect().execute(sql, parameters).fetchall()
+
+    def _connect(self) -> sqlite3.Connection:
+        """This thread's connection (used as a context manager, commits a transaction)."""
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+
+@lru_cache
+def get_shared_state() -> SharedState | None:
+    """Get the state shared between workers (None when SHARED_STATE_PATH is not set)."""
+    if not settings.SHARED_STATE_PATH:
+        return None
+    return SharedState(settings.SHARED_STATE_PATH)
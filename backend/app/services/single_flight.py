@@ -0,0 +1,76 @@
+"""
+Single-flight coalescing for concurrent identical upstream calls.
+
+When several searches for the same thing are in flight at once, only the
+first one actually queries the indexer; the others wait for and share its
+result.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from functools import lru_cache
+from typing import Any
+
+
+class _Flight:
+    """One in-flight call and the number of callers waiting on it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task[Any]) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time; concurrent callers share its result.
+
+    The shared call keeps running while any caller still waits on it. If every
+    caller gives up (e.g. deadline or client disconnect), the call is cancelled.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no calls in flight."""
+        self._flights: dict[Hashable, _Flight] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() for a key, or join the call already in flight for that key.
+
+        Args:
+            key: Identifies equivalent calls
+            fn: Coroutine factory, only invoked if no call for the key is in flight
+
+        Returns:
+            The result of the shared call
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._discard(key, flight))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Nobody is interested in the result any more
+                flight.task.cancel()
+                self._discard(key, flight)
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def _discard(self, key: Hashable, flight: _Flight) -> None:
+        """Forget a finished or abandoned call, unless a newer one replaced it."""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+
+@lru_cache
+def get_search_flights() -> SingleFlight:
+    """Get or create the shared single-flight group for instance searches."""
+    return SingleFlight()
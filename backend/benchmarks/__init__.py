@@ -0,0 +1,5 @@
+"""
+Performance benchmarks.
+
+Run from the backend directory, e.g. `python -m benchmarks.torznab_parse`.
+"""
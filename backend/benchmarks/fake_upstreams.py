@@ -0,0 +1,313 @@
+"""
+Local stand-ins for Jackett, Prowlarr and qBittorrent.
+
+One ASGI app serves the Jackett Torznab search endpoint, the Prowlarr
+/api/v1/search endpoint and the qBittorrent /api/v2 endpoints Searcharr uses.
+Each fake Jackett/Prowlarr instance is a profile selected by its API key, with
+its own result count, payload size, latency distribution and failure rate, so
+one server stands in for any number of instances.
+
+Latency is log-normal: `latency_ms` is the median and `latency_sigma` the
+spread (0 for a fixed delay). The status endpoints used by health probes
+(Jackett caps and indexer list, Prowlarr system status and indexer list)
+answer at once and never fail, so a circuit opened by injected search failures
+closes again. GET /_stats returns the number of search requests each instance
+has received.
+
+Usage (standalone, e.g. for manual testing):
+    python -m benchmarks.fake_upstreams [--port 9800] [--jackett 2] [--prowlarr 2]
+        [--results 500] [--padding 0] [--latency-ms 100] [--latency-sigma 0.5]
+        [--failure-rate 0]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import socket
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from typing import NamedTuple
+
+import httpx
+import uvicorn
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route, Router
+from starlette.types import Receive, Scope, Send
+
+from benchmarks.fixtures import INDEXERS, make_prowlarr_results, make_torznab_feed
+
+JACKETT_SEARCH_PATH = "/api/v2.0/indexers/all/results/torznab/api"
+
+# Jackett capabilities (t=caps), enough for a connection check
+CAPS = b'<?xml version="1.0" encoding="UTF-8"?><caps><searching/></caps>'
+
+# Jackett responses are streamed in chunks of this size
+CHUNK_SIZE = 64 * 1024
+
+
+class UpstreamProfile(NamedTuple):
+    """Behaviour of one fake instance."""
+
+    results: int = 500
+    padding: int = 0
+    latency_ms: float = 100.0
+    latency_sigma: float = 0.5
+    failure_rate: float = 0.0
+    seed: int = 0
+
+
+def jackett_key(n: int) -> str:
+    """API key of the n-th fake Jackett instance."""
+    return f"jackett-{n}"
+
+
+def prowlarr_key(n: int) -> str:
+    """API key of the n-th fake Prowlarr instance."""
+    return f"prowlarr-{n}"
+
+
+class FakeUpstreams:
+    """ASGI app answering like Jackett, Prowlarr and qBittorrent."""
+
+    def __init__(
+        self,
+        indexers: dict[str, UpstreamProfile],
+        qbittorrent: UpstreamProfile | None = None,
+    ) -> None:
+        """
+        Initialize the fakes.
+
+        Args:
+            indexers: Jackett/Prowlarr profiles by API key
+            qbittorrent: Latency and failure rate of the qBittorrent endpoints
+        """
+        self.indexers = indexers
+        self.qbittorrent = qbittorrent or UpstreamProfile(latency_ms=5.0, latency_sigma=0.0)
+        self._rng = random.Random(0)
+        self._payloads: dict[str, bytes] = {}
+        self.requests: dict[str, int] = dict.fromkeys(indexers, 0)
+        self._router = Router(
+            routes=[
+                Route(JACKETT_SEARCH_PATH, self.jackett_search),
+                Route("/api/v2.0/indexers", self.jackett_indexers),
+                Route("/api/v1/search", self.prowlarr_search),
+                Route("/api/v1/system/status", self.prowlarr_status),
+                Route("/api/v1/indexer", self.prowlarr_indexers),
+                Route("/api/v2/auth/login", self.qbittorrent_login, methods=["POST"]),
+                Route("/api/v2/torrents/add", self.qbittorrent_add, methods=["POST"]),
+                Route("/api/v2/app/version", self.qbittorrent_version),
+                Route("/_stats", self.stats),
+            ]
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self._router(scope, receive, send)
+
+    async def jackett_search(self, request: Request) -> Response:
+        """Torznab search (API key in the `apikey` query parameter)."""
+        key = request.query_params.get("apikey", "")
+        profile = self.indexers.get(key)
+        if profile is None:
+            return Response("Invalid API key", status_code=401)
+        if request.query_params.get("t") == "caps":
+            return Response(CAPS, media_type="application/xml")
+        self.requests[key] += 1
+        if not await self._simulate(profile):
+            return Response("Internal server error", status_code=500)
+
+        body = self._payloads.get(key)
+        if body is None:
+            body = self._payloads[key] = make_torznab_feed(
+                profile.results, profile.seed, profile.padding
+            )
+        return StreamingResponse(_chunks(body), media_type="application/rss+xml")
+
+    async def prowlarr_search(self, request: Request) -> Response:
+        """Prowlarr search (API key in the X-Api-Key header)."""
+        key = request.headers.get("x-api-key", "")
+        profile = self.indexers.get(key)
+        if profile is None:
+            return Response("Invalid API key", status_code=401)
+        self.requests[key] += 1
+        if not await self._simulate(profile):
+            return Response("Internal server error", status_code=500)
+
+        body = self._payloads.get(key)
+        if body is None:
+            results = make_prowlarr_results(profile.results, profile.seed, profile.padding)
+            body = self._payloads[key] = json.dumps(results).encode()
+        return Response(body, media_type="application/json")
+
+    async def jackett_indexers(self, request: Request) -> Response:
+        """Jackett indexer list (used by status checks)."""
+        if request.query_params.get("apikey", "") not in self.indexers:
+            return Response("Invalid API key", status_code=401)
+        return JSONResponse([{"id": name.lower(), "configured": True} for name in INDEXERS])
+
+    async def prowlarr_status(self, request: Request) -> Response:
+        """Prowlarr system status (used by status checks)."""
+        if request.headers.get("x-api-key", "") not in self.indexers:
+            return Response("Invalid API key", status_code=401)
+        return JSONResponse({"appName": "Prowlarr", "version": "1.0.0"})
+
+    async def prowlarr_indexers(self, request: Request) -> Response:
+        """Prowlarr indexer list (used by status checks)."""
+        if request.headers.get("x-api-key", "") not in self.indexers:
+            return Response("Invalid API key", status_code=401)
+        return JSONResponse([{"name": name, "enable": True} for name in INDEXERS])
+
+    async def qbittorrent_login(self, request: Request) -> Response:
+        """qBittorrent login: any credentials are accepted."""
+        if not await self._simulate(self.qbittorrent):
+            return Response("Internal server error", status_code=500)
+        response = Response("Ok.", media_type="text/plain")
+        response.set_cookie("SID", "fake-session")
+        return response
+
+    async def qbittorrent_add(self, request: Request) -> Response:
+        """qBittorrent add torrent."""
+        if not await self._simulate(self.qbittorrent):
+            return Response("Internal server error", status_code=500)
+        if request.cookies.get("SID") != "fake-session":
+            return Response("Forbidden", status_code=403)
+        return Response("Ok.", media_type="text/plain")
+
+    async def qbittorrent_version(self, request: Request) -> Response:
+        """qBittorrent version (used by connection tests)."""
+        return Response("v4.6.0", media_type="text/plain")
+
+    async def stats(self, request: Request) -> Response:
+        """Search requests received per instance (API key)."""
+        return JSONResponse({"requests": self.requests})
+
+    async def _simulate(self, profile: UpstreamProfile) -> bool:
+        """Wait out a sampled latency; return False if this request should fail."""
+        delay = profile.latency_ms * self._rng.lognormvariate(0.0, profile.latency_sigma)
+        await asyncio.sleep(delay / 1000)
+        return self._rng.random() >= profile.failure_rate
+
+
+async def _chunks(body: bytes) -> AsyncIterator[bytes]:
+    """Yield a body in CHUNK_SIZE pieces."""
+    for start in range(0, len(body), CHUNK_SIZE):
+        yield body[start : start + CHUNK_SIZE]
+
+
+def make_indexers(
+    jackett: int, prowlarr: int, profile: UpstreamProfile
+) -> dict[str, UpstreamProfile]:
+    """Profiles for `jackett` + `prowlarr` instances, each with its own payload."""
+    indexers = {}
+    for n in range(jackett):
+        indexers[jackett_key(n)] = profile._replace(seed=profile.seed + n)
+    for n in range(prowlarr):
+        indexers[prowlarr_key(n)] = profile._replace(seed=profile.seed + jackett + n)
+    return indexers
+
+
+def serve(indexers: dict[str, UpstreamProfile], host: str, port: int) -> None:
+    """Run the fakes until interrupted."""
+    uvicorn.run(FakeUpstreams(indexers), host=host, port=port, log_level="warning")
+
+
+def free_port(host: str = "127.0.0.1") -> int:
+    """Pick a free TCP port."""
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return int(sock.getsockname()[1])
+
+
+@contextmanager
+def running_upstreams(
+    indexers: dict[str, UpstreamProfile], host: str = "127.0.0.1", port: int | None = None
+) -> Iterator[str]:
+    """
+    Serve the fakes from a child process while the block runs.
+
+    The child keeps the fakes' CPU time and memory out of the measured process.
+
+    Yields:
+        The fakes' base URL
+    """
+    port = port or free_port(host)
+    process = multiprocessing.get_context("spawn").Process(
+        target=serve, args=(indexers, host, port), daemon=True
+    )
+    process.start()
+    base_url = f"http://{host}:{port}"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                httpx.get(f"{base_url}/api/v2/app/version", timeout=1).raise_for_status()
+                break
+            except httpx.HTTPError:
+                if time.monotonic() > deadline or not process.is_alive():
+                    raise RuntimeError("Fake upstreams did not start") from None
+                time.sleep(0.1)
+        yield base_url
+    finally:
+        process.terminate()
+        process.join(timeout=10)
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options describing the fake instances."""
+    defaults = UpstreamProfile()
+    parser.add_argument("--jackett", type=int, default=2, help="Fake Jackett instances")
+    parser.add_argument("--prowlarr", type=int, default=2, help="Fake Prowlarr instances")
+    parser.add_argument(
+        "--results", type=int, default=defaults.results, help="Results per instance"
+    )
+    parser.add_argument(
+        "--padding", type=int, default=defaults.padding, help="Extra payload bytes per result"
+    )
+    parser.add_argument(
+        "--latency-ms", type=float, default=defaults.latency_ms, help="Median latency"
+    )
+    parser.add_argument(
+        "--latency-sigma",
+        type=float,
+        default=defaults.latency_sigma,
+        help="Log-normal latency spread (0 = fixed latency)",
+    )
+    parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=defaults.failure_rate,
+        help="Fraction of searches answered with HTTP 500",
+    )
+
+
+def indexers_from_args(args: argparse.Namespace) -> dict[str, UpstreamProfile]:
+    """Instance profiles from the options added by add_profile_arguments()."""
+    profile = UpstreamProfile(
+        results=args.results,
+        padding=args.padding,
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        failure_rate=args.failure_rate,
+    )
+    return make_indexers(args.jackett, args.prowlarr, profile)
+
+
+def main() -> None:
+    """Serve the fakes in the foreground."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=9800, help="Port to listen on")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    indexers = indexers_from_args(args)
+    print(f"Fake upstreams on http://{args.host}:{args.port}")
+    print(f"API keys: {', '.join(indexers)} (any qBittorrent credentials)")
+    serve(indexers, args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Synthetic upstream payloads for benchmarks.
+"""
+
+import random
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from app.services.search_record import SearchRecord
+
+TORZNAB_NS = "http://torznab.com/schemas/2015/feed"
+
+INDEXERS = ["1337x", "RARBG", "The Pirate Bay", "TorrentGalaxy", "LimeTorrents", "YTS"]
+CATEGORIES = ["2000", "5000", "3000", "4000", "1000", "7000"]
+
+
+def make_torznab_feed(count: int, seed: int = 0, padding: int = 0) -> bytes:
+    """
+    Build a Jackett-style Torznab feed with `count` items.
+
+    Args:
+        count: Number of <item> elements
+        seed: Random seed, so runs are reproducible
+        padding: Extra bytes of <description> text per item (bigger payloads)
+
+    Returns:
+        The UTF-8 encoded XML document
+    """
+    rng = random.Random(seed)
+    description = f"<description>{'x' * padding}</description>" if padding else ""
+    items = []
+    for n in range(count):
+        seeders = rng.randint(0, 5000)
+        size = rng.randint(10**6, 5 * 10**10)
+        indexer = rng.choice(INDEXERS)
+        items.append(
+            "<item>"
+            f"<title>Some.Release.{n}.2024.1080p.WEB-DL.x264-GROUP</title>"
+            f"<guid>https://tracker.example/details/{n}</guid>"
+            f'<jackettindexer id="{indexer.lower()}">{indexer}</jackettindexer>'
+            f"<comments>https://tracker.example/details/{n}</comments>"
+            f"{description}"
+            f"<link>http://jackett.example/dl/{n}.torrent?jackett_apikey=abc</link>"
+            f"<pubDate>Thu, {rng.randint(1, 28):02d} Apr 2024 12:{n % 60:02d}:00 +0000</pubDate>"
+            f"<size>{size}</size>"
+            f"<category>{rng.choice(CATEGORIES)}</category>"
+            f'<torznab:attr name="category" value="{rng.choice(CATEGORIES)}" />'
+            f'<torznab:attr name="seeders" value="{seeders}" />'
+            f'<torznab:attr name="peers" value="{seeders + rng.randint(0, 500)}" />'
+            f'<torznab:attr name="infohash" value="{n:040x}" />'
+            f'<torznab:attr name="magneturl" value="magnet:?xt=urn:btih:{n:040x}" />'
+            f'<torznab:attr name="downloadvolumefactor" value="1" />'
+            f'<torznab:attr name="uploadvolumefactor" value="1" />'
+            "</item>"
+        )
+
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<rss version="2.0" xmlns:torznab="{TORZNAB_NS}">'
+        "<channel><title>AggregateSearch</title>" + "".join(items) + "</channel></rss>"
+    ).encode()
+
+
+def make_prowlarr_results(count: int, seed: int = 0, padding: int = 0) -> list[dict[str, Any]]:
+    """
+    Build a Prowlarr-style search response with `count` releases.
+
+    Args:
+        count: Number of releases
+        seed: Random seed, so runs are reproducible
+        padding: Extra bytes of description text per release (bigger payloads)
+
+    Returns:
+        The decoded JSON body of GET /api/v1/search
+    """
+    rng = random.Random(seed)
+    epoch = datetime(2024, 1, 1, tzinfo=UTC)
+    results = []
+    for n in range(count):
+        seeders = rng.randint(0, 5000)
+        item: dict[str, Any] = {
+            "guid": f"https://tracker.example/details/{n}",
+            "title": f"Some.Release.{n}.2024.1080p.WEB-DL.x264-GROUP",
+            "indexer": rng.choice(INDEXERS),
+            "size": rng.randint(10**6, 5 * 10**10),
+            "seeders": seeders,
+            "leechers": rng.randint(0, 500),
+            "publishDate": (epoch + timedelta(minutes=rng.randint(0, 500_000))).isoformat(),
+            "categories": [{"id": 2000, "name": "Movies"}],
+            "downloadUrl": f"http://prowlarr.example/dl/{n}.torrent?apikey=abc",
+            "magnetUrl": f"magnet:?xt=urn:btih:{n:040x}",
+            "infoHash": f"{n:040x}",
+            "infoUrl": f"https://tracker.example/details/{n}",
+        }
+        if padding:
+            item["description"] = "x" * padding
+        results.append(item)
+    return results
+
+
+def make_search_results(count: int, seed: int = 0) -> list[SearchRecord]:
+    """
+    Build `count` parsed search results with realistic value spreads.
+
+    Args:
+        count: Number of results
+        seed: Random seed, so runs are reproducible
+
+    Returns:
+        Results as they come out of the Jackett/Prowlarr services
+    """
+    rng = random.Random(seed)
+    epoch = datetime(2024, 1, 1, tzinfo=UTC)
+    results = []
+    for n in range(count):
+        size = rng.randint(10**6, 5 * 10**10)
+        results.append(
+            SearchRecord(
+                id=f"{n:012x}",
+                title=f"Some.Release.{rng.randint(0, count)}.2024.1080p.WEB-DL-{n}",
+                source="Jackett",
+                source_type="jackett",
+                indexer=rng.choice(INDEXERS),
+                size=size,
+                size_formatted=f"{size} B",
+                seeders=int(rng.paretovariate(1.2)) - 1,
+                leechers=rng.randint(0, 100),
+                date=epoch + timedelta(minutes=rng.randint(0, 500_000)) if n % 10 else None,
+                category="Movies",
+                magnet_link=f"magnet:?xt=urn:btih:{n:040x}",
+                torrent_url=None,
+                info_url=None,
+            )
+        )
+    return results
@@ -0,0 +1,203 @@
+"""
+Benchmark parsing and aggregation against recorded instance responses.
+
+Reads a cassette directory written in capture mode (CASSETTE_RECORD_DIR) and
+runs two stages offline:
+
+- parse: every recorded Jackett/Prowlarr search body through the parsers
+- aggregator: the recorded searches through SearchAggregator.search, with one
+  instance per recorded Jackett/Prowlarr URL answered from the cassettes
+
+Payloads recorded from production instances keep their odd dates, large
+attribute sets and response sizes, so results are repeatable without
+contacting any tracker.
+
+Usage:
+    python -m benchmarks.replay CASSETTE_DIR [--rounds 5] [--requests 200]
+        [--concurrency 10] [--limit 50] [--latency-scale 0]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+import httpx
+from app.core.database import Base
+from app.models import JackettInstance, ProwlarrInstance
+from app.schemas.search import CATEGORY_MAPPINGS, SearchCategory
+from app.services import (
+    JackettService,
+    ProwlarrService,
+    SearchAggregator,
+    SearchResultCache,
+    encrypt_credential,
+    get_http_client_registry,
+)
+from app.services.cassettes import Cassette, load_cassettes, replay_transport
+from app.services.config_registry import ConfigRegistry
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks.search_suite import Outcome, report, run_load
+
+JACKETT_SEARCH_SUFFIX = "/indexers/all/results/torznab/api"
+PROWLARR_SEARCH_PATH = "/api/v1/search"
+
+_CATEGORIES = {frozenset(ids): category for category, ids in CATEGORY_MAPPINGS.items() if ids}
+
+
+class RecordedSearch(NamedTuple):
+    """A search request found in the cassettes."""
+
+    source_type: str
+    base_url: str
+    query: str
+    category: SearchCategory
+    cassette: Cassette
+
+
+def recorded_searches(cassettes: dict[str, Cassette]) -> list[RecordedSearch]:
+    """The successful Jackett/Prowlarr searches among the cassettes."""
+    searches = []
+    for cassette in cassettes.values():
+        url = httpx.URL(cassette.url)
+        if cassette.status_code != 200:
+            continue
+        if url.path.endswith(JACKETT_SEARCH_SUFFIX) and url.params.get("t") == "search":
+            source_type, query = "jackett", url.params.get("q", "")
+            ids = url.params.get("cat", "").split(",") if "cat" in url.params else []
+            base_path = url.path[: url.path.index("/api/v2.0/")]
+        elif url.path.endswith(PROWLARR_SEARCH_PATH):
+            source_type, query = "prowlarr", url.params.get("query", "")
+            ids = url.params.get_list("categories")
+            base_path = url.path[: -len(PROWLARR_SEARCH_PATH)]
+        else:
+            continue
+        category = _CATEGORIES.get(frozenset(int(i) for i in ids), SearchCategory.ALL)
+        base_url = str(url.copy_with(path=base_path or "/", query=None)).rstrip("/")
+        searches.append(RecordedSearch(source_type, base_url, query, category, cassette))
+    return searches
+
+
+def decoded_body(cassette: Cassette) -> bytes:
+    """The cassette body with its content encoding removed."""
+    return httpx.Response(
+        cassette.status_code, headers=cassette.headers, content=cassette.body
+    ).content
+
+
+def bench_parse(searches: list[RecordedSearch], rounds: int) -> None:
+    """Print the best parse time over all recorded bodies of each instance type."""
+    jackett = JackettService("http://jackett.example", "apikey")
+    prowlarr = ProwlarrService("http://prowlarr.example", "apikey")
+    bodies: dict[str, list[bytes]] = {"jackett": [], "prowlarr": []}
+    for search in searches:
+        bodies[search.source_type].append(decoded_body(search.cassette))
+
+    print(f"{'parser':<10}{'bodies':>8}{'MiB':>9}{'items':>10}{'best ms':>10}{'items/s':>13}")
+    for source_type, payloads in bodies.items():
+        if not payloads:
+            continue
+        best = float("inf")
+        items = 0
+        for _ in range(rounds):
+            start = time.perf_counter()
+            if source_type == "jackett":
+                items = sum(len(jackett._parse_torznab_response(b, "Jackett")) for b in payloads)
+            else:
+                items = sum(
+                    len(prowlarr._parse_search_response(json.loads(b), "Prowlarr"))
+                    for b in payloads
+                )
+            best = min(best, time.perf_counter() - start)
+        size = sum(len(b) for b in payloads) / 2**20
+        print(
+            f"{source_type:<10}{len(payloads):>8}{size:>9.1f}{items:>10,}"
+            f"{best * 1000:>10.1f}{items / best:>13,.0f}"
+        )
+
+
+async def configure(
+    searches: list[RecordedSearch], db_path: Path
+) -> async_sessionmaker[AsyncSession]:
+    """Create one instance per recorded Jackett/Prowlarr URL."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    instances = sorted({(s.source_type, s.base_url) for s in searches})
+    async with session_factory() as session:
+        for n, (source_type, base_url) in enumerate(instances):
+            model = JackettInstance if source_type == "jackett" else ProwlarrInstance
+            # API keys are not recorded, and replay does not match on them
+            session.add(
+                model(name=f"{source_type}-{n}", url=base_url, api_key=encrypt_credential("replay"))
+            )
+        await session.commit()
+    return session_factory
+
+
+async def bench_aggregator(
+    args: argparse.Namespace, cassettes: dict[str, Cassette], searches: list[RecordedSearch]
+) -> None:
+    """Replay the recorded searches through the aggregator."""
+    with tempfile.TemporaryDirectory() as tmp:
+        session_factory = await configure(searches, Path(tmp) / "replay.db")
+        registry = get_http_client_registry()
+        registry.transport = replay_transport(cassettes, args.latency_scale)
+        aggregator = SearchAggregator(
+            registry=ConfigRegistry(session_factory), cache=SearchResultCache(ttl_seconds=0)
+        )
+        queries = sorted({(s.query, s.category) for s in searches})
+
+        async def search(n: int) -> Outcome:
+            query, category = queries[n % len(queries)]
+            outcome = await aggregator.search(query, category=category, limit=args.limit)
+            return "partial" if outcome.errors else "ok"
+
+        result = await run_load(search, "aggregator", args.requests, args.concurrency, warmup=1)
+        await registry.aclose()
+
+    print(
+        f"\n{len(queries)} recorded searches, {args.requests} requests, "
+        f"concurrency {args.concurrency}, latency scale {args.latency_scale:g}"
+    )
+    print(f"{'scenario':<11}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>10}{'RSS MiB':>10}")
+    print(report(result))
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("directory", type=Path, help="Cassette directory")
+    parser.add_argument("--rounds", type=int, default=5, help="Parse rounds (best is kept)")
+    parser.add_argument("--requests", type=int, default=200, help="Aggregated searches")
+    parser.add_argument("--concurrency", type=int, default=10, help="Searches in flight")
+    parser.add_argument("--limit", type=int, default=50, help="Page size of each search")
+    parser.add_argument(
+        "--latency-scale",
+        type=float,
+        default=0.0,
+        help="Multiplier for the recorded latency (0 = answer immediately)",
+    )
+    args = parser.parse_args()
+
+    # Request logs would dominate the output
+    logging.getLogger().setLevel(logging.WARNING)
+
+    cassettes = load_cassettes(args.directory)
+    searches = recorded_searches(cassettes)
+    if not searches:
+        parser.error(f"No recorded Jackett/Prowlarr searches in {args.directory}")
+
+    bench_parse(searches, args.rounds)
+    asyncio.run(bench_aggregator(args, cassettes, searches))
+
+
+if __name__ == "__main__":
+    main()
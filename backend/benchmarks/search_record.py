@@ -0,0 +1,155 @@
+"""
+Benchmark the internal SearchRecord against validated SearchResult models.
+
+Builds the same parsed results both ways, then runs the aggregation pipeline
+(filter, sort, serialize the response) on each: models through the response
+schema, records the way the search endpoints do it (to_dict() encoded by
+pydantic-core). Memory is the tracemalloc size of the parsed result list;
+times are the best of several rounds.
+
+Usage:
+    python -m benchmarks.search_record [--results 20000] [--limit 50] [--rounds 5]
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from app.schemas.search import SearchCategory, SearchResponse, SearchResult
+from app.services.search_record import SearchRecord
+from pydantic_core import to_json
+
+from benchmarks.fixtures import make_search_results
+
+
+def best_time(rounds: int, fn: Callable[[], Any]) -> float:
+    """Run fn `rounds` times and return the best time in seconds."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def allocated(fn: Callable[[], Any]) -> int:
+    """Bytes still allocated by fn's return value once it has returned."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        value = fn()
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del value
+    return size
+
+
+def respond(results: list[SearchResult]) -> bytes:
+    """Build and serialize a response through the response schema."""
+    return (
+        SearchResponse(
+            query="bench",
+            category=SearchCategory.ALL,
+            total_results=len(results),
+            results=results,
+            sources_queried=1,
+        )
+        .model_dump_json()
+        .encode()
+    )
+
+
+def respond_records(results: list[SearchRecord]) -> bytes:
+    """Serialize a response the way the search endpoint does."""
+    return to_json(
+        {
+            "query": "bench",
+            "category": SearchCategory.ALL,
+            "total_results": len(results),
+            "results": [result.to_dict() for result in results],
+            "sources_queried": 1,
+            "errors": [],
+            "partial": False,
+            "offset": 0,
+            "limit": None,
+            "timings": None,
+        }
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--results", type=int, default=20_000, help="Number of results")
+    parser.add_argument("--limit", type=int, default=50, help="Page size")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds per case (best is kept)")
+    args = parser.parse_args()
+
+    fields = [record._asdict() for record in make_search_results(args.results)]
+
+    def build_models() -> list[SearchResult]:
+        return [SearchResult(**item) for item in fields]
+
+    def build_records() -> list[SearchRecord]:
+        return [SearchRecord(**item) for item in fields]
+
+    models = build_models()
+    records = build_records()
+
+    def pipeline_models(limit: int | None) -> bytes:
+        kept = [r for r in models if r.seeders >= 1]
+        ordered = sorted(kept, key=lambda r: r.seeders, reverse=True)
+        return respond(ordered[:limit])
+
+    def pipeline_records(limit: int | None) -> bytes:
+        kept = [r for r in records if r.seeders >= 1]
+        ordered = sorted(kept, key=lambda r: r.seeders, reverse=True)
+        return respond_records(ordered[:limit])
+
+    expected = json.loads(pipeline_models(None))
+    assert json.loads(pipeline_records(None)) == expected, "responses differ"
+
+    print(f"{args.results:,} results")
+    print(f"{'':<26} {'SearchResult':>14} {'SearchRecord':>14} {'ratio':>7}")
+
+    def row(label: str, old: float, new: float, unit: str) -> None:
+        print(f"{label:<26} {old:11.2f} {unit} {new:11.2f} {unit} {old / new:6.1f}x")
+
+    row(
+        "memory (parsed list)",
+        allocated(build_models) / 2**20,
+        allocated(build_records) / 2**20,
+        "MB",
+    )
+    row(
+        "build",
+        best_time(args.rounds, build_models) * 1000,
+        best_time(args.rounds, build_records) * 1000,
+        "ms",
+    )
+    row(
+        f"filter+sort+page of {args.limit}",
+        best_time(args.rounds, lambda: pipeline_models(args.limit)) * 1000,
+        best_time(args.rounds, lambda: pipeline_records(args.limit)) * 1000,
+        "ms",
+    )
+    row(
+        "filter+sort+all",
+        best_time(args.rounds, lambda: pipeline_models(None)) * 1000,
+        best_time(args.rounds, lambda: pipeline_records(None)) * 1000,
+        "ms",
+    )
+    row(
+        "build+filter+sort+all",
+        best_time(args.rounds, lambda: (build_models(), pipeline_models(None))) * 1000,
+        best_time(args.rounds, lambda: (build_records(), pipeline_records(None))) * 1000,
+        "ms",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark serializing a large search response.
+
+Compares the generic FastAPI path (build a SearchResponse, validate it against
+the response model, serialize it to Python objects, then json.dumps through
+JSONResponse) with the search endpoint's direct path (record dicts encoded to
+bytes by pydantic-core).
+
+Usage:
+    python -m benchmarks.search_response [--results 20000] [--rounds 5]
+"""
+
+import argparse
+import json
+
+from app.schemas.search import SearchCategory, SearchResponse
+from app.services.search_record import SearchRecord
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+from benchmarks.fixtures import make_search_results
+from benchmarks.search_record import best_time
+
+
+def fastapi_body(records: list[SearchRecord], adapter: TypeAdapter[SearchResponse]) -> bytes:
+    """Render the response the way FastAPI does for a response_model endpoint."""
+    response = SearchResponse(
+        query="bench",
+        category=SearchCategory.ALL,
+        total_results=len(records),
+        results=[record.to_schema() for record in records],
+        sources_queried=1,
+    )
+    value = adapter.validate_python(response)
+    return bytes(JSONResponse(adapter.dump_python(value, mode="json")).body)
+
+
+def direct_body(records: list[SearchRecord]) -> bytes:
+    """Render the response the way the search endpoint does."""
+    return to_json(
+        {
+            "query": "bench",
+            "category": SearchCategory.ALL,
+            "total_results": len(records),
+            "results": [record.to_dict() for record in records],
+            "sources_queried": 1,
+            "errors": [],
+            "partial": False,
+            "offset": 0,
+            "limit": None,
+            "timings": None,
+        }
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--results", type=int, default=20_000, help="Number of results")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds per case (best is kept)")
+    args = parser.parse_args()
+
+    records = make_search_results(args.results)
+    adapter = TypeAdapter(SearchResponse)
+
+    before = fastapi_body(records, adapter)
+    after = direct_body(records)
+    assert json.loads(before) == json.loads(after), "response bodies differ"
+
+    before_time = best_time(args.rounds, lambda: fastapi_body(records, adapter))
+    after_time = best_time(args.rounds, lambda: direct_body(records))
+
+    print(f"{args.results:,} results, {len(after) / 2**20:.1f} MB response")
+    print(f"response_model + JSONResponse {before_time * 1000:9.2f} ms")
+    print(f"pydantic-core to_json         {after_time * 1000:9.2f} ms")
+    print(f"speedup                       {before_time / after_time:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+End-to-end search benchmark against local fake Jackett, Prowlarr and qBittorrent.
+
+Starts the fakes from benchmarks.fake_upstreams in a child process, points
+instances and a download client at them in a throwaway SQLite database, then
+drives load through each scenario:
+
+- aggregator: SearchAggregator.search, without the HTTP layer
+- route: GET /api/v1/search through the full ASGI app (middleware, serialization)
+- download: POST /api/v1/download, handing a magnet link to the fake qBittorrent
+
+Every search uses a distinct query, so the result cache never answers.
+Reports p50/p95/p99 latency, throughput and the process's peak RSS (which
+only grows, so each scenario shows the peak so far).
+
+Usage:
+    python -m benchmarks.search_suite [--scenario all] [--requests 200] [--concurrency 10]
+        [--limit 50] [--jackett 2] [--prowlarr 2] [--results 500] [--padding 0]
+        [--latency-ms 100] [--latency-sigma 0.5] [--failure-rate 0]
+"""
+
+import argparse
+import asyncio
+import logging
+import resource
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import NamedTuple
+
+import httpx
+from app.core.database import Base
+from app.main import app
+from app.models import ClientType, DownloadClient, JackettInstance, ProwlarrInstance
+from app.services import (
+    CircuitBreaker,
+    SearchAggregator,
+    SearchResultCache,
+    encrypt_credential,
+    get_circuit_breaker,
+    get_config_registry,
+    get_http_client_registry,
+)
+from app.services.config_registry import ConfigRegistry
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks.fake_upstreams import (
+    UpstreamProfile,
+    add_profile_arguments,
+    indexers_from_args,
+    running_upstreams,
+)
+
+SCENARIOS = ("aggregator", "route", "download")
+
+# A request reports ok, partial (some instances failed) or failed
+Outcome = str
+
+
+class LoadResult(NamedTuple):
+    """Measurements of one scenario."""
+
+    scenario: str
+    latencies: list[float]
+    outcomes: dict[Outcome, int]
+    elapsed: float
+
+
+async def run_load(
+    call: Callable[[int], Awaitable[Outcome]],
+    scenario: str,
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> LoadResult:
+    """
+    Issue `requests` calls from `concurrency` concurrent workers.
+
+    Args:
+        call: Makes request n and returns its outcome
+        scenario: Scenario name for the report
+        requests: Number of measured requests
+        concurrency: Number of requests in flight at once
+        warmup: Unmeasured requests sent first (connection setup, lazy loading)
+    """
+    for n in range(warmup):
+        await call(-1 - n)
+
+    latencies: list[float] = []
+    outcomes: dict[Outcome, int] = {}
+    next_request = iter(range(requests))
+
+    async def worker() -> None:
+        for n in next_request:
+            start = time.perf_counter()
+            try:
+                outcome = await call(n)
+            except Exception:
+                outcome = "failed"
+            latencies.append(time.perf_counter() - start)
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return LoadResult(scenario, latencies, outcomes, time.perf_counter() - start)
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of a sorted list."""
+    if not ordered:
+        return float("nan")
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def report(result: LoadResult) -> str:
+    """One table row for a scenario."""
+    ordered = sorted(result.latencies)
+    outcomes = ", ".join(f"{n} {outcome}" for outcome, n in sorted(result.outcomes.items()))
+    return (
+        f"{result.scenario:<11}"
+        f"{percentile(ordered, 50) * 1000:>9.1f}"
+        f"{percentile(ordered, 95) * 1000:>9.1f}"
+        f"{percentile(ordered, 99) * 1000:>9.1f}"
+        f"{len(ordered) / result.elapsed:>10.1f}"
+        f"{peak_rss_mb():>10.1f}   {outcomes}"
+    )
+
+
+async def configure(
+    base_url: str, indexers: dict[str, UpstreamProfile], db_path: Path
+) -> async_sessionmaker[AsyncSession]:
+    """Create instances and a download client pointing at the fakes."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as session:
+        for key in indexers:
+            model = JackettInstance if key.startswith("jackett") else ProwlarrInstance
+            session.add(model(name=key, url=base_url, api_key=encrypt_credential(key)))
+        session.add(
+            DownloadClient(
+                name="qbittorrent",
+                client_type=ClientType.QBITTORRENT,
+                url=base_url,
+                username=encrypt_credential("admin"),
+                password=encrypt_credential("adminadmin"),
+            )
+        )
+        await session.commit()
+    return session_factory
+
+
+async def run(args: argparse.Namespace, base_url: str, db_path: Path) -> list[LoadResult]:
+    """Run the selected scenarios."""
+    session_factory = await configure(base_url, indexers_from_args(args), db_path)
+
+    # The app reads configuration through the shared registry
+    registry = get_config_registry()
+    registry.session_factory = session_factory
+    await registry.load()
+
+    # Injected failures must not open circuits: skipped instances would answer in no
+    # time, so the numbers would measure the breaker instead of the upstreams
+    get_circuit_breaker().failure_threshold = 0
+    aggregator = SearchAggregator(
+        registry=ConfigRegistry(session_factory),
+        cache=SearchResultCache(ttl_seconds=0),
+        breaker=CircuitBreaker(failure_threshold=0),
+    )
+    scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+    results = []
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://searcharr", timeout=None
+    ) as client:
+
+        async def aggregator_search(n: int) -> Outcome:
+            outcome = await aggregator.search(f"aggregator {n}", limit=args.limit)
+            return "partial" if outcome.errors else "ok"
+
+        async def route_search(n: int) -> Outcome:
+            response = await client.get(
+                "/api/v1/search", params={"q": f"route {n}", "limit": args.limit}
+            )
+            if response.status_code != 200:
+                return "failed"
+            return "partial" if response.json()["errors"] else "ok"
+
+        async def download(n: int) -> Outcome:
+            response = await client.post(
+                "/api/v1/download",
+                json={"client_id": 1, "magnet_link": f"magnet:?xt=urn:btih:{n % 2**32:040x}"},
+            )
+            return "ok" if response.status_code == 200 else "failed"
+
+        calls = {"aggregator": aggregator_search, "route": route_search, "download": download}
+        for scenario in scenarios:
+            results.append(
+                await run_load(
+                    calls[scenario], scenario, args.requests, args.concurrency, args.warmup
+                )
+            )
+
+    await get_http_client_registry().aclose()
+    return results
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenario", choices=("all", *SCENARIOS), default="all")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests in flight")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests first")
+    parser.add_argument("--limit", type=int, default=50, help="Page size of each search")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    # Request logs would dominate the output
+    logging.getLogger().setLevel(logging.WARNING)
+
+    indexers = indexers_from_args(args)
+    with (
+        running_upstreams(indexers) as base_url,
+        tempfile.TemporaryDirectory() as tmp,
+    ):
+        results = asyncio.run(run(args, base_url, Path(tmp) / "bench.db"))
+
+    print(
+        f"{args.jackett} Jackett + {args.prowlarr} Prowlarr instances, "
+        f"{args.results} results each, median latency {args.latency_ms:g} ms "
+        f"(sigma {args.latency_sigma:g}), failure rate {args.failure_rate:g}; "
+        f"{args.requests} requests, concurrency {args.concurrency}"
+    )
+    print(f"{'scenario':<11}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>10}{'RSS MiB':>10}")
+    for result in results:
+        print(report(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark the work left after the slowest instance answers.
+
+Compares sorting every instance's results at the end with taking the first
+page from a merge of runs that were each sorted as their instance answered
+(the per-run sorts overlap with the network wait, so only the merge is on
+the critical path).
+
+Usage:
+    python -m benchmarks.sorted_runs [--results 50000] [--instances 5] [--limit 50]
+"""
+
+import argparse
+from collections.abc import Callable
+from typing import Any
+
+from app.schemas.search import SortBy
+from app.services.search_aggregator import SearchAggregator
+from app.services.search_cache import SearchView
+from app.services.search_record import SearchRecord
+
+from benchmarks.fixtures import make_search_results
+from benchmarks.topk_sort import best_of
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--results", type=int, default=50_000, help="Total number of results")
+    parser.add_argument("--instances", type=int, default=5, help="Number of instances")
+    parser.add_argument("--limit", type=int, default=50, help="Page size")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds per case (best is kept)")
+    args = parser.parse_args()
+
+    results = make_search_results(args.results)
+    runs = [results[i :: args.instances] for i in range(args.instances)]
+    print(f"{args.results:,} results from {args.instances} instances, descending")
+    print(f"{'sort_by':<10} {'sort all':>12} {'merge page':>12} {'speedup':>9}")
+
+    for sort_by in SortBy:
+        key = SearchAggregator._sort_key(sort_by)
+        sorted_runs = [sorted(run, key=key, reverse=True) for run in runs]
+        flat = [result for run in runs for result in run]
+
+        def sort_all(
+            key: Callable[[SearchRecord], Any] = key, flat: list[SearchRecord] = flat
+        ) -> list[SearchRecord]:
+            return sorted(flat, key=key, reverse=True)
+
+        def merge_page(
+            key: Callable[[SearchRecord], Any] = key,
+            sorted_runs: list[list[SearchRecord]] = sorted_runs,
+        ) -> list[SearchRecord]:
+            return SearchView.from_sorted_runs(sorted_runs, key=key, reverse=True).page(
+                0, args.limit
+            )
+
+        sort_time, expected = best_of(args.rounds, sort_all)
+        page_time, page = best_of(args.rounds, merge_page)
+        assert page == expected[: args.limit], f"merged page differs for {sort_by.value}"
+
+        print(
+            f"{sort_by.value:<10} {sort_time * 1000:9.2f} ms {page_time * 1000:9.2f} ms "
+            f"{sort_time / page_time:8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
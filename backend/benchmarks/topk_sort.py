@@ -0,0 +1,73 @@
+"""
+Benchmark top-K page selection against a full sort.
+
+For each sort field, compares the first page of a full sort with the first
+page selected by SearchView (heap-based top-K).
+
+Usage:
+    python -m benchmarks.topk_sort [--results 50000] [--limit 50] [--rounds 5]
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.schemas.search import SortBy, SortOrder
+from app.services.search_aggregator import SearchAggregator
+from app.services.search_cache import SearchView
+from app.services.search_record import SearchRecord
+
+from benchmarks.fixtures import make_search_results
+
+
+def best_of(rounds: int, fn: Callable[[], list[SearchRecord]]) -> tuple[float, list[SearchRecord]]:
+    """Run fn `rounds` times; return the best time in seconds and the last result."""
+    best = float("inf")
+    result: list[SearchRecord] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--results", type=int, default=50_000, help="Number of results")
+    parser.add_argument("--limit", type=int, default=50, help="Page size")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds per case (best is kept)")
+    args = parser.parse_args()
+
+    results = make_search_results(args.results)
+    order = SortOrder.DESC
+    print(f"{args.results:,} results, first page of {args.limit}, {order.value}")
+    print(f"{'sort_by':<10} {'full sort':>12} {'top-K':>12} {'speedup':>9}")
+
+    for sort_by in SortBy:
+        key = SearchAggregator._sort_key(sort_by)
+        reverse = order == SortOrder.DESC
+
+        def full_sort(
+            key: Callable[[SearchRecord], Any] = key, reverse: bool = reverse
+        ) -> list[SearchRecord]:
+            return sorted(results, key=key, reverse=reverse)[: args.limit]
+
+        def top_k(
+            key: Callable[[SearchRecord], Any] = key, reverse: bool = reverse
+        ) -> list[SearchRecord]:
+            return SearchView(results, key=key, reverse=reverse).page(0, args.limit)
+
+        full_time, full = best_of(args.rounds, full_sort)
+        topk_time, topk = best_of(args.rounds, top_k)
+        assert topk == full, f"top-K page differs from full sort for {sort_by.value}"
+
+        print(
+            f"{sort_by.value:<10} {full_time * 1000:9.2f} ms {topk_time * 1000:9.2f} ms "
+            f"{full_time / topk_time:8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
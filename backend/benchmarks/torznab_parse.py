@@ -0,0 +1,60 @@
+"""
+Microbenchmark for Jackett Torznab parsing.
+
+Measures items per second for parsing a complete response and for feeding it
+in network-sized chunks, which is what JackettService.search does.
+
+Usage:
+    python -m benchmarks.torznab_parse [--items 10000] [--rounds 5]
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+
+from app.services.jackett import JackettService, TorznabFeedParser
+
+from benchmarks.fixtures import make_torznab_feed
+
+CHUNK_SIZE = 64 * 1024
+
+
+def bench(label: str, items: int, rounds: int, fn: Callable[[], int]) -> None:
+    """Run fn `rounds` times and print the best items/second."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        parsed = fn()
+        best = min(best, time.perf_counter() - start)
+        assert parsed == items, f"{label}: parsed {parsed} of {items} items"
+
+    print(f"{label:<28} {best * 1000:8.1f} ms  {items / best:12,.0f} items/s")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--items", type=int, default=10_000, help="Items in the fixture")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds per case (best is kept)")
+    args = parser.parse_args()
+
+    body = make_torznab_feed(args.items)
+    service = JackettService("http://jackett.example", "apikey")
+    print(f"Torznab fixture: {args.items:,} items, {len(body) / 1024 / 1024:.1f} MiB")
+
+    def full() -> int:
+        return len(service._parse_torznab_response(body, instance_name="Jackett"))
+
+    def chunked() -> int:
+        feed = TorznabFeedParser(lambda item: service._parse_item(item, "Jackett"))
+        for start in range(0, len(body), CHUNK_SIZE):
+            feed.feed(body[start : start + CHUNK_SIZE])
+        feed.close()
+        return len(feed.results)
+
+    bench("full response", args.items, args.rounds, full)
+    bench(f"streamed ({CHUNK_SIZE // 1024} KiB chunks)", args.items, args.rounds, chunked)
+
+
+if __name__ == "__main__":
+    main()
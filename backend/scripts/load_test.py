@@ -0,0 +1,422 @@
+"""
+Load test a running Searcharr with a realistic mix of searches.
+
+Virtual users search concurrently, each picking its next request from a
+weighted mix:
+
+- popular: one of a small set of queries, Zipf-weighted (cache and coalescing hits)
+- longtail: a query nobody searched before (always reaches the instances)
+- resort: the user's last query with another sort order
+- filter: the user's last query with other filters
+- page: the next page of the user's last query
+
+Reports requests per second and latency percentiles per request kind. From the
+server's /api/metrics it reports the search cache hit rate, searches sent to
+each instance and the server's event loop lag. Each worker process keeps its
+own metrics, so with several workers the metrics are scraped repeatedly, on new
+connections, before and after the run, and each worker's increase is summed.
+Workers no scrape reached are missing from these numbers (raise
+--metrics-scrapes), and the report says how many workers it covers. With --upstreams pointing at
+the fake indexers (`python -m benchmarks.fake_upstreams`), it also reports the
+requests each fake indexer actually received, which shows how well caching
+and request coalescing hold up under contention.
+
+Usage:
+    python -m scripts.load_test [--url http://localhost:8000] [--users 20] [--duration 60]
+        [--think-ms 500] [--mix popular=45,longtail=20,resort=15,filter=15,page=5]
+        [--upstreams http://127.0.0.1:9800] [--metrics-scrapes 20]
+"""
+
+import argparse
+import asyncio
+import collections
+import random
+import re
+import time
+import uuid
+from typing import Any, NamedTuple
+
+import httpx
+
+POPULAR_QUERIES = [
+    "ubuntu",
+    "debian",
+    "fedora",
+    "linux mint",
+    "arch linux",
+    "big buck bunny",
+    "sintel",
+    "tears of steel",
+    "blender",
+    "libreoffice",
+    "gimp",
+    "inkscape",
+    "krita",
+    "godot",
+    "audacity",
+    "obs studio",
+    "kdenlive",
+    "vlc",
+    "freebsd",
+    "elephants dream",
+]
+
+SORTS = [("seeders", "desc"), ("size", "desc"), ("size", "asc"), ("date", "desc"), ("name", "asc")]
+
+FILTERS: list[dict[str, Any]] = [
+    {"min_seeders": 5},
+    {"min_seeders": 50},
+    {"max_size": "2GB"},
+    {"max_size": "10GB", "min_seeders": 1},
+]
+
+DEFAULT_MIX = "popular=45,longtail=20,resort=15,filter=15,page=5"
+
+# Samples of the load generator's own event loop lag above this mean it is saturated
+GENERATOR_LAG_WARNING = 0.05
+
+Metrics = dict[tuple[str, tuple[tuple[str, str], ...]], float]
+
+# Worker process -> its metrics
+WorkerMetrics = dict[str, Metrics]
+
+_SAMPLE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)")
+_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+class Sample(NamedTuple):
+    """One completed request."""
+
+    kind: str
+    latency: float
+    status: int
+
+
+class VirtualUser:
+    """Picks search requests the way one browsing user would."""
+
+    def __init__(self, rng: random.Random, mix: dict[str, float], limit: int) -> None:
+        self.rng = rng
+        self.kinds = list(mix)
+        self.weights = list(mix.values())
+        self.limit = limit
+        self.last: dict[str, Any] | None = None
+        # Zipf-like popularity: the k-th query is searched about 1/k as often as the first
+        self.popular_weights = [1 / (rank + 1) for rank in range(len(POPULAR_QUERIES))]
+
+    def next_request(self) -> tuple[str, dict[str, Any]]:
+        """Pick the next request kind and its query parameters."""
+        kind = self.rng.choices(self.kinds, self.weights)[0]
+        if kind in ("resort", "filter", "page") and self.last is None:
+            kind = "popular"
+
+        if kind == "popular":
+            query = self.rng.choices(POPULAR_QUERIES, self.popular_weights)[0]
+            params: dict[str, Any] = {"q": query, "limit": self.limit}
+        elif kind == "longtail":
+            params = {"q": f"release {uuid.uuid4().hex[:12]}", "limit": self.limit}
+        elif kind == "resort":
+            assert self.last is not None
+            sort_by, sort_order = self.rng.choice(SORTS)
+            params = {**self.last, "sort_by": sort_by, "sort_order": sort_order, "offset": 0}
+        elif kind == "filter":
+            assert self.last is not None
+            base = {k: v for k, v in self.last.items() if k not in ("min_seeders", "max_size")}
+            params = {**base, **self.rng.choice(FILTERS), "offset": 0}
+        else:
+            assert self.last is not None
+            params = {**self.last, "offset": self.last.get("offset", 0) + self.limit}
+
+        self.last = params
+        return kind, params
+
+
+async def run_user(
+    client: httpx.AsyncClient,
+    user: VirtualUser,
+    deadline: float,
+    think_seconds: float,
+    samples: list[Sample],
+) -> None:
+    """Search until the deadline, pausing between requests like a reader would."""
+    while time.monotonic() < deadline:
+        kind, params = user.next_request()
+        start = time.perf_counter()
+        try:
+            response = await client.get("/api/v1/search", params=params)
+            status = response.status_code
+        except httpx.HTTPError:
+            status = 0
+        samples.append(Sample(kind, time.perf_counter() - start, status))
+
+        if think_seconds > 0:
+            await asyncio.sleep(user.rng.expovariate(1 / think_seconds))
+
+
+async def sample_loop_lag(interval: float, lags: list[float]) -> None:
+    """Record this process's event loop lag (is the load generator keeping up?)."""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - started - interval))
+
+
+def parse_metrics(text: str) -> Metrics:
+    """Parse samples from the Prometheus text format."""
+    metrics: Metrics = {}
+    for line in text.splitlines():
+        match = _SAMPLE.match(line)
+        if match is None:
+            continue
+        name, labels, value = match.groups()
+        label_pairs = tuple(sorted(_LABEL.findall(labels or "")))
+        metrics[(name, label_pairs)] = float(value)
+    return metrics
+
+
+def metrics_delta(before: Metrics, after: Metrics) -> Metrics:
+    """Per-sample increase between two scrapes."""
+    return {key: value - before.get(key, 0.0) for key, value in after.items()}
+
+
+def combine_workers(before: WorkerMetrics, after: WorkerMetrics) -> tuple[Metrics, list[str]]:
+    """
+    Sum each worker's increase between two scrapes.
+
+    Returns:
+        The summed increase, and warnings about workers it does not cover exactly
+    """
+    delta: Metrics = {}
+    warnings = []
+    for worker, metrics in sorted(after.items()):
+        if worker not in before:
+            warnings.append(f"worker {worker} was not reached before the run; counted since start")
+        worker_delta = metrics_delta(before.get(worker, {}), metrics)
+        if any(value < 0 for value in worker_delta.values()):
+            warnings.append(f"counters of worker {worker} went backwards (restarted?); left out")
+            continue
+        for key, value in worker_delta.items():
+            delta[key] = delta.get(key, 0.0) + value
+
+    missing = len(before.keys() - after.keys())
+    if missing:
+        warnings.append(f"{missing} worker(s) not reached after the run; left out")
+    return delta, warnings
+
+
+def select(metrics: Metrics, name: str) -> list[tuple[dict[str, str], float]]:
+    """Samples of one metric, with their labels."""
+    return [(dict(labels), value) for (n, labels), value in metrics.items() if n == name]
+
+
+def histogram_quantile(metrics: Metrics, name: str, q: float) -> float | None:
+    """Upper bucket bound below which a fraction q of the observations fall."""
+    buckets = sorted(
+        (float(labels["le"]), count) for labels, count in select(metrics, f"{name}_bucket")
+    )
+    if not buckets or buckets[-1][1] <= 0:
+        return None
+    target = q * buckets[-1][1]
+    return next(bound for bound, count in buckets if count >= target)
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of a sorted list."""
+    if not ordered:
+        return float("nan")
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """Parse `kind=weight,...`."""
+    mix = {}
+    for part in value.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in ("popular", "longtail", "resort", "filter", "page"):
+            raise argparse.ArgumentTypeError(f"Unknown request kind: {kind}")
+        mix[kind] = float(weight)
+    return mix
+
+
+async def scrape(client: httpx.AsyncClient, url: str) -> Metrics | None:
+    """Fetch the server's metrics (None if they are not exposed)."""
+    try:
+        response = await client.get(url)
+    except httpx.HTTPError:
+        return None
+    return parse_metrics(response.text) if response.status_code == 200 else None
+
+
+async def scrape_workers(url: str, scrapes: int, timeout: float) -> WorkerMetrics | None:
+    """
+    Fetch the metrics of as many worker processes as a number of scrapes reach.
+
+    Every scrape uses a new connection, so the server hands them to different
+    workers; each worker's latest scrape is kept (None if metrics are not exposed).
+    """
+    workers: WorkerMetrics = {}
+    limits = httpx.Limits(max_keepalive_connections=0)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        for _ in range(scrapes):
+            metrics = await scrape(client, url)
+            if metrics is None:
+                return workers or None
+            # Servers without searcharr_worker_info are a single worker
+            worker = next(
+                (labels["worker"] for labels, _ in select(metrics, "searcharr_worker_info")), ""
+            )
+            workers[worker] = metrics
+    return workers
+
+
+async def upstream_requests(client: httpx.AsyncClient, url: str | None) -> dict[str, int]:
+    """Search requests the fake indexers have received so far."""
+    if url is None:
+        return {}
+    response = await client.get(f"{url.rstrip('/')}/_stats")
+    response.raise_for_status()
+    requests: dict[str, int] = response.json()["requests"]
+    return requests
+
+
+def report_requests(samples: list[Sample], elapsed: float) -> None:
+    """Print throughput and latency percentiles per request kind."""
+    statuses = collections.Counter(s.status for s in samples)
+    print(f"{len(samples)} requests in {elapsed:.1f} s: {len(samples) / elapsed:.1f} req/s")
+    # Status 0 is a connection error or timeout
+    print("Status: " + ", ".join(f"{n} x {status}" for status, n in sorted(statuses.items())))
+    print()
+    print(f"{'kind':<10}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    kinds = sorted({s.kind for s in samples})
+    for kind in [*kinds, "all"]:
+        ordered = sorted(s.latency * 1000 for s in samples if kind in ("all", s.kind))
+        print(
+            f"{kind:<10}{len(ordered):>8}"
+            f"{percentile(ordered, 50):>10.1f}{percentile(ordered, 95):>10.1f}"
+            f"{percentile(ordered, 99):>10.1f}{ordered[-1]:>10.1f}"
+        )
+
+
+def report_server(delta: Metrics, workers: int, warnings: list[str]) -> None:
+    """Print what the server's metrics say about the run."""
+    print(f"\nServer metrics from {workers} worker(s)")
+    for warning in warnings:
+        print(f"  Warning: {warning}")
+    searches = {
+        labels["cache"]: value for labels, value in select(delta, "searcharr_searches_total")
+    }
+    total = sum(searches.values())
+    if total:
+        print(f"Server cache: {searches.get('hit', 0):.0f} of {total:.0f} searches hit")
+
+    per_instance: dict[tuple[str, str], dict[str, float]] = {}
+    for labels, value in select(delta, "searcharr_instance_requests_total"):
+        key = (labels["source_type"], labels["instance"])
+        per_instance.setdefault(key, {})[labels["outcome"]] = value
+    if per_instance:
+        print("\nSearches sent per instance:")
+        for (source_type, instance), outcomes in sorted(per_instance.items()):
+            detail = ", ".join(f"{n:.0f} {outcome}" for outcome, n in sorted(outcomes.items()))
+            print(f"  {source_type} {instance}: {detail}")
+
+    lag_name = "searcharr_event_loop_lag_seconds"
+    count = sum(v for _, v in select(delta, f"{lag_name}_count"))
+    if count:
+        mean = sum(v for _, v in select(delta, f"{lag_name}_sum")) / count
+        p50 = histogram_quantile(delta, lag_name, 0.5)
+        p99 = histogram_quantile(delta, lag_name, 0.99)
+        print(
+            f"\nServer event loop lag ({count:.0f} samples): mean {mean * 1000:.1f} ms, "
+            f"p50 <= {(p50 or 0) * 1000:g} ms, p99 <= {(p99 or 0) * 1000:g} ms"
+        )
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Run the load test and print the report."""
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    metrics_url = f"{args.url.rstrip('/')}/api/metrics"
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        before = await scrape_workers(metrics_url, args.metrics_scrapes, args.timeout)
+        upstream_before = await upstream_requests(client, args.upstreams)
+
+        samples: list[Sample] = []
+        lags: list[float] = []
+        lag_task = asyncio.create_task(sample_loop_lag(0.1, lags))
+        rng = random.Random(args.seed)
+        users = [
+            VirtualUser(random.Random(rng.random()), args.mix, args.limit)
+            for _ in range(args.users)
+        ]
+
+        start = time.monotonic()
+        deadline = start + args.duration
+        await asyncio.gather(
+            *(run_user(client, user, deadline, args.think_ms / 1000, samples) for user in users)
+        )
+        elapsed = time.monotonic() - start
+        lag_task.cancel()
+
+        after = await scrape_workers(metrics_url, args.metrics_scrapes, args.timeout)
+        upstream_after = await upstream_requests(client, args.upstreams)
+
+    print(f"{args.users} users for {args.duration:g} s against {args.url}\n")
+    if not samples:
+        print("No requests completed")
+        return
+    report_requests(samples, elapsed)
+
+    if before is not None and after is not None:
+        delta, warnings = combine_workers(before, after)
+        report_server(delta, len(after), warnings)
+    else:
+        print("\nServer metrics unavailable (is METRICS_ENABLED set?)")
+
+    if upstream_after:
+        print("\nRequests received per fake indexer:")
+        for key, count in sorted(upstream_after.items()):
+            print(f"  {key}: {count - upstream_before.get(key, 0)}")
+        total = sum(upstream_after.values()) - sum(upstream_before.values())
+        print(f"  {total / len(samples):.2f} upstream requests per search")
+
+    if lags and max(lags) > GENERATOR_LAG_WARNING:
+        print(
+            f"\nWarning: the load generator's event loop lagged up to {max(lags) * 1000:.0f} ms; "
+            "latencies include client-side delay (use fewer users or more generator processes)"
+        )
+
+
+def main() -> None:
+    """Parse arguments and run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default="http://localhost:8000", help="Searcharr base URL")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds to run for")
+    parser.add_argument(
+        "--think-ms", type=float, default=500, help="Mean pause between a user's requests"
+    )
+    parser.add_argument(
+        "--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help="Request kind weights"
+    )
+    parser.add_argument("--limit", type=int, default=50, help="Page size")
+    parser.add_argument("--timeout", type=float, default=120, help="Request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--upstreams", default=None, help="Base URL of benchmarks.fake_upstreams, if used"
+    )
+    parser.add_argument(
+        "--metrics-scrapes",
+        type=int,
+        default=20,
+        help="Metrics scrapes before and after the run (each worker keeps its own metrics)",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,66 @@
 """
 Start the application server.
+
+Starts WORKERS worker processes. With more than one, the workers share their
+search results, in-flight searches and health status through a SQLite file:
+SHARED_STATE_PATH, which is reset on every start, or by default a file in a
+private temporary directory that is removed on exit.
 """
 
+import asyncio
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
 import uvicorn
+from app.config import settings
+from app.core.database import Base, get_engine
+
+# Import models so they are registered with SQLAlchemy Base
+from app.models import DownloadClient, JackettInstance, ProwlarrInstance  # noqa: F401
+
 
+def reset_shared_state(path: Path) -> None:
+    """Remove the shared state left by a previous run (and its WAL files)."""
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
 
-def main():
+
+async def create_tables() -> None:
+    """Create the database tables (once, so workers starting together do not race)."""
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+
+def main() -> None:
     """Start the FastAPI application."""
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        workers=1,
-    )
+    workers = settings.WORKERS
+    private_dir: str | None = None
+    if workers > 1:
+        asyncio.run(create_tables())
+        if settings.SHARED_STATE_PATH:
+            path = Path(settings.SHARED_STATE_PATH)
+            reset_shared_state(path)
+        else:
+            # Readable and writable by this user only (mode 0700)
+            private_dir = tempfile.mkdtemp(prefix="searcharr-")
+            path = Path(private_dir) / "shared.state"
+        # Read by every worker's settings
+        os.environ["SHARED_STATE_PATH"] = str(path)
+
+    try:
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=workers,
+        )
+    finally:
+        if private_dir is not None:
+            shutil.rmtree(private_dir, ignore_errors=True)
 
 
 if __name__ == "__main__":
@@ -2,8 +2,12 @@
 Tests for download client management endpoints.
 """
 
+import asyncio
+
 import pytest
+from app.config import settings
 from app.models import DownloadClient
+from app.services import QBittorrentService
 from httpx import AsyncClient
 
 
@@ -190,3 +194,22 @@ class TestClientStatus:
         """Test connection test for non-existent client."""
         response = await client.post("/api/v1/clients/999/test")
         assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_client_status_check_deadline(
+        self, client: AsyncClient, download_client: DownloadClient, monkeypatch
+    ):
+        """Test that a hanging client is reported offline after the deadline."""
+
+        async def hanging_test_connection(self):
+            await asyncio.sleep(10)
+            return True, "Connected"
+
+        monkeypatch.setattr(QBittorrentService, "test_connection", hanging_test_connection)
+        monkeypatch.setattr(settings, "STATUS_CHECK_TIMEOUT_SECONDS", 0.05)
+
+        response = await client.get("/api/v1/clients/status/all")
+        assert response.status_code == 200
+        data = response.json()
+        assert data[0]["status"] == "offline"
+        assert data[0]["check_duration_ms"] < 1000
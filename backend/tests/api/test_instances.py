@@ -2,9 +2,15 @@
 Tests for instance management endpoints.
 """
 
+import asyncio
+import time
+
 import pytest
+from app.config import settings
 from app.models import JackettInstance, ProwlarrInstance
+from app.services import JackettService
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # =============================================================================
 # Jackett Instance Tests
@@ -234,3 +240,50 @@ class TestInstanceStatus:
         # Instances will be offline since servers aren't running
         assert data["jackett"][0]["status"] == "offline"
         assert data["prowlarr"][0]["status"] == "offline"
+
+    @pytest.mark.asyncio
+    async def test_status_checks_run_concurrently(
+        self, client: AsyncClient, db_session: AsyncSession, monkeypatch
+    ):
+        """Test that instances are checked concurrently, not one after another."""
+        for i in range(4):
+            db_session.add(
+                JackettInstance(name=f"Jackett {i}", url=f"http://10.0.0.{i}:9117", api_key="k")
+            )
+        await db_session.commit()
+
+        async def slow_test_connection(self):
+            await asyncio.sleep(0.2)
+            return True, "Connection successful", 5
+
+        monkeypatch.setattr(JackettService, "test_connection", slow_test_connection)
+
+        start = time.perf_counter()
+        response = await client.get("/api/v1/instances/status")
+        elapsed = time.perf_counter() - start
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_online"] == 4
+        assert elapsed < 0.6
+        assert all(item["check_duration_ms"] >= 200 for item in data["jackett"])
+
+    @pytest.mark.asyncio
+    async def test_status_check_deadline(
+        self, client: AsyncClient, jackett_instance: JackettInstance, monkeypatch
+    ):
+        """Test that a hanging instance is reported offline after the deadline."""
+
+        async def hanging_test_connection(self):
+            await asyncio.sleep(10)
+            return True, "Connection successful", 5
+
+        monkeypatch.setattr(JackettService, "test_connection", hanging_test_connection)
+        monkeypatch.setattr(settings, "STATUS_CHECK_TIMEOUT_SECONDS", 0.05)
+
+        response = await client.get("/api/v1/instances/status")
+        assert response.status_code == 200
+        item = response.json()["jackett"][0]
+        assert item["status"] == "offline"
+        assert item["indexer_count"] is None
+        assert item["check_duration_ms"] < 1000
@@ -2,9 +2,16 @@
 Tests for search endpoints.
 """
 
+import asyncio
+import json
+
 import pytest
 from app.models import JackettInstance, ProwlarrInstance
+from app.services import JackettService, SearchAggregator
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tests.factories import make_result
 
 
 class TestSearch:
@@ -162,6 +169,213 @@ class TestSearch:
         )
         assert response.status_code == 422
 
+    @pytest.mark.asyncio
+    async def test_search_invalid_timeout(self, client: AsyncClient):
+        """Test search with a deadline below the allowed minimum."""
+        response = await client.get(
+            "/api/v1/search",
+            params={"q": "ubuntu", "timeout_ms": 10},
+        )
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_search_timeout_returns_partial_results(
+        self,
+        client: AsyncClient,
+        jackett_instance: JackettInstance,
+        prowlarr_instance: ProwlarrInstance,
+        monkeypatch,
+    ):
+        """Test that slow instances are cut off at the deadline."""
+        cancelled = False
+
+        async def fake_search_jackett(self, instance, query, category):
+            nonlocal cancelled
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            return [], None
+
+        async def fake_search_prowlarr(self, instance, query, category):
+            return [make_result("fast", 20, source_type="prowlarr")], None
+
+        monkeypatch.setattr(SearchAggregator, "_search_jackett", fake_search_jackett)
+        monkeypatch.setattr(SearchAggregator, "_search_prowlarr", fake_search_prowlarr)
+
+        response = await client.get("/api/v1/search", params={"q": "ubuntu", "timeout_ms": 100})
+        assert response.status_code == 200
+        data = response.json()
+        assert [r["title"] for r in data["results"]] == ["fast"]
+        assert data["sources_queried"] == 2
+        assert data["errors"] == ["Timed out waiting for Test Jackett after 100 ms"]
+
+        await asyncio.sleep(0.01)
+        assert cancelled
+
+    @pytest.mark.asyncio
+    async def test_search_dedupe(
+        self,
+        client: AsyncClient,
+        jackett_instance: JackettInstance,
+        prowlarr_instance: ProwlarrInstance,
+        monkeypatch,
+    ):
+        """Test that dedupe merges the same release from different instances."""
+        infohash = "a" * 40
+
+        async def fake_search_jackett(self, instance, query, category):
+            result = make_result("Ubuntu.24.04", 5)._replace(infohash=infohash)
+            return [result, make_result("only-jackett", 1)], None
+
+        async def fake_search_prowlarr(self, instance, query, category):
+            result = make_result("Ubuntu 24.04", 40, source_type="prowlarr")
+            return [result._replace(infohash=infohash)], None
+
+        monkeypatch.setattr(SearchAggregator, "_search_jackett", fake_search_jackett)
+        monkeypatch.setattr(SearchAggregator, "_search_prowlarr", fake_search_prowlarr)
+
+        plain = await client.get("/api/v1/search", params={"q": "ubuntu"})
+        assert plain.json()["total_results"] == 3
+        assert plain.json()["results"][0]["sources"] is None
+
+        response = await client.get("/api/v1/search", params={"q": "ubuntu", "dedupe": True})
+        data = response.json()
+        assert data["total_results"] == 2
+        merged = data["results"][0]
+        assert merged["seeders"] == 40
+        assert merged["infohash"] == infohash
+        assert [s["source_type"] for s in merged["sources"]] == ["jackett", "prowlarr"]
+
+    @pytest.mark.asyncio
+    async def test_search_pagination(
+        self,
+        client: AsyncClient,
+        jackett_instance: JackettInstance,
+        monkeypatch,
+    ):
+        """Test that pages cover the full result set without re-querying instances."""
+        calls = 0
+
+        async def fake_search_jackett(self, instance, query, category):
+            nonlocal calls
+            calls += 1
+            return [make_result(f"r{n}", n) for n in range(25)], None
+
+        monkeypatch.setattr(SearchAggregator, "_search_jackett", fake_search_jackett)
+
+        full = await client.get("/api/v1/search", params={"q": "ubuntu"})
+        expected = [r["id"] for r in full.json()["results"]]
+
+        pages = []
+        for offset in (0, 10, 20):
+            response = await client.get(
+                "/api/v1/search", params={"q": "ubuntu", "limit": 10, "offset": offset}
+            )
+            data = response.json()
+            assert data["total_results"] == 25
+            assert data["offset"] == offset
+            assert data["limit"] == 10
+            pages.extend(r["id"] for r in data["results"])
+
+        assert pages == expected
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_search_pagination_with_failed_instance(
+        self,
+        client: AsyncClient,
+        jackett_instance: JackettInstance,
+        prowlarr_instance: ProwlarrInstance,
+        monkeypatch,
+    ):
+        """Test that pages of a partial search come from one result set, marked partial."""
+        calls = 0
+
+        async def fake_search_jackett(self, instance, query, category):
+            nonlocal calls
+            calls += 1
+            # A new search would return different results
+            return [make_result(f"call{calls}-r{n}", n) for n in range(20)], None
+
+        async def fake_search_prowlarr(self, instance, query, category):
+            return [], "Error searching Test Prowlarr: boom"
+
+        monkeypatch.setattr(SearchAggregator, "_search_jackett", fake_search_jackett)
+        monkeypatch.setattr(SearchAggregator, "_search_prowlarr", fake_search_prowlarr)
+
+        pages = []
+        for offset in (0, 10):
+            response = await client.get(
+                "/api/v1/search", params={"q": "ubuntu", "limit": 10, "offset": offset}
+            )
+            data = response.json()
+            assert data["partial"] is True
+            assert data["errors"] == ["Error searching Test Prowlarr: boom"]
+            pages.extend(r["id"] for r in data["results"])
+
+        assert calls == 1
+        assert sorted(pages) == sorted(f"call1-r{n}" for n in range(20))
+
+    @pytest.mark.asyncio
+    async def test_search_server_timing(
+        self,
+        client: AsyncClient,
+        jackett_instance: JackettInstance,
+        monkeypatch,
+    ):
+        """Test that searches report per-stage timings, in the body only with debug=true."""
+
+        async def fake_search(self, query, category, instance_name, raise_on_error=False):
+            return [make_result("r1", 1), make_result("r2", 2)]
+
+        monkeypatch.setattr(JackettService, "search", fake_search)
+
+        response = await client.get("/api/v1/search", params={"q": "ubuntu"})
+        assert response.json()["timings"] is None
+
+        metrics = [m.split(";")[0] for m in response.headers["server-timing"].split(", ")]
+        instance = f"jackett-{jackett_instance.id}"
+        for stage in ("config", instance, f"{instance}-parse", "filter", "sort", "serialize"):
+            assert stage in metrics
+        assert 'desc="Test Jackett network"' in response.headers["server-timing"]
+
+        response = await client.get("/api/v1/search", params={"q": "ubuntu", "debug": True})
+        timings = response.json()["timings"]
+        # Served from the cache: no instance was queried, and the view is reused
+        assert set(timings) == {"config", "page"}
+        assert all(duration >= 0 for duration in timings.values())
+
+    @pytest.mark.asyncio
+    async def test_search_server_timing_non_ascii_instance_name(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        jackett_instance: JackettInstance,
+        monkeypatch,
+    ):
+        """Test that an instance name beyond latin-1 does not break the Server-Timing header."""
+        jackett_instance.name = "Jackett 日本"
+        await db_session.commit()
+
+        async def fake_search(self, query, category, instance_name, raise_on_error=False):
+            return [make_result("r1", 1)]
+
+        monkeypatch.setattr(JackettService, "search", fake_search)
+
+        response = await client.get("/api/v1/search", params={"q": "ubuntu"})
+        assert response.status_code == 200
+        assert response.json()["total_results"] == 1
+        assert 'desc="Jackett %E6%97%A5%E6%9C%AC network"' in response.headers["server-timing"]
+
+    @pytest.mark.asyncio
+    async def test_search_invalid_pagination(self, client: AsyncClient):
+        """Test that out-of-range page parameters are rejected."""
+        for params in ({"limit": 0}, {"limit": 100_000}, {"offset": -1}):
+            response = await client.get("/api/v1/search", params={"q": "ubuntu", **params})
+            assert response.status_code == 422
+
 
 class TestCategories:
     """Tests for categories endpoint."""
@@ -179,3 +393,100 @@ class TestCategories:
         assert "TV" in categories
         assert "Software" in categories
         assert "Games" in categories
+
+
+class TestSearchStream:
+    """Tests for the streaming search endpoint."""
+
+    @staticmethod
+    def parse_events(body: str) -> list[dict]:
+        """Parse an NDJSON response body into events."""
+        return [json.loads(line) for line in body.splitlines() if line]
+
+    @pytest.mark.asyncio
+    async def test_stream_no_instances(self, client: AsyncClient):
+        """Test streaming when no instances are configured."""
+        response = await client.get("/api/v1/search/stream", params={"q": "ubuntu"})
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = self.parse_events(response.text)
+        assert len(events) == 1
+        assert events[0]["event"] == "summary"
+        assert events[0]["sources_queried"] == 0
+        assert "No instances configured" in events[0]["errors"]
+
+    @pytest.mark.asyncio
+    async def test_stream_emits_fastest_source_first(
+        self,
+        client: AsyncClient,
+        jackett_instance: JackettInstance,
+        prowlarr_instance: ProwlarrInstance,
+        monkeypatch,
+    ):
+        """Test that batches arrive per source and the summary matches /search."""
+
+        async def fake_search_jackett(self, instance, query, category):
+            await asyncio.sleep(0.05)
+            return [make_result("slow-a", 5), make_result("slow-b", 50)], None
+
+        async def fake_search_prowlarr(self, instance, query, category):
+            return [make_result("fast", 20, source_type="prowlarr")], None
+
+        monkeypatch.setattr(SearchAggregator, "_search_jackett", fake_search_jackett)
+        monkeypatch.setattr(SearchAggregator, "_search_prowlarr", fake_search_prowlarr)
+
+        params = {"q": "ubuntu", "min_seeders": 10}
+        response = await client.get("/api/v1/search/stream", params=params)
+        assert response.status_code == 200
+        events = self.parse_events(response.text)
+
+        assert [e["event"] for e in events] == [
+            "results",
+            "source_status",
+            "results",
+            "source_status",
+            "summary",
+        ]
+        assert events[0]["source_type"] == "prowlarr"
+        assert [r["title"] for r in events[2]["results"]] == ["slow-b"]
+        assert events[3]["result_count"] == 1
+
+        summary = events[-1]
+        assert summary["total_results"] == 2
+        assert summary["sources_queried"] == 2
+
+        plain = await client.get("/api/v1/search", params=params)
+        assert summary["result_ids"] == [r["id"] for r in plain.json()["results"]]
+
+    @pytest.mark.asyncio
+    async def test_stream_marks_timed_out_sources(
+        self,
+        client: AsyncClient,
+        jackett_instance: JackettInstance,
+        prowlarr_instance: ProwlarrInstance,
+        monkeypatch,
+    ):
+        """Test that the stream reports instances cut off by the deadline."""
+
+        async def fake_search_jackett(self, instance, query, category):
+            await asyncio.sleep(10)
+            return [], None
+
+        async def fake_search_prowlarr(self, instance, query, category):
+            return [make_result("fast", 20, source_type="prowlarr")], None
+
+        monkeypatch.setattr(SearchAggregator, "_search_jackett", fake_search_jackett)
+        monkeypatch.setattr(SearchAggregator, "_search_prowlarr", fake_search_prowlarr)
+
+        response = await client.get(
+            "/api/v1/search/stream", params={"q": "ubuntu", "timeout_ms": 100}
+        )
+        events = self.parse_events(response.text)
+
+        statuses = [e for e in events if e["event"] == "source_status"]
+        assert [(e["source_type"], e["status"]) for e in statuses] == [
+            ("prowlarr", "ok"),
+            ("jackett", "timeout"),
+        ]
+        assert events[-1]["result_ids"] == ["fast"]
+        assert events[-1]["partial"] is True
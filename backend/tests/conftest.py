@@ -11,7 +11,15 @@ import pytest_asyncio
 from app.core.database import Base, get_db
 from app.main import app
 from app.models import ClientType, DownloadClient, JackettInstance, ProwlarrInstance
-from app.services import encrypt_credential
+from app.services import (
+    encrypt_credential,
+    get_circuit_breaker,
+    get_config_registry,
+    get_health_monitor,
+    get_http_client_registry,
+    get_metrics,
+    get_search_cache,
+)
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
@@ -45,6 +53,25 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
         await conn.run_sync(Base.metadata.drop_all)
 
 
+@pytest_asyncio.fixture(autouse=True)
+async def reset_shared_state() -> AsyncGenerator[None, None]:
+    """Reset process-wide caches so state never leaks between tests."""
+    # Configuration is read from the test database
+    get_config_registry().session_factory = TestSessionLocal
+    get_config_registry().clear()
+    get_search_cache().clear()
+    get_health_monitor().clear()
+    get_circuit_breaker().clear()
+    get_metrics().clear()
+    yield
+    get_config_registry().clear()
+    get_search_cache().clear()
+    get_health_monitor().clear()
+    get_circuit_breaker().clear()
+    # Pooled HTTP clients must not outlive a test's event loop
+    await get_http_client_registry().aclose()
+
+
 @pytest_asyncio.fixture
 async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     """Create a test client with overridden database dependency."""
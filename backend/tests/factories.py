@@ -0,0 +1,45 @@
+"""
+Factories for test data.
+"""
+
+from typing import Any
+
+from app.services.search_record import SearchRecord
+
+
+def make_result(
+    title: str,
+    seeders: int = 10,
+    *,
+    source_type: str = "jackett",
+    source: str | None = None,
+    size: int = 1024,
+    **overrides: Any,
+) -> SearchRecord:
+    """
+    Build a minimal search result.
+
+    Args:
+        title: Title of the result
+        seeders: Number of seeders
+        source_type: "jackett" or "prowlarr"
+        source: Name of the instance (defaults to "Test Jackett" or "Test Prowlarr")
+        size: Size in bytes
+        **overrides: Any other SearchRecord field
+    """
+    source = source or f"Test {source_type.capitalize()}"
+    fields: dict[str, Any] = {
+        "id": title,
+        "title": title,
+        "source": source,
+        "source_type": source_type,
+        "indexer": "test",
+        "size": size,
+        "size_formatted": f"{size} B",
+        "seeders": seeders,
+        "leechers": 0,
+        "date": None,
+        "category": "Other",
+    }
+    fields.update(overrides)
+    return SearchRecord(**fields)
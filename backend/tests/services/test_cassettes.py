@@ -0,0 +1,106 @@
+"""
+Tests for recording and replaying instance responses.
+"""
+
+import gzip
+import json
+
+import httpx
+import pytest
+from app.schemas.search import SearchCategory
+from app.services.cassettes import (
+    CassetteNotFoundError,
+    CassetteRecorder,
+    cassette_key,
+    load_cassettes,
+    replay_transport,
+)
+from app.services.http_clients import HttpClientRegistry
+from app.services.jackett import JackettService
+
+TORZNAB_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:torznab="http://torznab.com/schemas/2015/feed">
+  <channel>
+    <item>
+      <title>Ubuntu 24.04 Desktop</title>
+      <link>http://jackett.example/dl/1</link>
+      <pubDate>Thu, 25 Apr 2024 12:00:00 +0000</pubDate>
+      <size>6000000000</size>
+      <torznab:attr name="seeders" value="150"/>
+    </item>
+  </channel>
+</rss>"""
+
+
+def upstream(request: httpx.Request) -> httpx.Response:
+    """A Jackett that answers every search with TORZNAB_FEED, gzip-encoded."""
+    return httpx.Response(
+        200,
+        headers={"content-type": "application/rss+xml", "content-encoding": "gzip"},
+        content=gzip.compress(TORZNAB_FEED),
+    )
+
+
+async def record_search(tmp_path) -> None:
+    """Search a Jackett instance through a recorder."""
+    recorder = CassetteRecorder(tmp_path, httpx.MockTransport(upstream))
+    async with httpx.AsyncClient(transport=recorder) as client:
+        service = JackettService("http://jackett:9117", "secret-key", client=client)
+        results = await service.search("ubuntu", raise_on_error=True)
+    assert [r.title for r in results] == ["Ubuntu 24.04 Desktop"]
+
+
+class TestCassettes:
+    """Tests for CassetteRecorder and replay_transport."""
+
+    def test_key_ignores_api_key_and_parameter_order(self):
+        """Test that requests differing only in API key or parameter order match."""
+        assert cassette_key("get", "http://jackett:9117/api?q=x&t=search&apikey=a") == (
+            cassette_key("GET", "http://jackett:9117/api?apikey=b&t=search&q=x")
+        )
+        assert cassette_key("GET", "http://jackett:9117/api?q=x") != (
+            cassette_key("GET", "http://jackett:9117/api?q=y")
+        )
+
+    @pytest.mark.asyncio
+    async def test_records_raw_response_without_api_key(self, tmp_path):
+        """Test that the body is stored as received and the API key is not stored."""
+        await record_search(tmp_path)
+
+        (cassette,) = load_cassettes(tmp_path).values()
+        assert cassette.status_code == 200
+        assert cassette.headers["content-encoding"] == "gzip"
+        assert gzip.decompress(cassette.body) == TORZNAB_FEED
+        assert 0 <= cassette.headers_seconds <= cassette.duration_seconds
+        for path in tmp_path.iterdir():
+            assert b"secret-key" not in path.read_bytes()
+        assert json.loads(next(tmp_path.glob("*.json")).read_text())["url"] == (
+            "http://jackett:9117/api/v2.0/indexers/all/results/torznab/api?q=ubuntu&t=search"
+        )
+
+    @pytest.mark.asyncio
+    async def test_replays_recorded_response(self, tmp_path):
+        """Test that a replayed search parses like the recorded one, with any API key."""
+        await record_search(tmp_path)
+
+        async with httpx.AsyncClient(transport=replay_transport(tmp_path)) as client:
+            service = JackettService("http://jackett:9117", "other-key", client=client)
+            results = await service.search("ubuntu", raise_on_error=True)
+            assert [(r.title, r.seeders) for r in results] == [("Ubuntu 24.04 Desktop", 150)]
+
+            with pytest.raises(CassetteNotFoundError):
+                await service.search("debian", SearchCategory.MOVIES, raise_on_error=True)
+
+    @pytest.mark.asyncio
+    async def test_registry_records_in_capture_mode(self, tmp_path):
+        """Test that pooled clients record responses when a cassette directory is set."""
+        registry = HttpClientRegistry(record_dir=str(tmp_path))
+        client = registry.get("jackett", 1, "http://jackett:9117", 30)
+        assert isinstance(client._transport, CassetteRecorder)
+        await registry.aclose()
+
+        registry = HttpClientRegistry(transport=replay_transport({}))
+        assert isinstance(
+            registry.get("jackett", 1, "http://jackett:9117", 30)._transport, (httpx.MockTransport)
+        )
+        await registry.aclose()
@@ -0,0 +1,161 @@
+"""
+Tests for change events between replicas.
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import pytest
+from app.services import change_events, invalidation
+from app.services.change_events import ChangeEvents
+from app.services.health_monitor import HealthStatus
+from app.services.shared_state import SharedState
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+
+
+class FakeListenEngine:
+    """Engine whose LISTEN connections fail their liveness check after `drops` times."""
+
+    def __init__(self, drops: int) -> None:
+        self.drops = drops
+        self.callbacks: list = []
+        self.invalidated = 0
+
+    @asynccontextmanager
+    async def connect(self):
+        engine = self
+
+        class Listener:
+            async def add_listener(self, channel, callback):
+                engine.callbacks.append(callback)
+
+            async def execute(self, query):
+                if engine.drops > 0:
+                    engine.drops -= 1
+                    raise ConnectionError("connection lost")
+
+        async def get_raw_connection():
+            return SimpleNamespace(driver_connection=Listener())
+
+        async def invalidate():
+            engine.invalidated += 1
+
+        yield SimpleNamespace(get_raw_connection=get_raw_connection, invalidate=invalidate)
+
+
+class TestChangeEvents:
+    """Tests for ChangeEvents."""
+
+    @pytest.mark.asyncio
+    async def test_publish_notifies_channel(self):
+        """Test that a change is published with pg_notify on the channel."""
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        notified: list[tuple[str, str]] = []
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def add_pg_notify(dbapi_connection, connection_record):
+            dbapi_connection.create_function(
+                "pg_notify", 2, lambda channel, payload: notified.append((channel, payload))
+            )
+
+        events = ChangeEvents(engine, channel="changes")
+        await events.publish("jackett", 1)
+        await engine.dispose()
+
+        [(channel, payload)] = notified
+        assert channel == "changes"
+        assert json.loads(payload) == {"origin": events.origin, "type": "jackett", "id": 1}
+
+    @pytest.mark.asyncio
+    async def test_receive_applies_other_replicas_changes(self):
+        """Test that changes are applied, except this worker's own and malformed ones."""
+        events = ChangeEvents()
+        applied: list[tuple[str, int]] = []
+
+        async def handler(target_type: str, target_id: int) -> None:
+            applied.append((target_type, target_id))
+
+        events.receive(json.dumps({"origin": "other", "type": "prowlarr", "id": 2}), handler)
+        events.receive(json.dumps({"origin": events.origin, "type": "jackett", "id": 1}), handler)
+        events.receive("not json", handler)
+        events.receive(json.dumps({"origin": "other"}), handler)
+        await asyncio.gather(*events._applying)
+
+        assert applied == [("prowlarr", 2)]
+
+    @pytest.mark.asyncio
+    async def test_listener_reconnects_and_resyncs(self, monkeypatch):
+        """Test that a dropped connection is re-established, dropping caches each time."""
+        monkeypatch.setattr(change_events, "LISTEN_CHECK_SECONDS", 0)
+        monkeypatch.setattr(change_events, "RECONNECT_SECONDS", 0)
+        engine = FakeListenEngine(drops=1)
+        events = ChangeEvents(engine)
+        applied: list[tuple[str, int]] = []
+        resyncs = 0
+
+        async def handler(target_type: str, target_id: int) -> None:
+            applied.append((target_type, target_id))
+
+        def resync() -> None:
+            nonlocal resyncs
+            resyncs += 1
+
+        events.start(handler, resync)
+        while len(engine.callbacks) < 2:
+            await asyncio.sleep(0)
+        engine.callbacks[-1](
+            None, 1, "changes", json.dumps({"origin": "b", "type": "jackett", "id": 1})
+        )
+        await asyncio.gather(*events._applying)
+        await events.stop()
+
+        assert resyncs == 2
+        assert engine.invalidated == 2
+        assert applied == [("jackett", 1)]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_publishes_change(self, monkeypatch):
+        """Test that invalidating a target publishes it to the other replicas."""
+        published: list[tuple[str, int]] = []
+
+        class FakeChangeEvents:
+            async def publish(self, target_type: str, target_id: int) -> None:
+                published.append((target_type, target_id))
+
+        monkeypatch.setattr(invalidation, "get_change_events", FakeChangeEvents)
+        await invalidation.invalidate("client", 3)
+
+        assert published == [("client", 3)]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_survives_publish_failure(self, monkeypatch, caplog):
+        """Test that failing to publish a committed change is logged, not raised."""
+
+        class FailingChangeEvents:
+            async def publish(self, target_type: str, target_id: int) -> None:
+                raise ConnectionError("connection lost")
+
+        monkeypatch.setattr(invalidation, "get_change_events", FailingChangeEvents)
+        await invalidation.invalidate("client", 3)
+
+        assert "Failed to tell other replicas client 3 changed" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_replica_change_not_republished(self, monkeypatch, tmp_path):
+        """Test that a replica's change drops shared state without a new invalidation."""
+        shared = SharedState(tmp_path / "state")
+        other_worker = SharedState(tmp_path / "state")
+        status = HealthStatus("online", 3, 12.5, datetime.now(UTC))
+        await shared.put_health(("jackett", 1), status.to_dict())
+        monkeypatch.setattr(invalidation, "get_shared_state", lambda: shared)
+
+        await invalidation.apply_replica_change("jackett", 1)
+
+        seen: list[tuple[str, int]] = []
+        await other_worker.apply_invalidations(lambda *target: seen.append(target))
+        assert seen == []
+        assert await other_worker.get_health() == {}
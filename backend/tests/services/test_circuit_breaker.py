@@ -0,0 +1,88 @@
+"""
+Tests for the search circuit breaker.
+"""
+
+import asyncio
+
+import pytest
+from app.services.circuit_breaker import CircuitBreaker
+
+KEY = ("jackett", 1)
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker."""
+
+    def test_opens_after_consecutive_failures(self):
+        """Test that the circuit opens only once the threshold is reached."""
+        breaker = CircuitBreaker(failure_threshold=3, retry_seconds=30)
+        breaker.record_failure(KEY)
+        breaker.record_failure(KEY)
+        assert not breaker.is_open(KEY)
+        breaker.record_failure(KEY)
+        assert breaker.is_open(KEY)
+
+    def test_success_resets_failure_count(self):
+        """Test that a success in between failures keeps the circuit closed."""
+        breaker = CircuitBreaker(failure_threshold=2, retry_seconds=30)
+        breaker.record_failure(KEY)
+        breaker.record_success(KEY)
+        breaker.record_failure(KEY)
+        assert not breaker.is_open(KEY)
+
+    def test_disabled_never_opens(self):
+        """Test that a zero threshold disables the breaker."""
+        breaker = CircuitBreaker(failure_threshold=0, retry_seconds=30)
+        for _ in range(10):
+            breaker.record_failure(KEY)
+        assert not breaker.is_open(KEY)
+
+    def test_reset(self):
+        """Test that resetting an instance closes its circuit."""
+        breaker = CircuitBreaker(failure_threshold=1, retry_seconds=30)
+        breaker.record_failure(KEY)
+        breaker.reset(KEY)
+        assert not breaker.is_open(KEY)
+
+    @pytest.mark.asyncio
+    async def test_successful_probe_closes_circuit(self):
+        """Test that a healthy probe closes an open circuit."""
+        breaker = CircuitBreaker(failure_threshold=1, retry_seconds=0)
+        breaker.record_failure(KEY)
+
+        async def healthy() -> bool:
+            return True
+
+        breaker.probe(KEY, healthy)
+        await asyncio.sleep(0.01)
+        assert not breaker.is_open(KEY)
+
+    @pytest.mark.asyncio
+    async def test_probe_waits_for_retry_interval(self):
+        """Test that an open circuit is not probed before the retry interval."""
+        breaker = CircuitBreaker(failure_threshold=1, retry_seconds=60)
+        breaker.record_failure(KEY)
+        calls = 0
+
+        async def healthy() -> bool:
+            nonlocal calls
+            calls += 1
+            return True
+
+        breaker.probe(KEY, healthy)
+        await asyncio.sleep(0.01)
+        assert calls == 0
+        assert breaker.is_open(KEY)
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_keeps_circuit_open(self):
+        """Test that an unhealthy probe leaves the circuit open."""
+        breaker = CircuitBreaker(failure_threshold=1, retry_seconds=0)
+        breaker.record_failure(KEY)
+
+        async def unhealthy() -> bool:
+            raise ConnectionError("still down")
+
+        breaker.probe(KEY, unhealthy)
+        await asyncio.sleep(0.01)
+        assert breaker.is_open(KEY)
@@ -0,0 +1,124 @@
+"""
+Tests for the in-memory configuration registry.
+"""
+
+import asyncio
+
+import pytest
+from app.models import DownloadClient, JackettInstance, ProwlarrInstance
+from app.services import SearchAggregator
+from app.services.config_registry import ConfigRegistry, IndexerConfig
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+def make_registry(db_session: AsyncSession) -> tuple[ConfigRegistry, list[int]]:
+    """Build a registry on the test database that counts its loads."""
+    loads: list[int] = []
+    session_factory = async_sessionmaker(db_session.bind, expire_on_commit=False)
+
+    def counting_factory() -> AsyncSession:
+        loads.append(1)
+        return session_factory()
+
+    return ConfigRegistry(session_factory=counting_factory), loads
+
+
+class TestConfigRegistry:
+    """Tests for ConfigRegistry."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_holds_all_configuration(
+        self,
+        db_session: AsyncSession,
+        jackett_instance: JackettInstance,
+        prowlarr_instance: ProwlarrInstance,
+        download_client: DownloadClient,
+    ):
+        """Test that a snapshot has every instance and client."""
+        registry, _ = make_registry(db_session)
+
+        snapshot = await registry.snapshot()
+
+        assert snapshot.jackett == (
+            IndexerConfig(
+                jackett_instance.id,
+                jackett_instance.name,
+                jackett_instance.url,
+                jackett_instance.api_key,
+            ),
+        )
+        assert [i.name for i in snapshot.prowlarr] == ["Test Prowlarr"]
+        client = snapshot.get_client(download_client.id)
+        assert client is not None and client.url == download_client.url
+        assert snapshot.get_client(download_client.id + 1) is None
+
+    @pytest.mark.asyncio
+    async def test_reloads_only_after_invalidation(
+        self, db_session: AsyncSession, jackett_instance: JackettInstance
+    ):
+        """Test that snapshots are reused until invalidated, then reloaded once."""
+        registry, loads = make_registry(db_session)
+
+        first = await registry.snapshot()
+        assert await registry.snapshot() is first
+        assert len(loads) == 1
+
+        jackett_instance.name = "Renamed"
+        await db_session.commit()
+        assert (await registry.snapshot()).jackett[0].name == "Test Jackett"
+
+        registry.invalidate()
+        snapshots = await asyncio.gather(*(registry.snapshot() for _ in range(5)))
+        assert len(loads) == 2
+        assert all(s is snapshots[0] for s in snapshots)
+        assert snapshots[0].jackett[0].name == "Renamed"
+        assert snapshots[0].version == registry.version
+
+    @pytest.mark.asyncio
+    async def test_resolve_instances_without_database(
+        self,
+        db_session: AsyncSession,
+        jackett_instance: JackettInstance,
+        prowlarr_instance: ProwlarrInstance,
+    ):
+        """Test that the aggregator resolves instances from the loaded snapshot."""
+        registry, loads = make_registry(db_session)
+        aggregator = SearchAggregator(registry=registry)
+
+        jackett, prowlarr = await aggregator.resolve_instances()
+        assert [i.id for i in jackett] == [jackett_instance.id]
+        assert [i.id for i in prowlarr] == [prowlarr_instance.id]
+
+        jackett, prowlarr = await aggregator.resolve_instances(
+            jackett_ids=[jackett_instance.id], exclusive_filter=True
+        )
+        assert [i.id for i in jackett] == [jackett_instance.id]
+        assert prowlarr == []
+        assert len(loads) == 1
+
+
+class TestConfigInvalidation:
+    """Tests that API changes reach the registry."""
+
+    @pytest.mark.asyncio
+    async def test_crud_invalidates_registry(self, client: AsyncClient):
+        """Test that created, updated and deleted instances are seen by searches."""
+        aggregator = SearchAggregator()
+        assert await aggregator.resolve_instances() == ([], [])
+
+        response = await client.post(
+            "/api/v1/instances/jackett",
+            json={"name": "New", "url": "http://jackett:9117", "api_key": "key"},
+        )
+        instance_id = response.json()["id"]
+        jackett, _ = await aggregator.resolve_instances()
+        assert [i.name for i in jackett] == ["New"]
+
+        await client.put(f"/api/v1/instances/jackett/{instance_id}", json={"name": "Renamed"})
+        jackett, _ = await aggregator.resolve_instances()
+        assert [i.name for i in jackett] == ["Renamed"]
+
+        await client.delete(f"/api/v1/instances/jackett/{instance_id}")
+        jackett, _ = await aggregator.resolve_instances()
+        assert jackett == []
@@ -0,0 +1,87 @@
+"""
+Tests for cross-source deduplication.
+"""
+
+import base64
+
+from app.services.dedupe import (
+    dedupe_key,
+    infohash_from_magnet,
+    merge_duplicates,
+    normalize_infohash,
+)
+
+from tests.factories import make_result
+
+HASH = "c12fe1c06bba254a9dc9f519b335aa7c1367a88a"
+
+
+class TestInfohash:
+    """Tests for info hash parsing."""
+
+    def test_normalize_hex(self):
+        """Test that hex hashes are lowercased."""
+        assert normalize_infohash(HASH.upper()) == HASH
+
+    def test_normalize_base32(self):
+        """Test that base32 hashes are converted to hex."""
+        encoded = base64.b32encode(bytes.fromhex(HASH)).decode()
+        assert normalize_infohash(encoded) == HASH
+
+    def test_normalize_invalid(self):
+        """Test that anything else is rejected."""
+        assert normalize_infohash(None) is None
+        assert normalize_infohash("") is None
+        assert normalize_infohash("z" * 40) is None
+        assert normalize_infohash("abc") is None
+
+    def test_from_magnet(self):
+        """Test extracting the hash from a magnet URI."""
+        magnet = f"magnet:?dn=Ubuntu&xt=urn:btih:{HASH.upper()}&tr=udp%3A%2F%2Ftracker"
+        assert infohash_from_magnet(magnet) == HASH
+
+    def test_from_non_magnet(self):
+        """Test that non-magnet links have no hash."""
+        assert infohash_from_magnet("http://prowlarr/download?link=abc") is None
+        assert infohash_from_magnet("magnet:?dn=no-hash") is None
+        assert infohash_from_magnet(None) is None
+
+
+class TestMergeDuplicates:
+    """Tests for merge_duplicates."""
+
+    def test_key_prefers_infohash(self):
+        """Test that the hash wins over title and size."""
+        assert dedupe_key(make_result("A", 1, infohash=HASH)) == f"btih:{HASH}"
+
+    def test_title_key_is_normalized(self):
+        """Test that punctuation and case do not matter for the title fallback."""
+        dotted = make_result("Ubuntu.24.04-Desktop", 1)
+        spaced = make_result("ubuntu 24 04 desktop", 1)
+        assert dedupe_key(dotted) == dedupe_key(spaced)
+        assert dedupe_key(dotted) != dedupe_key(make_result("Ubuntu.24.04-Desktop", 1, size=1))
+
+    def test_merge_keeps_max_seeders_and_sources(self):
+        """Test that copies merge into the best one with every source listed."""
+        results = [
+            make_result("Ubuntu", 10, source="Jackett", infohash=HASH),
+            make_result("Other", 3),
+            make_result("ubuntu (mirror)", 50, source="Prowlarr", infohash=HASH),
+        ]
+
+        merged = merge_duplicates(results)
+
+        assert [r.title for r in merged] == ["ubuntu (mirror)", "Other"]
+        ubuntu = merged[0]
+        assert ubuntu.seeders == 50
+        assert [(s.source, s.seeders) for s in ubuntu.sources] == [
+            ("Jackett", 10),
+            ("Prowlarr", 50),
+        ]
+        assert merged[1].sources is not None and len(merged[1].sources) == 1
+
+    def test_merged_id_independent_of_order(self):
+        """Test that the merged ID does not depend on which source answered first."""
+        first = make_result("Ubuntu", 10, source="Jackett", infohash=HASH, id="j:Ubuntu")
+        second = make_result("Ubuntu", 20, source="Prowlarr", infohash=HASH, id="p:Ubuntu")
+        assert merge_duplicates([first, second])[0].id == merge_duplicates([second, first])[0].id
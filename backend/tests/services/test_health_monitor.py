@@ -0,0 +1,146 @@
+"""
+Tests for the background health monitor.
+"""
+
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+from app.models import DownloadClient, JackettInstance, ProwlarrInstance
+from app.services import JackettService, ProwlarrService, QBittorrentService
+from app.services.health_monitor import HealthMonitor, HealthStatus
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+def make_monitor(db_session: AsyncSession, **kwargs) -> HealthMonitor:
+    """Build a monitor that loads targets from the test database."""
+    session_factory = async_sessionmaker(db_session.bind, expire_on_commit=False)
+    return HealthMonitor(session_factory=session_factory, **kwargs)
+
+
+@pytest.fixture
+def fake_probes(monkeypatch) -> dict[str, int]:
+    """Replace service connection tests with instant fakes that count calls."""
+    calls = {"jackett": 0, "prowlarr": 0, "client": 0}
+
+    async def jackett_ok(self):
+        calls["jackett"] += 1
+        return True, "Connection successful", 12
+
+    async def prowlarr_down(self):
+        calls["prowlarr"] += 1
+        return False, "Could not connect to Prowlarr server", None
+
+    async def client_ok(self):
+        calls["client"] += 1
+        return True, "Connected to qBittorrent v4.6.0"
+
+    monkeypatch.setattr(JackettService, "test_connection", jackett_ok)
+    monkeypatch.setattr(ProwlarrService, "test_connection", prowlarr_down)
+    monkeypatch.setattr(QBittorrentService, "test_connection", client_ok)
+    return calls
+
+
+class TestHealthMonitor:
+    """Tests for HealthMonitor."""
+
+    @pytest.mark.asyncio
+    async def test_check_due_probes_every_target(
+        self,
+        db_session: AsyncSession,
+        jackett_instance: JackettInstance,
+        prowlarr_instance: ProwlarrInstance,
+        download_client: DownloadClient,
+        fake_probes: dict[str, int],
+    ):
+        """Test that one round probes instances and clients and caches the results."""
+        monitor = make_monitor(db_session)
+        await monitor.check_due()
+
+        assert fake_probes == {"jackett": 1, "prowlarr": 1, "client": 1}
+        # Snapshots are only served while the background task runs
+        assert monitor.get("jackett", jackett_instance.id) is None
+
+        monitor.start()
+        try:
+            jackett = monitor.get("jackett", jackett_instance.id)
+            assert jackett is not None
+            assert jackett.status == "online"
+            assert jackett.indexer_count == 12
+            prowlarr = monitor.get("prowlarr", prowlarr_instance.id)
+            assert prowlarr is not None
+            assert prowlarr.status == "offline"
+            assert monitor.get("client", download_client.id).status == "online"
+        finally:
+            await monitor.stop()
+
+    @pytest.mark.asyncio
+    async def test_offline_targets_reprobed_sooner(
+        self,
+        db_session: AsyncSession,
+        jackett_instance: JackettInstance,
+        prowlarr_instance: ProwlarrInstance,
+        fake_probes: dict[str, int],
+    ):
+        """Test that offline targets come due before online ones."""
+        monitor = make_monitor(db_session, interval=60, offline_interval=0)
+        await monitor.check_due()
+        await monitor.check_due()
+
+        # The online Jackett instance is not due again; the offline Prowlarr one is
+        assert fake_probes["jackett"] == 1
+        assert fake_probes["prowlarr"] == 2
+
+    @pytest.mark.asyncio
+    async def test_forget_forces_reprobe(
+        self,
+        db_session: AsyncSession,
+        jackett_instance: JackettInstance,
+        fake_probes: dict[str, int],
+    ):
+        """Test that forgetting a target makes it due immediately."""
+        monitor = make_monitor(db_session, interval=60, offline_interval=60)
+        await monitor.check_due()
+        monitor.forget("jackett", jackett_instance.id)
+        await monitor.check_due()
+        assert fake_probes["jackett"] == 2
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop(self, db_session: AsyncSession, fake_probes: dict[str, int]):
+        """Test the background task lifecycle."""
+        monitor = make_monitor(db_session)
+        monitor.start()
+        assert monitor.running
+        await asyncio.sleep(0)
+        await monitor.stop()
+        assert not monitor.running
+
+
+class TestStatusEndpointsUseMonitor:
+    """Tests that status endpoints serve the monitor's snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_instances_status_served_from_snapshot(
+        self,
+        client: AsyncClient,
+        jackett_instance: JackettInstance,
+        fake_probes: dict[str, int],
+        monkeypatch,
+    ):
+        """Test that a running monitor's snapshot is returned without probing."""
+        from app.services import get_health_monitor
+
+        monitor = get_health_monitor()
+        monkeypatch.setattr(HealthMonitor, "running", property(lambda self: True))
+        checked_at = datetime(2025, 1, 31, 10, 0, tzinfo=UTC)
+        monitor.record("jackett", jackett_instance.id, HealthStatus("online", 7, 12.5, checked_at))
+
+        response = await client.get("/api/v1/instances/status")
+        assert response.status_code == 200
+        item = response.json()["jackett"][0]
+        assert item["status"] == "online"
+        assert item["indexer_count"] == 7
+        assert item["check_duration_ms"] == 12.5
+        assert item["last_checked"].startswith("2025-01-31T10:00:00")
+        assert fake_probes["jackett"] == 0
@@ -0,0 +1,58 @@
+"""
+Tests for the pooled HTTP client registry.
+"""
+
+import pytest
+from app.services.http_clients import HttpClientRegistry
+
+
+class TestHttpClientRegistry:
+    """Tests for HttpClientRegistry."""
+
+    @pytest.mark.asyncio
+    async def test_reuses_client_for_same_instance(self):
+        """Test that the same instance and URL share one client."""
+        registry = HttpClientRegistry()
+        first = registry.get("jackett", 1, "http://localhost:9117", 30)
+        second = registry.get("jackett", 1, "http://localhost:9117/", 30)
+        assert first is second
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_separate_clients_per_instance(self):
+        """Test that different instances get different clients."""
+        registry = HttpClientRegistry()
+        jackett = registry.get("jackett", 1, "http://localhost:9117", 30)
+        prowlarr = registry.get("prowlarr", 1, "http://localhost:9696", 30)
+        assert jackett is not prowlarr
+        await registry.aclose()
+
+    @pytest.mark.asyncio
+    async def test_url_change_rebuilds_client(self):
+        """Test that changing an instance URL replaces its client."""
+        registry = HttpClientRegistry()
+        old = registry.get("jackett", 1, "http://localhost:9117", 30)
+        new = registry.get("jackett", 1, "http://192.168.1.100:9117", 30)
+        assert old is not new
+        await registry.aclose()
+        assert old.is_closed
+        assert new.is_closed
+
+    @pytest.mark.asyncio
+    async def test_invalidate_rebuilds_client(self):
+        """Test that invalidating an instance forces a new client."""
+        registry = HttpClientRegistry()
+        old = registry.get("jackett", 1, "http://localhost:9117", 30)
+        registry.invalidate("jackett", 1)
+        new = registry.get("jackett", 1, "http://localhost:9117", 30)
+        assert old is not new
+        await registry.aclose()
+        assert old.is_closed
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_clients(self):
+        """Test that closing the registry closes every client."""
+        registry = HttpClientRegistry(max_connections=2, max_keepalive_connections=1)
+        client = registry.get("prowlarr", 3, "http://localhost:9696", 30)
+        await registry.aclose()
+        assert client.is_closed
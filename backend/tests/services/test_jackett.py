@@ -0,0 +1,164 @@
+"""
+Tests for the Jackett service.
+"""
+
+from datetime import UTC, datetime, timedelta, timezone
+
+import httpx
+import pytest
+from app.services import JackettService
+from app.services.jackett import TorznabFeedParser, parse_pub_date
+
+TORZNAB_ITEM = """
+    <item>
+      <title>Ubuntu {n} Desktop</title>
+      <guid>https://tracker.example/details/{n}</guid>
+      <jackettindexer id="example">Example</jackettindexer>
+      <link>https://jackett.example/dl/{n}.torrent</link>
+      <pubDate>Thu, 25 Apr 2024 12:00:00 +0000</pubDate>
+      <size>{size}</size>
+      <category>4000</category>
+      <torznab:attr name="seeders" value="{n}" />
+      <torznab:attr name="peers" value="{peers}" />
+      <torznab:attr name="magneturl" value="magnet:?xt=urn:btih:{n:040d}" />
+    </item>"""
+
+
+def make_feed(count: int) -> str:
+    """Build a Torznab feed with `count` items."""
+    items = "".join(
+        TORZNAB_ITEM.format(n=n, size=1024 * (n + 1), peers=n + 3) for n in range(count)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<rss version="2.0" xmlns:torznab="http://torznab.com/schemas/2015/feed">'
+        f"<channel><title>Jackett</title>{items}</channel></rss>"
+    )
+
+
+class TestTorznabParsing:
+    """Tests for Torznab XML parsing."""
+
+    def test_parse_full_response(self):
+        """Test parsing a complete response."""
+        service = JackettService("http://jackett:9117", "key")
+        results = service._parse_torznab_response(make_feed(3), instance_name="Jackett")
+
+        assert [r.title for r in results] == [
+            "Ubuntu 0 Desktop",
+            "Ubuntu 1 Desktop",
+            "Ubuntu 2 Desktop",
+        ]
+        first = results[1]
+        assert first.seeders == 1
+        assert first.leechers == 3
+        assert first.size == 2048
+        assert first.indexer == "Example"
+        assert first.magnet_link == "magnet:?xt=urn:btih:" + "1".zfill(40)
+        assert first.infohash == "1".zfill(40)
+        assert first.date is not None
+
+    def test_chunked_feed_matches_full_parse(self):
+        """Test that feeding arbitrary chunks gives the same results as one buffer."""
+        service = JackettService("http://jackett:9117", "key")
+        body = make_feed(20).encode()
+
+        parser = TorznabFeedParser(lambda item: service._parse_item(item, "Jackett"))
+        for start in range(0, len(body), 37):
+            parser.feed(body[start : start + 37])
+        parser.close()
+
+        expected = service._parse_torznab_response(body, instance_name="Jackett")
+        assert parser.results == expected
+
+    def test_items_released_as_parsed(self):
+        """Test that converted items are dropped from the tree."""
+        service = JackettService("http://jackett:9117", "key")
+        parser = TorznabFeedParser(lambda item: service._parse_item(item, "Jackett"))
+        body = make_feed(50)
+
+        parser.feed(body[: len(body) // 2])
+        channel = parser._stack[1]
+        assert len(parser.results) > 0
+        # Only the item still being received is held in memory
+        assert len(channel.findall("item")) <= 1
+
+    def test_malformed_response_keeps_parsed_items(self):
+        """Test that items before a parse error are kept."""
+        service = JackettService("http://jackett:9117", "key")
+        body = make_feed(5)
+        truncated = body[: body.index("Ubuntu 3")] + "<<<"
+
+        results = service._parse_torznab_response(truncated, instance_name="Jackett")
+        assert len(results) == 3
+
+    def test_invalid_items_skipped_and_text_stripped(self):
+        """Test that items the response schema would reject are dropped at parse time."""
+        service = JackettService("http://jackett:9117", "key")
+        body = make_feed(2).replace('name="seeders" value="1"', 'name="seeders" value="-1"')
+        body = body.replace(
+            "<title>Ubuntu 0 Desktop</title>", "<title>\n  Ubuntu 0 Desktop </title>"
+        )
+
+        results = service._parse_torznab_response(body, instance_name="Jackett")
+        assert [r.title for r in results] == ["Ubuntu 0 Desktop"]
+
+
+class TestParsePubDate:
+    """Tests for parse_pub_date."""
+
+    def test_rfc822(self):
+        """Test the RFC 822 fast path, including non-UTC offsets."""
+        assert parse_pub_date("Thu, 25 Apr 2024 12:00:00 +0000") == datetime(
+            2024, 4, 25, 12, tzinfo=UTC
+        )
+        parsed = parse_pub_date(" Thu, 25 Apr 2024 12:00:00 -0530 ")
+        assert parsed == datetime(2024, 4, 25, 12, tzinfo=timezone(-timedelta(hours=5, minutes=30)))
+
+    def test_fallback_formats(self):
+        """Test the ISO and plain formats."""
+        assert parse_pub_date("2024-04-25T12:00:00+0200") == datetime(
+            2024, 4, 25, 12, tzinfo=timezone(timedelta(hours=2))
+        )
+        assert parse_pub_date("2024-04-25 12:00:00") == datetime(2024, 4, 25, 12)
+
+    def test_invalid(self):
+        """Test that unparseable dates give None."""
+        assert parse_pub_date("Thu, 31 Feb 2024 12:00:00 +0000") is None
+        assert parse_pub_date("yesterday") is None
+
+
+class TestJackettSearch:
+    """Tests for JackettService.search."""
+
+    @pytest.mark.asyncio
+    async def test_search_streams_response(self):
+        """Test that search parses a streamed response body."""
+        body = make_feed(10).encode()
+
+        async def chunks():
+            for start in range(0, len(body), 512):
+                yield body[start : start + 512]
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.params["q"] == "ubuntu"
+            return httpx.Response(200, content=chunks())
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            service = JackettService("http://jackett:9117", "key", client=client)
+            results = await service.search("ubuntu")
+
+        assert len(results) == 10
+
+    @pytest.mark.asyncio
+    async def test_search_http_error(self):
+        """Test that HTTP errors return nothing, or raise when asked to."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(500, text="boom")
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            service = JackettService("http://jackett:9117", "key", client=client)
+            assert await service.search("ubuntu") == []
+            with pytest.raises(httpx.HTTPStatusError):
+                await service.search("ubuntu", raise_on_error=True)
@@ -0,0 +1,39 @@
+"""
+Tests for the event loop lag monitor.
+"""
+
+import asyncio
+import time
+
+import pytest
+from app.services.loop_lag import EventLoopLagMonitor
+from app.services.metrics import get_metrics
+
+
+class TestEventLoopLagMonitor:
+    """Tests for EventLoopLagMonitor."""
+
+    @pytest.mark.asyncio
+    async def test_records_blocking_work(self):
+        """Test that time the loop spends blocked is observed as lag."""
+        lag = get_metrics().event_loop_lag_seconds
+        monitor = EventLoopLagMonitor(interval=0.01)
+        monitor.start()
+        assert monitor.running
+
+        await asyncio.sleep(0.02)
+        time.sleep(0.1)  # Blocks the loop, as CPU-bound work would
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+        assert not monitor.running
+        assert lag.count() >= 2
+        assert 'searcharr_event_loop_lag_seconds_bucket{le="0.05"}' in "".join(lag.render())
+        assert lag._sums[()] >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_stop_without_start(self):
+        """Test that stopping an idle monitor is a no-op."""
+        monitor = EventLoopLagMonitor(interval=0.01)
+        await monitor.stop()
+        assert not monitor.running
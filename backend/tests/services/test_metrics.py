@@ -0,0 +1,76 @@
+"""
+Tests for the in-process metrics.
+"""
+
+from app.services.metrics import Counter, Histogram, SearchMetrics
+
+
+class TestCounter:
+    """Tests for Counter."""
+
+    def test_counts_per_label_set(self):
+        """Test that each label set counts separately and renders sorted."""
+        counter = Counter("requests_total", "Requests.", ("instance",))
+        counter.inc("b")
+        counter.inc("a", amount=2)
+        counter.inc("b")
+
+        assert list(counter.render()) == [
+            "# HELP requests_total Requests.",
+            "# TYPE requests_total counter",
+            'requests_total{instance="a"} 2',
+            'requests_total{instance="b"} 2',
+        ]
+
+    def test_label_values_escaped(self):
+        """Test that quotes, backslashes and newlines in label values are escaped."""
+        counter = Counter("errors_total", "Errors.", ("instance",))
+        counter.inc('My "home"\\\nserver')
+
+        assert list(counter.render())[-1] == r'errors_total{instance="My \"home\"\\\nserver"} 1'
+
+
+class TestHistogram:
+    """Tests for Histogram."""
+
+    def test_cumulative_buckets(self):
+        """Test that buckets are cumulative and bounds are inclusive."""
+        histogram = Histogram("latency_seconds", "Latency.", ("instance",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, "jackett")
+
+        assert list(histogram.render())[2:] == [
+            'latency_seconds_bucket{instance="jackett",le="0.1"} 2',
+            'latency_seconds_bucket{instance="jackett",le="1.0"} 3',
+            'latency_seconds_bucket{instance="jackett",le="+Inf"} 4',
+            'latency_seconds_sum{instance="jackett"} 3.65',
+            'latency_seconds_count{instance="jackett"} 4',
+        ]
+
+    def test_time_observes_block(self):
+        """Test that the timer records one observation, even when the block raises."""
+        histogram = Histogram("stage_seconds", "Stage.", ("stage",))
+        with histogram.time("sort"):
+            pass
+        try:
+            with histogram.time("sort"):
+                raise ValueError
+        except ValueError:
+            pass
+
+        assert histogram.count("sort") == 2
+
+
+def test_render_and_clear():
+    """Test that the exposition lists every metric and clear() drops samples."""
+    metrics = SearchMetrics()
+    metrics.searches.inc("miss")
+
+    text = metrics.render()
+    assert text.endswith("\n")
+    assert "# TYPE searcharr_instance_request_duration_seconds histogram" in text
+    assert 'searcharr_searches_total{cache="miss"} 1' in text
+    assert f'searcharr_worker_info{{worker="{metrics.worker}"}} 1' in text
+
+    metrics.clear()
+    assert 'searcharr_searches_total{cache="miss"}' not in metrics.render()
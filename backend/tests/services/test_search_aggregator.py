@@ -0,0 +1,305 @@
+"""
+Tests for the search aggregator.
+"""
+
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+from app.models import JackettInstance, ProwlarrInstance
+from app.schemas import SearchCategory, SortBy, SortOrder
+from app.services import JackettService, SearchAggregator
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.invalidation import invalidate_local
+from app.services.metrics import get_metrics
+from app.services.search_cache import SearchResultCache, get_search_cache
+from app.services.server_timing import ServerTiming, collect_timings
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tests.factories import make_result
+
+
+class TestSearchAggregatorCache:
+    """Tests for result caching in SearchAggregator."""
+
+    @pytest.mark.asyncio
+    async def test_resort_and_refilter_served_from_cache(
+        self, db_session: AsyncSession, jackett_instance: JackettInstance, monkeypatch
+    ):
+        """Test that changing only filters or sort order does not re-query instances."""
+        calls = 0
+
+        async def fake_search_jackett(self, instance, query, category):
+            nonlocal calls
+            calls += 1
+            return [make_result("small", 5, size=100), make_result("big", 50, size=10_000)], None
+
+        monkeypatch.setattr(SearchAggregator, "_search_jackett", fake_search_jackett)
+        aggregator = SearchAggregator(
+            cache=SearchResultCache(ttl_seconds=60, max_entries=10, max_results=100)
+        )
+
+        outcome = await aggregator.search("Ubuntu", SearchCategory.ALL)
+        assert [r.title for r in outcome.results] == ["big", "small"]
+        assert outcome.sources_queried == 1
+
+        outcome = await aggregator.search("ubuntu", sort_by=SortBy.SIZE, sort_order=SortOrder.ASC)
+        assert [r.title for r in outcome.results] == ["small", "big"]
+
+        outcome = await aggregator.search("ubuntu", min_seeders=10)
+        assert [r.title for r in outcome.results] == ["big"]
+
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_results_with_errors_cached_briefly(
+        self, db_session: AsyncSession, jackett_instance: JackettInstance, monkeypatch
+    ):
+        """Test that partial results are cached for the partial TTL, with their errors."""
+        calls = 0
+
+        async def fake_search_jackett(self, instance, query, category):
+            nonlocal calls
+            calls += 1
+            return [], "Error searching Test Jackett: boom"
+
+        monkeypatch.setattr(SearchAggregator, "_search_jackett", fake_search_jackett)
+        uncached = SearchAggregator(
+            cache=SearchResultCache(ttl_seconds=60, partial_ttl_seconds=0, max_results=100)
+        )
+        await uncached.search("ubuntu")
+        await uncached.search("ubuntu")
+        assert calls == 2
+
+        aggregator = SearchAggregator(
+            cache=SearchResultCache(ttl_seconds=60, partial_ttl_seconds=10, max_results=100)
+        )
+        await aggregator.search("ubuntu")
+        outcome = await aggregator.search("ubuntu")
+        assert outcome.errors == ["Error searching Test Jackett: boom"]
+        outcome = await aggregator.search("ubuntu", sort_by=SortBy.SIZE)
+        assert outcome.errors == ["Error searching Test Jackett: boom"]
+        assert calls == 3
+
+    @pytest.mark.asyncio
+    async def test_search_with_open_circuit_cached(
+        self,
+        db_session: AsyncSession,
+        jackett_instance: JackettInstance,
+        prowlarr_instance: ProwlarrInstance,
+        monkeypatch,
+    ):
+        """Test that an instance skipped by its circuit does not stop the search being cached."""
+        calls = 0
+
+        async def fake_search_prowlarr(self, instance, query, category):
+            nonlocal calls
+            calls += 1
+            return [make_result("healthy", 5, source_type="prowlarr")], None
+
+        async def fake_probe(source_type, instance):
+            return False
+
+        monkeypatch.setattr(SearchAggregator, "_search_prowlarr", fake_search_prowlarr)
+        monkeypatch.setattr(SearchAggregator, "_probe_instance", staticmethod(fake_probe))
+        breaker = CircuitBreaker(failure_threshold=1, retry_seconds=60)
+        breaker.record_failure(("jackett", jackett_instance.id))
+        aggregator = SearchAggregator(
+            cache=SearchResultCache(ttl_seconds=60, max_results=100), breaker=breaker
+        )
+
+        first = await aggregator.search("ubuntu", limit=1)
+        second = await aggregator.search("ubuntu", limit=1, offset=1)
+
+        assert calls == 1
+        assert [r.title for r in first.results] == ["healthy"]
+        assert second.results == []
+        assert second.errors == ["Skipped Test Jackett: instance is unavailable"]
+        assert get_metrics().searches.value("hit") == 1
+
+    @pytest.mark.asyncio
+    async def test_results_of_instance_changed_mid_search_not_cached(
+        self, db_session: AsyncSession, jackett_instance: JackettInstance, monkeypatch
+    ):
+        """Test that a search running when its instance is edited does not cache old results."""
+        calls = 0
+
+        async def fake_search_jackett(self, instance, query, category):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                # The instance is edited while its search is running
+                invalidate_local("jackett", instance.id)
+            return [make_result(f"call{calls}")], None
+
+        monkeypatch.setattr(SearchAggregator, "_search_jackett", fake_search_jackett)
+        aggregator = SearchAggregator(cache=get_search_cache())
+
+        first = await aggregator.search("ubuntu")
+        second = await aggregator.search("ubuntu")
+
+        assert [r.title for r in first.results] == ["call1"]
+        assert [r.title for r in second.results] == ["call2"]
+        assert calls == 2
+
+
+class TestSearchAggregatorCircuitBreaker:
+    """Tests for skipping failing instances in SearchAggregator."""
+
+    @pytest.mark.asyncio
+    async def test_failing_instance_skipped_then_recovers(
+        self, db_session: AsyncSession, jackett_instance: JackettInstance, monkeypatch
+    ):
+        """Test that an instance is skipped after repeated failures and closes on a probe."""
+        calls = 0
+
+        async def fake_search_jackett(self, instance, query, category):
+            nonlocal calls
+            calls += 1
+            return [], "Error searching Test Jackett: ConnectTimeout"
+
+        probe_result = False
+
+        async def fake_probe(source_type, instance):
+            return probe_result
+
+        monkeypatch.setattr(SearchAggregator, "_search_jackett", fake_search_jackett)
+        monkeypatch.setattr(SearchAggregator, "_probe_instance", staticmethod(fake_probe))
+        aggregator = SearchAggregator(
+            cache=SearchResultCache(ttl_seconds=0),
+            breaker=CircuitBreaker(failure_threshold=2, retry_seconds=0),
+        )
+
+        await aggregator.search("ubuntu")
+        await aggregator.search("ubuntu")
+        assert calls == 2
+
+        # The circuit is open: the instance is not queried and reported as skipped
+        outcome = await aggregator.search("ubuntu")
+        assert calls == 2
+        assert outcome.sources_queried == 1
+        assert outcome.errors == ["Skipped Test Jackett: instance is unavailable"]
+        # ...and its background probe fails, so the circuit stays open
+        await asyncio.sleep(0.01)
+        await aggregator.search("ubuntu")
+        assert calls == 2
+        await asyncio.sleep(0.01)
+
+        # Once a background probe succeeds the instance is queried again
+        probe_result = True
+        await aggregator.search("ubuntu")
+        await asyncio.sleep(0.01)
+        await aggregator.search("ubuntu")
+        assert calls == 3
+
+
+class TestSearchAggregatorCoalescing:
+    """Tests for sharing upstream requests between concurrent searches."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_searches_share_upstream_request(
+        self, db_session: AsyncSession, jackett_instance: JackettInstance, monkeypatch
+    ):
+        """Test that identical in-flight searches query each instance once."""
+        calls = 0
+
+        async def fake_search_jackett(self, instance, query, category):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return [make_result("small", 5, size=100), make_result("big", 50, size=10_000)], None
+
+        monkeypatch.setattr(SearchAggregator, "_search_jackett", fake_search_jackett)
+        aggregator = SearchAggregator(cache=SearchResultCache(ttl_seconds=0))
+
+        by_seeders, by_size = await asyncio.gather(
+            aggregator.search("Ubuntu"),
+            aggregator.search("ubuntu ", sort_by=SortBy.SIZE, sort_order=SortOrder.ASC),
+        )
+
+        assert calls == 1
+        # Each search still gets its own sorted view
+        assert [r.title for r in by_seeders.results] == ["big", "small"]
+        assert [r.title for r in by_size.results] == ["small", "big"]
+
+    @pytest.mark.asyncio
+    async def test_coalesced_searches_each_report_instance_timings(
+        self, db_session: AsyncSession, jackett_instance: JackettInstance, monkeypatch
+    ):
+        """Test that a request joining another's search still gets the instance's timings."""
+        calls = 0
+
+        async def fake_search(self, query, category, instance_name, raise_on_error=False):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return [make_result("r1")]
+
+        monkeypatch.setattr(JackettService, "search", fake_search)
+        aggregator = SearchAggregator(cache=SearchResultCache(ttl_seconds=0))
+
+        async def timed_search() -> ServerTiming:
+            with collect_timings() as timing:
+                await aggregator.search("ubuntu")
+            return timing
+
+        leader, follower = await asyncio.gather(timed_search(), timed_search())
+
+        assert calls == 1
+        name = f"jackett-{jackett_instance.id}"
+        for timing in (leader, follower):
+            assert timing.entries[name].duration_ms >= 40
+            assert f"{name}-parse" in timing.entries
+
+
+class TestSearchAggregatorSorting:
+    """Tests for result sorting."""
+
+    def test_date_sort_mixes_naive_aware_and_missing_dates(self, db_session: AsyncSession):
+        """Test that dates with and without a timezone sort together, missing dates last."""
+        aware = make_result("aware", 1, size=1)._replace(date=datetime(2024, 4, 25, 12, tzinfo=UTC))
+        naive = make_result("naive", 1, size=1)._replace(date=datetime(2024, 4, 26))
+        missing = make_result("missing", 1, size=1)
+
+        aggregator = SearchAggregator()
+        ordered = aggregator._sort_results([aware, missing, naive], SortBy.DATE, SortOrder.DESC)
+
+        assert [r.title for r in ordered] == ["naive", "aware", "missing"]
+
+    @pytest.mark.asyncio
+    async def test_sources_sorted_as_they_arrive_and_merged(
+        self,
+        db_session: AsyncSession,
+        jackett_instance: JackettInstance,
+        prowlarr_instance: ProwlarrInstance,
+        monkeypatch,
+    ):
+        """Test that a fast instance is filtered and sorted before a slow one answers."""
+        prowlarr_answered = False
+        sorted_early: list[bool] = []
+
+        async def fake_search_jackett(self, instance, query, category):
+            return [make_result("j-low", 5, size=1), make_result("j-high", 30, size=1)], None
+
+        async def fake_search_prowlarr(self, instance, query, category):
+            nonlocal prowlarr_answered
+            await asyncio.sleep(0.05)
+            prowlarr_answered = True
+            return [make_result("p-mid", 20, size=1), make_result("p-dead", 0, size=1)], None
+
+        original_filters = SearchAggregator._apply_filters
+
+        def tracking_filters(self, results, min_seeders=0, max_size=None):
+            sorted_early.append(not prowlarr_answered)
+            return original_filters(self, results, min_seeders=min_seeders, max_size=max_size)
+
+        monkeypatch.setattr(SearchAggregator, "_search_jackett", fake_search_jackett)
+        monkeypatch.setattr(SearchAggregator, "_search_prowlarr", fake_search_prowlarr)
+        monkeypatch.setattr(SearchAggregator, "_apply_filters", tracking_filters)
+        aggregator = SearchAggregator(cache=SearchResultCache(ttl_seconds=0))
+
+        outcome = await aggregator.search("ubuntu", min_seeders=1)
+
+        assert sorted_early == [True, False]
+        assert [r.title for r in outcome.results] == ["j-high", "p-mid", "j-low"]
+        assert outcome.total_results == 3
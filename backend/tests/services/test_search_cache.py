@@ -0,0 +1,221 @@
+"""
+Tests for the search result cache.
+"""
+
+import random
+
+import pytest
+from app.schemas import SearchCategory, SortBy, SortOrder
+from app.services.search_cache import (
+    MAX_VIEWS_PER_ENTRY,
+    SearchResultCache,
+    SearchView,
+    SearchViewKey,
+    SourceResults,
+)
+
+from tests.factories import make_result
+
+
+def make_sources(*titles: str) -> list[SourceResults]:
+    """Wrap results for the given titles as a single instance's output."""
+    return [
+        SourceResults(
+            source_type="jackett",
+            instance_id=1,
+            name="Test Jackett",
+            results=[make_result(title) for title in titles],
+        )
+    ]
+
+
+class TestSearchView:
+    """Tests for SearchView."""
+
+    @pytest.mark.parametrize("reverse", [False, True])
+    def test_pages_match_full_sort(self, reverse: bool):
+        """Test that top-K pages equal slices of a stable full sort, ties included."""
+        rng = random.Random(42)
+        results = [make_result(f"r{n}", seeders=rng.randint(0, 20)) for n in range(500)]
+        expected = sorted(results, key=lambda r: r.seeders, reverse=reverse)
+
+        view = SearchView(results, key=lambda r: r.seeders, reverse=reverse)
+        for offset, limit in [(0, 10), (10, 10), (0, 5), (30, 20), (100, 50), (0, 400)]:
+            assert view.page(offset, limit) == expected[offset : offset + limit]
+
+        assert view.page(490) == expected[490:]
+        assert len(view) == 500
+
+    def test_first_page_does_not_sort_everything(self, monkeypatch):
+        """Test that an early page is selected without a full sort."""
+        results = [make_result(f"r{n}", seeders=n) for n in range(100)]
+        view = SearchView(results, key=lambda r: r.seeders, reverse=True)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("full sort")
+
+        monkeypatch.setattr(view, "all", fail)
+        assert [r.seeders for r in view.page(0, 3)] == [99, 98, 97]
+
+    @pytest.mark.parametrize("reverse", [False, True])
+    def test_sorted_runs_match_flat_view(self, reverse: bool):
+        """Test that merging per-instance sorted runs equals sorting the concatenation."""
+        rng = random.Random(7)
+        runs = [
+            [make_result(f"i{i}-r{n}", seeders=rng.randint(0, 10)) for n in range(size)]
+            for i, size in enumerate([200, 0, 150, 1])
+        ]
+        flat = SearchView(
+            [r for run in runs for r in run], key=lambda r: r.seeders, reverse=reverse
+        )
+        merged = SearchView.from_sorted_runs(
+            [sorted(run, key=lambda r: r.seeders, reverse=reverse) for run in runs],
+            key=lambda r: r.seeders,
+            reverse=reverse,
+        )
+
+        assert len(merged) == len(flat) == 351
+        for offset, limit in [(0, 10), (10, 10), (50, 25), (0, 300)]:
+            assert merged.page(offset, limit) == flat.page(offset, limit)
+        assert merged.all() == flat.all()
+
+
+class TestSearchResultCache:
+    """Tests for SearchResultCache."""
+
+    def test_key_normalizes_query_and_ids(self):
+        """Test that equivalent searches share a cache key."""
+        first = SearchResultCache.make_key("  Ubuntu   ISO ", SearchCategory.ALL, [2, 1], [3])
+        second = SearchResultCache.make_key("ubuntu iso", SearchCategory.ALL, [1, 2], [3])
+        assert first == second
+
+    def test_key_differs_by_category(self):
+        """Test that category is part of the key."""
+        all_key = SearchResultCache.make_key("ubuntu", SearchCategory.ALL, [1], [])
+        software_key = SearchResultCache.make_key("ubuntu", SearchCategory.SOFTWARE, [1], [])
+        assert all_key != software_key
+
+    def test_get_returns_stored_results(self):
+        """Test a basic set/get roundtrip."""
+        cache = SearchResultCache(ttl_seconds=60, max_entries=10, max_results=100)
+        key = cache.make_key("ubuntu", SearchCategory.ALL, [1], [])
+        sources = make_sources("a", "b")
+        cache.set(key, sources)
+        assert cache.get(key) == sources
+
+    def test_expired_entry_is_a_miss(self, monkeypatch):
+        """Test that entries expire after the TTL."""
+        now = 1000.0
+        monkeypatch.setattr("app.services.search_cache.time.monotonic", lambda: now)
+        cache = SearchResultCache(ttl_seconds=30, max_entries=10, max_results=100)
+        key = cache.make_key("ubuntu", SearchCategory.ALL, [1], [])
+        cache.set(key, make_sources("a"))
+
+        now = 1031.0
+        assert cache.get(key) is None
+        assert len(cache) == 0
+
+    def test_lru_eviction_by_entry_count(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = SearchResultCache(ttl_seconds=60, max_entries=2, max_results=100)
+        first = cache.make_key("first", SearchCategory.ALL, [1], [])
+        second = cache.make_key("second", SearchCategory.ALL, [1], [])
+        third = cache.make_key("third", SearchCategory.ALL, [1], [])
+
+        cache.set(first, make_sources("a"))
+        cache.set(second, make_sources("b"))
+        cache.get(first)  # first is now most recently used
+        cache.set(third, make_sources("c"))
+
+        assert cache.get(first) is not None
+        assert cache.get(second) is None
+        assert cache.get(third) is not None
+
+    def test_eviction_by_result_budget(self):
+        """Test that the total result cap evicts old entries."""
+        cache = SearchResultCache(ttl_seconds=60, max_entries=10, max_results=3)
+        first = cache.make_key("first", SearchCategory.ALL, [1], [])
+        second = cache.make_key("second", SearchCategory.ALL, [1], [])
+
+        cache.set(first, make_sources("a", "b"))
+        cache.set(second, make_sources("c", "d"))
+
+        assert cache.get(first) is None
+        assert cache.get(second) is not None
+
+    def test_oversized_result_set_not_cached(self):
+        """Test that a result set larger than the whole budget is skipped."""
+        cache = SearchResultCache(ttl_seconds=60, max_entries=10, max_results=1)
+        key = cache.make_key("ubuntu", SearchCategory.ALL, [1], [])
+        cache.set(key, make_sources("a", "b"))
+        assert cache.get(key) is None
+
+    def test_disabled_cache_stores_nothing(self):
+        """Test that a zero TTL disables caching."""
+        cache = SearchResultCache(ttl_seconds=0, max_entries=10, max_results=100)
+        key = cache.make_key("ubuntu", SearchCategory.ALL, [1], [])
+        cache.set(key, make_sources("a"))
+        assert cache.get(key) is None
+
+    def test_views_stored_with_their_search(self):
+        """Test that views are cached per search and dropped with it."""
+        cache = SearchResultCache(ttl_seconds=60, max_entries=10, max_results=100)
+        key = SearchResultCache.make_key("ubuntu", SearchCategory.ALL, [1], [])
+        view_key = SearchViewKey(0, None, SortBy.SEEDERS, SortOrder.DESC, False)
+        view = SearchView([make_result("a")], key=lambda r: r.seeders)
+
+        # No view without the search itself
+        cache.set_view(key, view_key, view)
+        assert cache.get_view(key, view_key) is None
+
+        cache.set(key, make_sources("a"))
+        cache.set_view(key, view_key, view)
+        assert cache.get_view(key, view_key) is view
+        assert cache.get_view(key, view_key._replace(sort_order=SortOrder.ASC)) is None
+
+        cache.clear()
+        assert cache.get_view(key, view_key) is None
+
+    def test_views_per_entry_bounded(self):
+        """Test that only the most recently used views are kept."""
+        cache = SearchResultCache(ttl_seconds=60, max_entries=10, max_results=100)
+        key = SearchResultCache.make_key("ubuntu", SearchCategory.ALL, [1], [])
+        cache.set(key, make_sources("a"))
+
+        view_keys = [
+            SearchViewKey(n, None, SortBy.SEEDERS, SortOrder.DESC, False)
+            for n in range(MAX_VIEWS_PER_ENTRY + 1)
+        ]
+        for view_key in view_keys:
+            cache.set_view(key, view_key, SearchView([], key=lambda r: r.seeders))
+
+        assert cache.get_view(key, view_keys[0]) is None
+        assert cache.get_view(key, view_keys[-1]) is not None
+
+    def test_views_count_against_result_budget(self):
+        """Test that views use the result budget, evicting other searches, then older views."""
+        cache = SearchResultCache(ttl_seconds=60, max_entries=10, max_results=16)
+        other = SearchResultCache.make_key("other", SearchCategory.ALL, [1], [])
+        key = SearchResultCache.make_key("ubuntu", SearchCategory.ALL, [1], [])
+        titles = [f"r{n}" for n in range(4)]
+        cache.set(other, make_sources(*titles))
+        cache.set(key, make_sources(*titles))
+
+        by_seeders, by_name = (
+            SearchViewKey(0, None, sort_by, SortOrder.DESC, False)
+            for sort_by in (SortBy.SEEDERS, SortBy.NAME)
+        )
+        view = SearchView([make_result(title) for title in titles], key=lambda r: r.seeders)
+        assert view.size == 5
+
+        # 4 + 4 + 5 results fit; a second view (5 more) evicts the other search
+        cache.set_view(key, by_seeders, view)
+        assert cache.get(other) is not None
+        cache.set_view(key, by_name, view)
+        assert cache.get(other) is None
+
+        # A third view only fits without the least recently used one
+        cache.set_view(key, by_seeders._replace(min_seeders=5), view)
+        assert cache.get_view(key, by_seeders) is None
+        assert cache.get_view(key, by_name) is not None
+        assert cache._total_results == 4 + 5 + 5
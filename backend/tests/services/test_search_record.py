@@ -0,0 +1,110 @@
+"""
+Tests for the internal search record.
+"""
+
+from datetime import UTC, datetime
+
+from app.schemas import SearchCategory, SearchResponse, SearchResult, SearchStreamResults
+from app.services.search_aggregator import StreamResults
+from app.services.search_record import SearchRecord, SearchRecordSource
+from pydantic_core import to_json
+
+
+def make_record(**overrides) -> SearchRecord:
+    """Build a fully populated record."""
+    fields = {
+        "id": "abc123",
+        "title": "Ubuntu 24.04 Desktop",
+        "source": "Test Jackett",
+        "source_type": "jackett",
+        "indexer": "test",
+        "size": 1024,
+        "size_formatted": "1.0 KB",
+        "seeders": 10,
+        "leechers": 2,
+        "date": datetime(2024, 4, 25, 12, tzinfo=UTC),
+        "category": "Software",
+        "magnet_link": "magnet:?xt=urn:btih:" + "a" * 40,
+        "torrent_url": "https://jackett.example/dl/1.torrent",
+        "info_url": "https://tracker.example/details/1",
+        "infohash": "a" * 40,
+    }
+    fields.update(overrides)
+    return SearchRecord(**fields)
+
+
+class TestSearchRecord:
+    """Tests for SearchRecord."""
+
+    def test_to_schema_matches_validated_model(self):
+        """Test that conversion without validation serializes like a validated model."""
+        record = make_record()
+        converted = record.to_schema()
+
+        assert isinstance(converted, SearchResult)
+        assert converted.model_dump() == SearchResult(**record._asdict()).model_dump()
+        assert converted.model_dump_json() == SearchResult(**record._asdict()).model_dump_json()
+
+    def test_to_schema_converts_sources(self):
+        """Test that merged copies are converted to the response schema too."""
+        record = make_record(
+            sources=(
+                SearchRecordSource("Jackett", "jackett", "a", 10, 2),
+                SearchRecordSource("Prowlarr", "prowlarr", "b", 4, 0),
+            )
+        )
+        expected = SearchResult(
+            **{**record._asdict(), "sources": [s._asdict() for s in record.sources or ()]}
+        )
+
+        assert record.to_schema().model_dump() == expected.model_dump()
+
+    def test_to_dict_serializes_like_schema(self):
+        """Test that the fast JSON path produces the same bytes as the response schema."""
+        records = [
+            make_record(),
+            make_record(id="naive", date=datetime(2024, 4, 26), title="Ünïcode ✓"),
+            make_record(id="bare", date=None, magnet_link=None, infohash=None),
+            make_record(sources=(SearchRecordSource("Jackett", "jackett", "a", 10, 2),)),
+        ]
+        response = SearchResponse(
+            query="ubuntu",
+            category=SearchCategory.SOFTWARE,
+            total_results=4,
+            results=[record.to_schema() for record in records],
+            sources_queried=2,
+            errors=["Timed out"],
+            partial=True,
+            limit=4,
+        )
+        fast = to_json(
+            {
+                "query": "ubuntu",
+                "category": SearchCategory.SOFTWARE,
+                "total_results": 4,
+                "results": [record.to_dict() for record in records],
+                "sources_queried": 2,
+                "errors": ["Timed out"],
+                "partial": True,
+                "offset": 0,
+                "limit": 4,
+                "timings": None,
+            }
+        )
+
+        assert fast.decode() == response.model_dump_json()
+
+    def test_stream_results_serialize_like_schema(self):
+        """Test that streamed results serialize like the stream event schema."""
+        records = [
+            make_record(),
+            make_record(sources=(SearchRecordSource("Jackett", "jackett", "a", 10, 2),)),
+        ]
+        event = SearchStreamResults(
+            source="Test Jackett",
+            source_type="jackett",
+            results=[record.to_schema() for record in records],
+        )
+
+        fast = to_json(StreamResults("Test Jackett", "jackett", records).to_dict())
+        assert fast.decode() == event.model_dump_json()
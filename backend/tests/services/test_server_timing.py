@@ -0,0 +1,47 @@
+"""
+Tests for per-request Server-Timing collection.
+"""
+
+import asyncio
+
+import pytest
+from app.services.server_timing import ServerTiming, collect_timings, record_timing
+
+
+def test_header_value():
+    """Test that repeated stages add up and descriptions are quoted."""
+    timing = ServerTiming()
+    timing.add("filter", 0.001)
+    timing.add("filter", 0.002)
+    timing.add("jackett-1", 0.25, 'My "home" Jackett network')
+
+    assert timing.header_value() == (
+        'filter;dur=3.0, jackett-1;desc="My \\"home\\" Jackett network";dur=250.0'
+    )
+    assert timing.as_dict() == {"filter": 3.0, "jackett-1": 250.0}
+
+
+def test_header_value_percent_encodes_non_ascii():
+    """Test that descriptions beyond printable ASCII are percent-encoded."""
+    timing = ServerTiming()
+    timing.add("jackett-1", 0.25, "Jackett 日本 100% network")
+
+    value = timing.header_value()
+    assert value == 'jackett-1;desc="Jackett %E6%97%A5%E6%9C%AC 100%25 network";dur=250.0'
+    value.encode("latin-1")
+
+
+@pytest.mark.asyncio
+async def test_collects_from_child_tasks_only_while_active():
+    """Test that tasks started by the request record into its timings."""
+
+    async def work() -> None:
+        record_timing("sort", 0.001)
+
+    record_timing("sort", 1.0)  # No request collecting: ignored
+
+    with collect_timings() as timing:
+        await asyncio.gather(asyncio.create_task(work()), asyncio.create_task(work()))
+
+    record_timing("sort", 1.0)
+    assert timing.as_dict() == {"sort": 2.0}
@@ -0,0 +1,216 @@
+"""
+Tests for state shared between worker processes.
+"""
+
+import asyncio
+import json
+from datetime import UTC, datetime
+
+import pytest
+from app.schemas import SearchCategory
+from app.services.health_monitor import HealthMonitor, HealthStatus
+from app.services.search_record import SearchRecord, SearchRecordSource
+from app.services.shared_state import (
+    SharedState,
+    decode_records,
+    encode_records,
+    shared_search_key,
+)
+
+from tests.factories import make_result
+
+KEY = shared_search_key("Ubuntu", SearchCategory.ALL, "jackett", 1)
+INSTANCE = (1, "Test Jackett")
+
+
+class TestSharedState:
+    """Tests for SharedState (each instance stands in for one worker)."""
+
+    def test_key_normalizes_query(self):
+        """Test that queries differing in case and spacing share a key."""
+        assert shared_search_key(" ubuntu ", SearchCategory.ALL, "jackett", 1) == KEY
+        assert shared_search_key("ubuntu", SearchCategory.ALL, "jackett", 2) != KEY
+
+    @pytest.mark.asyncio
+    async def test_results_shared_between_workers(self, tmp_path):
+        """Test that a search one worker ran is answered from the store by another."""
+        first = SharedState(tmp_path / "state", result_ttl_seconds=60)
+        second = SharedState(tmp_path / "state", result_ttl_seconds=60)
+        calls = 0
+
+        async def search() -> tuple[list[SearchRecord], str | None]:
+            nonlocal calls
+            calls += 1
+            return [make_result("Ubuntu")], None
+
+        await first.coalesce(KEY, "jackett", INSTANCE, search)
+        results, error = await second.coalesce(KEY, "jackett", INSTANCE, search)
+
+        assert [r.title for r in results] == ["Ubuntu"]
+        assert error is None
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_searches_coalesced(self, tmp_path):
+        """Test that a worker waits for the search another worker is running."""
+        first = SharedState(tmp_path / "state", result_ttl_seconds=0)
+        second = SharedState(tmp_path / "state", result_ttl_seconds=0)
+        calls = 0
+
+        async def search() -> tuple[list[SearchRecord], str | None]:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.2)
+            return [make_result("Ubuntu")], None
+
+        (first_results, _), (second_results, _) = await asyncio.gather(
+            first.coalesce(KEY, "jackett", INSTANCE, search),
+            second.coalesce(KEY, "jackett", INSTANCE, search),
+        )
+
+        assert first_results == second_results
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_search_not_shared(self, tmp_path):
+        """Test that a failed search is retried by the next worker."""
+        first = SharedState(tmp_path / "state", result_ttl_seconds=60)
+        second = SharedState(tmp_path / "state", result_ttl_seconds=60)
+
+        async def fail() -> tuple[list[SearchRecord], str | None]:
+            return [], "timed out"
+
+        async def succeed() -> tuple[list[SearchRecord], str | None]:
+            return [make_result("Ubuntu")], None
+
+        assert await first.coalesce(KEY, "jackett", INSTANCE, fail) == ([], "timed out")
+        results, error = await second.coalesce(KEY, "jackett", INSTANCE, succeed)
+        assert len(results) == 1
+        assert error is None
+
+    @pytest.mark.asyncio
+    async def test_results_of_changed_instance_not_stored(self, tmp_path):
+        """Test that results searched across a configuration change are dropped."""
+        worker = SharedState(tmp_path / "state", result_ttl_seconds=60)
+        editor = SharedState(tmp_path / "state", result_ttl_seconds=60)
+
+        async def search_during_edit() -> tuple[list[SearchRecord], str | None]:
+            await editor.publish_invalidation("jackett", 1)
+            return [make_result("Old")], None
+
+        await worker.coalesce(KEY, "jackett", INSTANCE, search_during_edit)
+
+        async def search() -> tuple[list[SearchRecord], str | None]:
+            return [make_result("New")], None
+
+        results, _ = await editor.coalesce(KEY, "jackett", INSTANCE, search)
+        assert [r.title for r in results] == ["New"]
+
+    @pytest.mark.asyncio
+    async def test_lease_held_by_one_worker(self, tmp_path):
+        """Test that a lease is exclusive until released, and renewable by its owner."""
+        first = SharedState(tmp_path / "state")
+        second = SharedState(tmp_path / "state")
+
+        assert await first.acquire_lease("probe", 60)
+        assert await first.acquire_lease("probe", 60)
+        assert not await second.acquire_lease("probe", 60)
+
+        await first.release_lease("probe")
+        assert await second.acquire_lease("probe", 60)
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_taken_over(self, tmp_path):
+        """Test that a lease its owner stopped renewing passes to another worker."""
+        first = SharedState(tmp_path / "state")
+        second = SharedState(tmp_path / "state")
+
+        assert await first.acquire_lease("probe", 0.01)
+        await asyncio.sleep(0.02)
+        assert await second.acquire_lease("probe", 60)
+
+    @pytest.mark.asyncio
+    async def test_invalidations_applied_by_other_workers(self, tmp_path):
+        """Test that workers apply each other's invalidations, but not their own."""
+        first = SharedState(tmp_path / "state")
+        second = SharedState(tmp_path / "state")
+        first_seen: list[tuple[str, int]] = []
+        second_seen: list[tuple[str, int]] = []
+
+        await first.publish_invalidation("jackett", 1)
+        await second.publish_invalidation("client", 2)
+        await first.apply_invalidations(lambda *target: first_seen.append(target))
+        await second.apply_invalidations(lambda *target: second_seen.append(target))
+
+        assert first_seen == [("client", 2)]
+        assert second_seen == [("jackett", 1)]
+
+        # Already applied
+        await second.apply_invalidations(lambda *target: second_seen.append(target))
+        assert second_seen == [("jackett", 1)]
+
+    @pytest.mark.asyncio
+    async def test_health_shared_and_invalidated(self, tmp_path):
+        """Test that statuses are shared until their target changes."""
+        first = SharedState(tmp_path / "state")
+        second = SharedState(tmp_path / "state")
+        status = HealthStatus("online", 3, 12.5, datetime.now(UTC))
+
+        await first.put_health(("jackett", 1), status.to_dict())
+        assert await second.get_health() == {("jackett", 1): status.to_dict()}
+
+        await second.publish_invalidation("jackett", 1)
+        assert await first.get_health() == {}
+
+
+class TestSharedHealthMonitor:
+    """Tests for HealthMonitor with shared state."""
+
+    @pytest.mark.asyncio
+    async def test_one_worker_probes(self, tmp_path):
+        """Test that only the lease holder probes; others read its statuses."""
+        leader = HealthMonitor(shared=SharedState(tmp_path / "state"))
+        follower = HealthMonitor(shared=SharedState(tmp_path / "state"))
+
+        assert await leader._acquire_probe_lease()
+        assert not await follower._acquire_probe_lease()
+
+        status = HealthStatus("online", 3, 12.5, datetime.now(UTC))
+        leader.record("jackett", 1, status)
+        await asyncio.gather(*leader._publishing)
+
+        await follower.sync_shared()
+        assert follower._statuses == {("jackett", 1): status}
+
+
+class TestSharedStateStorage:
+    """Tests for how SharedState stores values."""
+
+    def test_records_round_trip_as_json(self):
+        """Test that records, with dates and merged sources, survive encoding."""
+        record = make_result("Ubuntu")._replace(
+            date=datetime(2024, 4, 25, 12, 0, tzinfo=UTC),
+            sources=(SearchRecordSource("Test Jackett", "jackett", "1337x", 10, 2),),
+        )
+
+        text = encode_records([record, make_result("Debian")])
+        assert json.loads(text)[0][1] == "Ubuntu"
+        assert decode_records(text) == [record, make_result("Debian")]
+
+    def test_writable_directory_refused(self, tmp_path):
+        """Test that a directory other users can write to is refused."""
+        directory = tmp_path / "shared"
+        directory.mkdir()
+        directory.chmod(0o777)
+
+        with pytest.raises(PermissionError):
+            SharedState(directory / "state")
+
+    def test_file_made_private(self, tmp_path):
+        """Test that an existing file readable by others is restricted to its owner."""
+        path = tmp_path / "state"
+        path.touch(mode=0o666)
+        path.chmod(0o666)
+
+        SharedState(path)
+        assert path.stat().st_mode & 0o777 == 0o600
@@ -0,0 +1,111 @@
+"""
+Tests for single-flight coalescing.
+"""
+
+import asyncio
+
+import pytest
+from app.services.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_result(self):
+        """Test that concurrent callers with the same key run the call once."""
+        flights = SingleFlight()
+        calls = 0
+
+        async def fetch() -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(*(flights.do("key", fetch) for _ in range(5)))
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert len(flights) == 0
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        """Test that calls with different keys are not coalesced."""
+        flights = SingleFlight()
+        calls = 0
+
+        async def fetch() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        await asyncio.gather(flights.do("a", fetch), flights.do("b", fetch))
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_not_coalesced(self):
+        """Test that a finished call is not reused by later callers."""
+        flights = SingleFlight()
+        calls = 0
+
+        async def fetch() -> int:
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flights.do("key", fetch) == 1
+        assert await flights.do("key", fetch) == 2
+
+    @pytest.mark.asyncio
+    async def test_exception_shared(self):
+        """Test that every waiter sees the shared call's exception."""
+        flights = SingleFlight()
+
+        async def fail() -> None:
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            flights.do("key", fail), flights.do("key", fail), return_exceptions=True
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_call_survives_while_a_waiter_remains(self):
+        """Test that one caller giving up does not cancel the call for the others."""
+        flights = SingleFlight()
+
+        async def fetch() -> str:
+            await asyncio.sleep(0.05)
+            return "result"
+
+        first = asyncio.create_task(flights.do("key", fetch))
+        second = asyncio.create_task(flights.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "result"
+
+    @pytest.mark.asyncio
+    async def test_call_cancelled_when_every_waiter_leaves(self):
+        """Test that the shared call is cancelled once nobody waits on it."""
+        flights = SingleFlight()
+        cancelled = False
+
+        async def fetch() -> None:
+            nonlocal cancelled
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+
+        waiter = asyncio.create_task(flights.do("key", fetch))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0.01)
+
+        assert cancelled
+        assert len(flights) == 0
@@ -0,0 +1,138 @@
+"""
+Tests for response compression.
+"""
+
+import gzip
+import zlib
+
+import pytest
+from app.core.compression import (
+    CompressionMiddleware,
+    available_encodings,
+    negotiate_encoding,
+)
+from app.models import JackettInstance
+from app.services import SearchAggregator
+from httpx import AsyncClient
+from starlette.types import Message, Receive, Scope, Send
+
+from tests.factories import make_result
+
+
+class TestNegotiateEncoding:
+    """Tests for Accept-Encoding negotiation."""
+
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            ("gzip, deflate", "gzip"),
+            ("br;q=1.0, gzip;q=0.8", "br"),
+            ("gzip;q=0.5, br;q=0.9", "br"),
+            ("br, gzip", "br"),
+            ("zstd", "zstd"),
+            ("*", "br"),
+            ("gzip;q=0, *;q=0.5", "br"),
+            ("gzip;q=0", None),
+            ("identity", None),
+            ("", None),
+        ],
+    )
+    def test_negotiation(self, header: str, expected: str | None):
+        """Test that q-values win and server preference breaks ties."""
+        assert negotiate_encoding(header, ["br", "zstd", "gzip"]) == expected
+
+    def test_only_supported_encodings(self):
+        """Test that encodings the server cannot produce are never picked."""
+        assert negotiate_encoding("br, gzip;q=0.1", ["gzip"]) == "gzip"
+
+
+class TestCompressors:
+    """Tests for the encoders."""
+
+    @pytest.mark.parametrize(
+        ("encoding", "module"), [("br", "brotli"), ("zstd", "zstandard"), ("gzip", "zlib")]
+    )
+    def test_compressor_round_trip(self, encoding: str, module: str):
+        """Test that each available encoder's chunks decode to the original body."""
+        decoder_module = pytest.importorskip(module)
+        compressor = available_encodings()[encoding]()
+        body = compressor.compress(b"a" * 5000) + compressor.compress(b"b") + compressor.finish()
+
+        if encoding == "gzip":
+            assert gzip.decompress(body) == b"a" * 5000 + b"b"
+        elif encoding == "br":
+            assert decoder_module.decompress(body) == b"a" * 5000 + b"b"
+        else:
+            decoded = decoder_module.ZstdDecompressor().decompressobj().decompress(body)
+            assert decoded == b"a" * 5000 + b"b"
+
+
+class TestCompressionMiddleware:
+    """Tests for CompressionMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_large_response_compressed(
+        self, client: AsyncClient, jackett_instance: JackettInstance, monkeypatch
+    ):
+        """Test that a large search response is gzip encoded when the client accepts it."""
+
+        async def fake_search_jackett(self, instance, query, category):
+            return [make_result(f"Ubuntu {n} Desktop", n, id=f"r{n}") for n in range(200)], None
+
+        monkeypatch.setattr(SearchAggregator, "_search_jackett", fake_search_jackett)
+
+        response = await client.get(
+            "/api/v1/search", params={"q": "ubuntu"}, headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "accept-encoding" in response.headers["vary"].lower()
+        assert int(response.headers["content-length"]) < len(response.content)
+        assert response.json()["total_results"] == 200
+
+    @pytest.mark.asyncio
+    async def test_small_or_unaccepted_response_not_compressed(self, client: AsyncClient):
+        """Test that small bodies and clients without gzip get plain responses."""
+        small = await client.get("/health", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in small.headers
+
+        plain = await client.get("/api/openapi.json", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+
+    @pytest.mark.asyncio
+    async def test_streamed_chunks_flushed(self):
+        """Test that every streamed chunk can be decoded as soon as it is sent."""
+        chunks = [b'{"event": "results"}\n', b'{"event": "summary"}\n']
+
+        async def app(scope: Scope, receive: Receive, send: Send) -> None:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [(b"content-type", b"application/x-ndjson")],
+                }
+            )
+            for chunk in chunks:
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+        sent: list[Message] = []
+
+        async def send(message: Message) -> None:
+            sent.append(message)
+
+        async def receive() -> Message:
+            return {"type": "http.request", "body": b""}
+
+        scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+        await CompressionMiddleware(app, minimum_size=1024)(scope, receive, send)
+
+        start, *bodies = sent
+        assert (b"content-encoding", b"gzip") in start["headers"]
+
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        for chunk, message in zip(chunks, bodies, strict=False):
+            assert decoder.decompress(message["body"]) == chunk
+
+        assert not bodies[-1]["more_body"]
+        assert gzip.decompress(b"".join(m["body"] for m in bodies)) == b"".join(chunks)
@@ -0,0 +1,85 @@
+"""
+Tests for the metrics endpoint and search instrumentation.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from app.models import JackettInstance, ProwlarrInstance
+from app.services import JackettService, ProwlarrService
+from httpx import AsyncClient
+
+TORZNAB = b"""<?xml version="1.0"?>
+<rss><channel>
+<item><title>Ubuntu 24.04</title><size>1024</size><jackettindexer>1337x</jackettindexer>
+<link>http://example.com/a.torrent</link></item>
+<item><title>Ubuntu 22.04</title><size>2048</size><jackettindexer>1337x</jackettindexer>
+<link>http://example.com/b.torrent</link></item>
+</channel></rss>"""
+
+
+@pytest.mark.asyncio
+async def test_search_instrumented(
+    client: AsyncClient,
+    jackett_instance: JackettInstance,
+    prowlarr_instance: ProwlarrInstance,
+    monkeypatch,
+):
+    """Test that a search records per-instance latency, results, bytes and errors."""
+
+    async def body():
+        yield TORZNAB
+
+    async def jackett_search(self, query, category, instance_name, raise_on_error=False):
+        return await self._parse_torznab_stream(body(), instance_name)
+
+    async def prowlarr_down(self, query, category, instance_name, raise_on_error=False):
+        raise httpx.ConnectError("Connection refused")
+
+    monkeypatch.setattr(JackettService, "search", jackett_search)
+    monkeypatch.setattr(ProwlarrService, "search", prowlarr_down)
+
+    response = await client.get("/api/v1/search", params={"q": "ubuntu"})
+    assert response.json()["total_results"] == 2
+
+    response = await client.get("/api/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+
+    jackett = 'source_type="jackett",instance="Test Jackett"'
+    prowlarr = 'source_type="prowlarr",instance="Test Prowlarr"'
+    assert f"searcharr_instance_request_duration_seconds_count{{{jackett}}} 1" in text
+    assert f'searcharr_instance_requests_total{{{jackett},outcome="ok"}} 1' in text
+    assert f'searcharr_indexer_results_total{{{jackett},indexer="1337x"}} 2' in text
+    assert f"searcharr_instance_response_bytes_total{{{jackett}}} {len(TORZNAB)}" in text
+    assert f"searcharr_parse_duration_seconds_count{{{jackett}}} 1" in text
+    assert f'searcharr_instance_errors_total{{{prowlarr},reason="connection"}} 1' in text
+    assert 'searcharr_search_stage_duration_seconds_count{stage="serialize"} 1' in text
+    assert 'searcharr_searches_total{cache="miss"} 1' in text
+
+
+@pytest.mark.asyncio
+async def test_search_cut_off_at_deadline_instrumented(
+    client: AsyncClient,
+    jackett_instance: JackettInstance,
+    monkeypatch,
+):
+    """Test that a search given up at the deadline records its latency and an error."""
+
+    async def jackett_hangs(self, query, category, instance_name, raise_on_error=False):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(JackettService, "search", jackett_hangs)
+
+    response = await client.get("/api/v1/search", params={"q": "ubuntu", "timeout_ms": 100})
+    assert response.json()["errors"] == ["Timed out waiting for Test Jackett after 100 ms"]
+    # Let the cancelled search finish
+    await asyncio.sleep(0.01)
+
+    text = (await client.get("/api/metrics")).text
+    jackett = 'source_type="jackett",instance="Test Jackett"'
+    assert f"searcharr_instance_request_duration_seconds_count{{{jackett}}} 1" in text
+    assert f'searcharr_instance_requests_total{{{jackett},outcome="error"}} 1' in text
+    assert f'searcharr_instance_errors_total{{{jackett},reason="deadline"}} 1' in text
@@ -40,6 +40,22 @@ export const searchApi = {
       queryParams.append('sort_order', params.sort_order)
     }
 
+    if (params.timeout_ms) {
+      queryParams.append('timeout_ms', params.timeout_ms.toString())
+    }
+
+    if (params.dedupe) {
+      queryParams.append('dedupe', 'true')
+    }
+
+    if (params.limit) {
+      queryParams.append('limit', params.limit.toString())
+    }
+
+    if (params.offset) {
+      queryParams.append('offset', params.offset.toString())
+    }
+
     const response = await api.get<SearchResponse>(`/search?${queryParams.toString()}`)
     return response.data
   },
@@ -14,6 +14,8 @@ export interface DownloadClient {
 
 export interface DownloadClientWithStatus extends DownloadClient {
   status: Status
+  check_duration_ms?: number | null
+  last_checked?: string | null
 }
 
 export interface CreateDownloadClient {
@@ -13,6 +13,8 @@ export interface JackettInstance {
 export interface JackettInstanceWithStatus extends JackettInstance {
   status: Status
   indexer_count: number | null
+  check_duration_ms?: number | null
+  last_checked?: string | null
 }
 
 export interface CreateJackettInstance {
@@ -40,6 +42,8 @@ export interface ProwlarrInstance {
 export interface ProwlarrInstanceWithStatus extends ProwlarrInstance {
   status: Status
   indexer_count: number | null
+  check_duration_ms?: number | null
+  last_checked?: string | null
 }
 
 export interface CreateProwlarrInstance {
@@ -13,6 +13,14 @@ export type SortBy = 'seeders' | 'size' | 'date' | 'name'
 export type SortOrder = 'asc' | 'desc'
 export type SourceType = 'jackett' | 'prowlarr'
 
+export interface SearchResultSource {
+  source: string
+  source_type: SourceType
+  indexer: string
+  seeders: number
+  leechers: number
+}
+
 export interface SearchResult {
   id: string
   title: string
@@ -28,6 +36,8 @@ export interface SearchResult {
   magnet_link: string | null
   torrent_url: string | null
   info_url: string | null
+  infohash?: string | null
+  sources?: SearchResultSource[] | null
 }
 
 export interface SearchResponse {
@@ -37,6 +47,9 @@ export interface SearchResponse {
   results: SearchResult[]
   sources_queried: number
   errors: string[]
+  partial?: boolean
+  offset?: number
+  limit?: number | null
 }
 
 export interface SearchParams {
@@ -49,6 +62,10 @@ export interface SearchParams {
   max_size?: string
   sort_by?: SortBy
   sort_order?: SortOrder
+  timeout_ms?: number
+  dedupe?: boolean
+  limit?: number
+  offset?: number
 }
 
 export interface CategoriesResponse {